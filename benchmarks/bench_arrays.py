@@ -0,0 +1,42 @@
+import math
+
+from leetpy import Array1D, Array2D
+
+SIZES = [10**3, 10**4, 10**5, 10**6]
+
+
+class Array1DSuite:
+    sizes = SIZES
+
+    def setup(self, n):
+        self.arr = Array1D.create(n)
+
+    def time_create(self, n):
+        Array1D.create(n)
+
+    def time_print(self, n):
+        Array1D.print(self.arr)
+
+    time_print.sizes = [10**3, 10**4, 10**5]
+
+
+class Array2DSuite:
+    """2-D arrays with `n` cells in total (a square grid)."""
+
+    sizes = SIZES
+
+    def setup(self, n):
+        side = math.isqrt(n)
+        self.arr = Array2D.create(side, side)
+
+    def time_create(self, n):
+        side = math.isqrt(n)
+        Array2D.create(side, side)
+
+    def time_search(self, n):
+        Array2D.search(self.arr, None)
+
+    def time_print(self, n):
+        Array2D.print(self.arr)
+
+    time_print.sizes = [10**3, 10**4, 10**5]
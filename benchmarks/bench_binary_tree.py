@@ -0,0 +1,52 @@
+import io
+
+from leetpy import BinaryTree
+
+SIZES = [10**3, 10**4, 10**5, 10**6]
+
+
+class BinaryTreeSuite:
+    sizes = SIZES
+
+    def setup(self, n):
+        self.root = BinaryTree.create(n)
+        self.bst = BinaryTree.create(n, make_bst=True)
+
+    def time_create(self, n):
+        BinaryTree.create(n)
+
+    def time_create_bst(self, n):
+        BinaryTree.create(n, make_bst=True)
+
+    def time_count_nodes(self, n):
+        BinaryTree.count_nodes(self.root)
+
+    def time_get_depth(self, n):
+        BinaryTree.get_depth(self.root)
+
+    def time_is_binary_search_tree(self, n):
+        BinaryTree.is_binary_search_tree(self.bst)
+
+    def time_travel_inorder(self, n):
+        for _ in BinaryTree.travel_inorder(self.root):
+            pass
+
+    def time_travel_levelorder(self, n):
+        for _ in BinaryTree.travel_levelorder(self.root):
+            pass
+
+    def time_export_as_code(self, n):
+        BinaryTree.export_as_code(self.root)
+
+    def time_export_as_leetcode_array(self, n):
+        BinaryTree.export_as_leetcode_array(self.root)
+
+    def time_print_structure(self, n):
+        BinaryTree.print_structure(self.root)
+
+    time_print_structure.sizes = [10**3, 10**4]
+
+    def time_save_as_svg(self, n):
+        BinaryTree.save_as_svg(self.root, io.StringIO())
+
+    time_save_as_svg.sizes = [10**3, 10**4, 10**5]
@@ -0,0 +1,36 @@
+from leetpy import LinkedList
+
+SIZES = [10**3, 10**4, 10**5, 10**6]
+
+
+class LinkedListSuite:
+    sizes = SIZES
+
+    def setup(self, n):
+        self.head = LinkedList.create(n)
+
+    def time_create(self, n):
+        LinkedList.create(n)
+
+    def time_count_nodes(self, n):
+        LinkedList.count_nodes(self.head)
+
+    def time_is_cyclic(self, n):
+        LinkedList.is_cyclic(self.head)
+
+    def time_reverse(self, n):
+        LinkedList.reverse(self.head)
+
+    def time_to_array(self, n):
+        LinkedList.to_array(self.head)
+
+    def time_get_last(self, n):
+        LinkedList.get(self.head, -1)
+
+    def time_export_as_code(self, n):
+        LinkedList.export_as_code(self.head)
+
+    def time_print(self, n):
+        LinkedList.print(self.head)
+
+    time_print.sizes = [10**3, 10**4, 10**5]
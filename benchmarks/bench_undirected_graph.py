@@ -0,0 +1,114 @@
+import io
+import math
+import os
+import tempfile
+
+from leetpy import CSRGraph, UndirectedGraph
+
+SIZES = [10**3, 10**4, 10**5, 10**6]
+
+# Drawings are written to a directory that is deleted when the run ends
+SVG_DIR = tempfile.TemporaryDirectory(prefix="leetpy_benchmarks_")
+SVG_FILENAME = os.path.join(SVG_DIR.name, "graph.svg")
+
+
+class UndirectedGraphSuite:
+    """Random connected graphs with `n` vertices and `2n` edges."""
+
+    sizes = SIZES
+
+    def setup(self, n):
+        self.edges = UndirectedGraph.create_connected(
+            n, m=2 * n, seed=0, as_edge_array=True
+        )
+        self.edge_list = [
+            (self.edges[i], self.edges[i + 1]) for i in range(0, len(self.edges), 2)
+        ]
+        self.graph = UndirectedGraph.create_from_edge_list(range(n), self.edge_list)
+        self.csr = CSRGraph.from_edge_array(n, self.edges)
+
+    def time_create(self, n):
+        UndirectedGraph.create(n, m=2 * n, seed=0)
+
+    def time_create_tree(self, n):
+        UndirectedGraph.create_tree(n, seed=0)
+
+    def time_create_from_edge_list(self, n):
+        UndirectedGraph.create_from_edge_list(range(n), self.edge_list)
+
+    def time_csr_from_edge_array(self, n):
+        CSRGraph.from_edge_array(n, self.edges)
+
+    def time_get_connected_components(self, n):
+        UndirectedGraph.get_connected_components(self.graph)
+
+    def time_travel_bfs(self, n):
+        for _ in UndirectedGraph.travel_bfs(self.graph, 0):
+            pass
+
+    def time_get_shortest_distances(self, n):
+        UndirectedGraph.get_shortest_distances(self.graph, 0)
+
+    def time_export_as_code(self, n):
+        UndirectedGraph.export_as_code(self.csr, None, io.StringIO())
+
+    def time_export_as_leetcode(self, n):
+        UndirectedGraph.export_as_leetcode(self.csr, None, io.StringIO())
+
+
+class GridSuite:
+    """
+    Grids with about `n` vertices named `(row, col)`, whose adjacency lists must not be
+    mistaken for `(neighbour, weight)` pairs.
+    """
+
+    sizes = [10**3, 10**4, 10**5]
+
+    def setup(self, n):
+        self.side = math.isqrt(n)
+        self.graph = {
+            (r, c): [
+                (r + dr, c + dc)
+                for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                if 0 <= r + dr < self.side and 0 <= c + dc < self.side
+            ]
+            for r in range(self.side)
+            for c in range(self.side)
+        }
+
+    def time_get_shortest_distances(self, n):
+        dist = UndirectedGraph.get_shortest_distances(self.graph, (0, 0))
+        assert dist[(self.side - 1, self.side - 1)] == 2 * (self.side - 1)
+
+
+class DrawSuite:
+    """Force-directed layouts of random graphs with `n` vertices and `2n` edges."""
+
+    sizes = [10**3]
+
+    def setup(self, n):
+        edges = UndirectedGraph.create(n, m=2 * n, seed=0, as_edge_array=True)
+        self.edge_list = [(edges[i], edges[i + 1]) for i in range(0, len(edges), 2)]
+
+    def time_draw(self, n):
+        UndirectedGraph.draw(range(n), self.edge_list, SVG_FILENAME)
+
+    def time_draw_barnes_hut(self, n):
+        UndirectedGraph.draw(range(n), self.edge_list, SVG_FILENAME, theta=0.8)
+
+    # The pure Python quadtree takes about a minute per draw at 10^3
+    time_draw_barnes_hut.sizes = [10**2]
+
+    def time_draw_multilevel(self, n):
+        UndirectedGraph.draw(range(n), self.edge_list, SVG_FILENAME, multilevel=True)
+
+    time_draw_multilevel.sizes = [10**3, 10**4]
+
+
+class TinyDrawSuite:
+    """A drawing with the default seed, which once crashed (so an error fails the run)."""
+
+    sizes = [3]
+
+    def time_draw_default_seed(self, n):
+        UndirectedGraph.draw(range(n), [(0, 1)], SVG_FILENAME)
@@ -0,0 +1,115 @@
+"""
+Checks that importing leetpy stays cheap, using `python -X importtime`.
+
+Every case runs in a fresh interpreter, and fails if it imports a module that should
+only be imported when a print/render function runs (like `rich`), or if importing
+leetpy takes longer than the budget (the best of several runs, since import times are
+noisy).
+
+Usage:
+    python benchmarks/import_time.py [--budget-ms 50] [--runs 5]
+
+The exit code is 1 if any case fails.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import List, Optional, Set, Tuple
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARK_DIR)
+
+DEFAULT_BUDGET_MS = 50
+DEFAULT_RUNS = 5
+
+# (code to run, modules it must not import)
+CASES: List[Tuple[str, Tuple[str, ...]]] = [
+    ("import leetpy", ("rich", "json", "re", "leetpy.binary_tree")),
+    (
+        "from leetpy import BinaryTree",
+        ("rich", "json", "leetpy._reingold_tilford_algorithm"),
+    ),
+    ("from leetpy import Array1D, Array2D, LinkedList", ("rich",)),
+    (
+        "from leetpy import DirectedGraph, UndirectedGraph",
+        ("rich", "json", "leetpy._force_layout", "leetpy._graph_export"),
+    ),
+]
+
+
+def import_times(code: str, pycache_dir: str) -> Tuple[Set[str], int]:
+    """
+    The modules that `code` imports, and the total time (in microseconds) it spends on
+    imports, from `import leetpy` onwards.
+    """
+    env = {**os.environ, "PYTHONPATH": ROOT_DIR, "PYTHONPYCACHEPREFIX": pycache_dir}
+    env.pop("LEETPY_PROFILE", None)
+    # Measure imports from cached bytecode (like an installed package), not compiling
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+
+    modules: Set[str] = set()
+    total = 0
+    started = False
+    # A module is listed after the modules it imports
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        modules.add(name.strip())
+        if name[1:].startswith(" "):
+            continue
+
+        # Only count the outermost imports, since the cumulative times include the rest
+        started = started or name.strip() == "leetpy"
+        if started:
+            total += int(cumulative)
+        else:
+            # Forget the imports of interpreter startup
+            modules.clear()
+    return modules, total
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check the import time of leetpy.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    args = parser.parse_args(argv)
+
+    failures = 0
+    pycache_dir = tempfile.mkdtemp()
+    for code, forbidden in CASES:
+        # The first run only compiles the bytecode
+        import_times(code, pycache_dir)
+        runs = [import_times(code, pycache_dir) for _ in range(args.runs)]
+        best_ms = min(total for _, total in runs) / 1000
+        imported = sorted(
+            set(forbidden).intersection(*(modules for modules, _ in runs))
+        )
+
+        status = "ok"
+        if imported:
+            status = f"FAIL imports {', '.join(imported)}"
+        elif best_ms > args.budget_ms:
+            status = f"FAIL over the {args.budget_ms:g} ms budget"
+        failures += status != "ok"
+        print(f"{code:<55} {best_ms:>8.2f} ms  {status}")
+    shutil.rmtree(pycache_dir)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Runs the benchmark suite and compares the results against a baseline.
+
+Benchmarks live in `benchmarks/bench_*.py`, in the style of asv: every class with a
+`sizes` attribute is a suite, and every method whose name starts with `time_` is a
+benchmark that runs once per size. A suite may define `setup(self, n)`, which prepares
+the inputs and isn't measured. A benchmark can narrow down its own sizes with a `sizes`
+attribute (for operations that are too slow at 10^6).
+
+Every benchmark is timed over several repeats (keeping the fastest), and then run once
+more under `tracemalloc` to record its peak memory. The random module is re-seeded
+before every setup, so inputs are identical between runs.
+
+Usage:
+    python benchmarks/run.py [-o results.json] [--baseline old.json] [--threshold 0.2]
+                             [--filter NAME] [--max-size N] [--repeat 3]
+
+With `--baseline`, benchmarks that got slower (or use more memory) by more than the
+threshold are reported, and the exit code is 1. So are benchmarks that raise an error,
+unless they already did in the baseline (without a baseline, any error fails the run).
+"""
+
+import argparse
+import contextlib
+import gc
+import importlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARK_DIR)
+
+SEED = 0
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.2
+# Results below these are too noisy to flag as regressions
+MIN_COMPARED_TIME = 0.001  # seconds
+MIN_COMPARED_MEMORY = 64 * 1024  # bytes
+
+Benchmark = Tuple[str, type, str, int]
+
+
+def discover(
+    name_filter: Optional[str], max_size: Optional[int]
+) -> Iterator[Benchmark]:
+    """Yield `(name, suite class, method name, size)` for every selected benchmark."""
+    sys.path.insert(0, BENCHMARK_DIR)
+    sys.path.insert(0, ROOT_DIR)
+
+    for filename in sorted(os.listdir(BENCHMARK_DIR)):
+        if not (filename.startswith("bench_") and filename.endswith(".py")):
+            continue
+        module = importlib.import_module(filename[:-3])
+
+        for suite_name, suite in vars(module).items():
+            if not (isinstance(suite, type) and hasattr(suite, "sizes")):
+                continue
+            for method_name, method in vars(suite).items():
+                if not method_name.startswith("time_"):
+                    continue
+                for n in getattr(method, "sizes", suite.sizes):
+                    if max_size is not None and n > max_size:
+                        continue
+                    name = f"{module.__name__}.{suite_name}.{method_name}[{n}]"
+                    if name_filter is None or name_filter in name:
+                        yield name, suite, method_name, n
+
+
+def prepare(suite: type, method_name: str, n: int) -> Callable[[], None]:
+    """Run the setup of a benchmark, and return the operation to measure."""
+    random.seed(SEED)
+    instance = suite()
+    if hasattr(instance, "setup"):
+        instance.setup(n)
+    method = getattr(instance, method_name)
+    return lambda: method(n)
+
+
+def measure(suite: type, method_name: str, n: int, repeat: int) -> Dict[str, float]:
+    # Anything the library prints is discarded
+    with contextlib.redirect_stdout(io.StringIO()):
+        best = float("inf")
+        for _ in range(repeat):
+            operation = prepare(suite, method_name, n)
+            gc.collect()
+            start = time.perf_counter()
+            operation()
+            best = min(best, time.perf_counter() - start)
+
+        operation = prepare(suite, method_name, n)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            operation()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {"time": best, "peak_memory": peak}
+
+
+def compare(
+    results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float
+) -> List[str]:
+    """
+    Describe every result that is worse than its baseline by more than `threshold`, and
+    every error that isn't in the baseline.
+    """
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if "error" in result:
+            if old is None or "error" not in old:
+                regressions.append(f"{name}: {result['error']}")
+            continue
+        if old is None or "error" in old:
+            continue
+        for key, floor in (
+            ("time", MIN_COMPARED_TIME),
+            ("peak_memory", MIN_COMPARED_MEMORY),
+        ):
+            if max(result[key], old[key]) < floor:
+                continue
+            if result[key] > old[key] * (1 + threshold):
+                ratio = result[key] / old[key] if old[key] else float("inf")
+                regressions.append(
+                    f"{name}: {key} {old[key]:.4g} -> {result[key]:.4g} ({ratio:.2f}x)"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the leetpy benchmarks.")
+    parser.add_argument("-o", "--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="Results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--max-size", type=int, help="Skip larger input sizes")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Dict] = {}
+    for name, suite, method_name, n in discover(args.filter, args.max_size):
+        try:
+            results[name] = measure(suite, method_name, n, args.repeat)
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+            print(f"{name:<80} ERROR {results[name]['error']}")
+            continue
+        result = results[name]
+        print(
+            f"{name:<80} {result['time']:>10.4f} s {result['peak_memory'] / 2**20:>10.2f} MB"
+        )
+
+    with open(os.path.join(ROOT_DIR, "version.txt")) as f:
+        version = f.read().strip()
+    report = {
+        "leetpy": version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": SEED,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if args.baseline is None:
+        errors = sum("error" in result for result in results.values())
+        if errors:
+            print(f"{errors} benchmark(s) failed")
+        return 1 if errors else 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,8 +6,45 @@ Each class contains convenience methods for its data structure, that are static
 stateless.
 """
 
-from .array_1d import Array1D
-from .array_2d import Array2D
-from .binary_tree import BinaryTree, TreeNode
-from .linked_list import LinkedList, ListNode
-from .undirected_graph import UndirectedGraph
+import os
+
+# Every class is imported when it's first used (PEP 562), so `import leetpy` stays
+# cheap for programs that only need a few of them
+_LAZY_ATTRIBUTES = {
+    "Array1D": "array_1d",
+    "Array2D": "array_2d",
+    "BinaryTree": "binary_tree",
+    "TreeNode": "binary_tree",
+    "CSRGraph": "csr_graph",
+    "DirectedGraph": "directed_graph",
+    "LinkedList": "linked_list",
+    "ListNode": "linked_list",
+    "UndirectedGraph": "undirected_graph",
+    "estimate_complexity": "_complexity",
+}
+_LAZY_MODULES = ("corpus", "differential", "profiling", "rng")
+
+__all__ = [*_LAZY_ATTRIBUTES, *_LAZY_MODULES]
+
+
+def __getattr__(name: str):
+    from importlib import import_module
+
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__), name)
+    elif name in _LAZY_MODULES:
+        value = import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *__all__})
+
+
+if os.environ.get("LEETPY_PROFILE", "0") not in ("", "0"):
+    from . import profiling
+
+    profiling._enable_from_environment()
@@ -0,0 +1,214 @@
+"""
+AVL tree rebalancing for binary search trees made of any `NodeLike` objects.
+
+The height of every node is kept in a side table (a dictionary keyed by node) instead
+of on the nodes themselves, so user-defined node classes don't need an extra field.
+Everything is iterative: the path from the root is kept in a list, and rebalanced from
+the bottom up.
+"""
+
+from typing import Callable, Dict, List, Optional, Type, TypeVar
+
+from .binary_tree import NodeConfig, _accessors
+
+NodeLike = TypeVar("NodeLike")
+Heights = Dict[NodeLike, int]
+
+
+class _AVL:
+    """The accessors, attribute names and height table used by a single operation."""
+
+    def __init__(self, config: NodeConfig, heights: Heights):
+        self.get_data, self.get_left, self.get_right, self.children = _accessors(config)
+        self.left_attr = config["left_attr"]
+        self.right_attr = config["right_attr"]
+        self.heights = heights
+
+    def height(self, node: Optional[NodeLike]) -> int:
+        if node is None:
+            return 0
+        height = self.heights.get(node)
+        if height is None:
+            fill_heights(node, self.children, self.heights)
+            height = self.heights[node]
+        return height
+
+    def update_height(self, node: NodeLike):
+        left, right = self.children(node)
+        self.heights[node] = 1 + max(self.height(left), self.height(right))
+
+    def rotate_right(self, node: NodeLike) -> NodeLike:
+        pivot = self.get_left(node)
+        setattr(node, self.left_attr, self.get_right(pivot))
+        setattr(pivot, self.right_attr, node)
+        self.update_height(node)
+        self.update_height(pivot)
+        return pivot
+
+    def rotate_left(self, node: NodeLike) -> NodeLike:
+        pivot = self.get_right(node)
+        setattr(node, self.right_attr, self.get_left(pivot))
+        setattr(pivot, self.left_attr, node)
+        self.update_height(node)
+        self.update_height(pivot)
+        return pivot
+
+    def balance(self, node: NodeLike) -> NodeLike:
+        """Rebalance a node with balanced subtrees, and return the new subtree root."""
+        left, right = self.children(node)
+        skew = self.height(left) - self.height(right)
+        if skew > 1:
+            if self.height(self.get_left(left)) < self.height(self.get_right(left)):
+                setattr(node, self.left_attr, self.rotate_left(left))
+            return self.rotate_right(node)
+        if skew < -1:
+            if self.height(self.get_right(right)) < self.height(self.get_left(right)):
+                setattr(node, self.right_attr, self.rotate_right(right))
+            return self.rotate_left(node)
+        self.update_height(node)
+        return node
+
+    def replace_child(self, parent: NodeLike, child: NodeLike, new_child: NodeLike):
+        if self.get_left(parent) is child:
+            setattr(parent, self.left_attr, new_child)
+        else:
+            setattr(parent, self.right_attr, new_child)
+
+    def rebalance_path(self, root: NodeLike, path: List[NodeLike]) -> NodeLike:
+        """
+        Rebalance every node of a path that starts at the root (each node being the
+        parent of the next), from the bottom up, and return the new root.
+        """
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            subtree = self.balance(node)
+            if subtree is not node:
+                if i == 0:
+                    root = subtree
+                else:
+                    self.replace_child(path[i - 1], node, subtree)
+        return root
+
+
+def fill_heights(root: NodeLike, children: Callable, heights: Heights) -> None:
+    """Compute the height of every node in the subtree (missing from `heights`)."""
+    stack = [(root, False)]
+    while stack:
+        node, visited = stack.pop()
+        left, right = children(node)
+        if visited:
+            heights[node] = 1 + max(
+                0 if left is None else heights[left],
+                0 if right is None else heights[right],
+            )
+            continue
+        stack.append((node, True))
+        for child in (left, right):
+            if child is not None and child not in heights:
+                stack.append((child, False))
+
+
+def insert(
+    root: Optional[NodeLike],
+    val: any,
+    klass: Type[NodeLike],
+    config: NodeConfig,
+    heights: Heights,
+) -> NodeLike:
+    avl = _AVL(config, heights)
+    new_node = klass(val)
+    heights[new_node] = 1
+    if root is None:
+        return new_node
+
+    # Equal values go to the right, after the existing ones in an inorder traversal
+    path = []
+    node = root
+    while node is not None:
+        path.append(node)
+        node = avl.get_left(node) if val < avl.get_data(node) else avl.get_right(node)
+    parent = path[-1]
+    if val < avl.get_data(parent):
+        setattr(parent, avl.left_attr, new_node)
+    else:
+        setattr(parent, avl.right_attr, new_node)
+
+    return avl.rebalance_path(root, path)
+
+
+def delete(
+    root: Optional[NodeLike], val: any, config: NodeConfig, heights: Heights
+) -> Optional[NodeLike]:
+    avl = _AVL(config, heights)
+
+    path = []
+    node = root
+    while node is not None:
+        data = avl.get_data(node)
+        if val == data:
+            break
+        path.append(node)
+        node = avl.get_left(node) if val < data else avl.get_right(node)
+    if node is None:
+        return root
+
+    left, right = avl.children(node)
+    if left is not None and right is not None:
+        # Replace the node with its inorder successor (the nodes themselves are moved,
+        # rather than their values, so references to other nodes stay valid)
+        successor_path = [right]
+        while avl.get_left(successor_path[-1]) is not None:
+            successor_path.append(avl.get_left(successor_path[-1]))
+        successor = successor_path.pop()
+        if successor_path:
+            setattr(successor_path[-1], avl.left_attr, avl.get_right(successor))
+            setattr(successor, avl.right_attr, right)
+        setattr(successor, avl.left_attr, left)
+        replacement = successor
+        # The successor's old ancestors are now below it
+        rebalance = path + [successor] + successor_path
+    else:
+        replacement = left if left is not None else right
+        rebalance = path
+
+    if path:
+        avl.replace_child(path[-1], node, replacement)
+    else:
+        root = replacement
+    heights.pop(node, None)
+
+    if root is None:
+        return None
+    return avl.rebalance_path(root, rebalance)
+
+
+def build_balanced(
+    values: List[any],
+    klass: Type[NodeLike],
+    config: NodeConfig,
+    heights: Optional[Heights],
+) -> Optional[NodeLike]:
+    """A perfectly balanced tree whose inorder traversal is `values`, in O(n) time."""
+    if not values:
+        return None
+
+    left_attr, right_attr = config["left_attr"], config["right_attr"]
+    nodes = [klass(val) for val in values]
+
+    # Every range of values becomes a subtree rooted at its middle value
+    ranges = [(0, len(values) - 1)]
+    while ranges:
+        lo, hi = ranges.pop()
+        mid = (lo + hi) // 2
+        node = nodes[mid]
+        if heights is not None:
+            # A range of k values has a height of floor(log2(k)) + 1
+            heights[node] = (hi - lo + 1).bit_length()
+        if lo < mid:
+            setattr(node, left_attr, nodes[(lo + mid - 1) // 2])
+            ranges.append((lo, mid - 1))
+        if mid < hi:
+            setattr(node, right_attr, nodes[(mid + 1 + hi) // 2])
+            ranges.append((mid + 1, hi))
+
+    return nodes[(len(values) - 1) // 2]
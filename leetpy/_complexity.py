@@ -0,0 +1,365 @@
+"""
+Estimates the time complexity of a function empirically: times it on inputs of growing
+size, and fits the timings against common complexity classes.
+"""
+
+import functools
+import gc
+import math
+import random
+import statistics
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+DEFAULT_SIZES = (1000, 2000, 4000, 8000, 16000, 32000)
+# "dense graph" inputs have about n^2 / 4 edges, so they get smaller sizes
+DENSE_GRAPH_SIZES = (100, 200, 400, 800)
+MAX_DENSE_GRAPH_SIZE = 2000
+DEFAULT_REPEATS = 5
+# Calls faster than this are timed in batches that take at least as long. A batch
+# repeats the call on the same input if the call leaves it unchanged, and otherwise
+# times single calls on as many inputs as can be built in BUILD_BUDGET seconds (up to
+# MAX_SAMPLES)
+MIN_BATCH_TIME = 1e-2
+BUILD_BUDGET = 0.5
+MAX_SAMPLES = 200
+# Fits with an error this close to the best one's are considered equally good
+ERROR_TOLERANCE = 0.03
+
+# Complexity classes, as functions of n (every one is positive for n >= 1)
+COMPLEXITY_CLASSES: Dict[str, Callable[[float], float]] = {
+    "O(1)": lambda n: 1.0,
+    "O(log n)": lambda n: math.log2(n + 1),
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * math.log2(n + 1),
+    "O(n^2)": lambda n: n**2,
+    "O(n^2 log n)": lambda n: n**2 * math.log2(n + 1),
+    "O(n^3)": lambda n: n**3,
+}
+
+
+def _skewed_tree(n: int, left: bool) -> Any:
+    from .binary_tree import TreeNode
+
+    root = None
+    for _ in range(n):
+        root = TreeNode(random.randint(0, n), *((root, None) if left else (None, root)))
+    return root
+
+
+def _input_kinds() -> Dict[str, Callable[[int], Any]]:
+    from .array_1d import Array1D
+    from .array_2d import Array2D
+    from .binary_tree import BinaryTree
+    from .linked_list import LinkedList
+    from .undirected_graph import UndirectedGraph
+
+    return {
+        # Arrays
+        "array": lambda n: Array1D.create(n),
+        "sorted array": lambda n: sorted(Array1D.create(n)),
+        "reversed array": lambda n: sorted(Array1D.create(n), reverse=True),
+        "constant array": lambda n: [0] * n,
+        "small values array": lambda n: Array1D.create(n, 0, 9),
+        # 2-D arrays with about n cells
+        "matrix": lambda n: Array2D.create(math.isqrt(n), math.isqrt(n)),
+        # Linked lists
+        "linked list": lambda n: LinkedList.create(n),
+        # Binary trees
+        "tree": lambda n: BinaryTree.create(n),
+        "bst": lambda n: BinaryTree.create(n, make_bst=True),
+        "complete tree": lambda n: BinaryTree.create(n, make_complete=True),
+        "left skewed tree": lambda n: _skewed_tree(n, left=True),
+        "right skewed tree": lambda n: _skewed_tree(n, left=False),
+        # Graphs with n vertices
+        "graph": lambda n: UndirectedGraph.create_connected(n, 2 * n),
+        "dense graph": lambda n: UndirectedGraph.create_connected(n, n * (n - 1) // 4),
+        "tree graph": lambda n: UndirectedGraph.create_tree(n),
+        "grid graph": lambda n: UndirectedGraph.create_grid(
+            math.isqrt(n), math.isqrt(n)
+        ),
+    }
+
+
+class ComplexityFit(NamedTuple):
+    name: str
+    # The fitted model is `time = intercept + coefficient * f(n)` (in seconds)
+    intercept: float
+    coefficient: float
+    # The root mean square of the relative errors of the model
+    error: float
+
+    def predict(self, n: float) -> float:
+        return self.intercept + self.coefficient * COMPLEXITY_CLASSES[self.name](n)
+
+
+class ComplexityEstimate(NamedTuple):
+    # Every fit, from best to worst (see ERROR_TOLERANCE)
+    fits: List[ComplexityFit]
+    # The slope of the timings on a log-log scale (about 1 for O(n), 2 for O(n^2)...)
+    exponent: float
+    # Rows of `(n, measured seconds, seconds predicted by the best fit)`
+    table: List[tuple]
+
+    @property
+    def best(self) -> ComplexityFit:
+        return self.fits[0]
+
+    def report(self) -> str:
+        lines = [
+            f"Best fit: {self.best.name} "
+            f"(time = {self.best.intercept:.3g} + {self.best.coefficient:.3g} * f(n) s, "
+            f"error {self.best.error:.1%})",
+            f"Empirical exponent: {self.exponent:.2f}",
+            "",
+            f"{'n':>10} {'measured (s)':>14} {'predicted (s)':>14}",
+        ]
+        for n, measured, predicted in self.table:
+            lines.append(f"{n:>10} {measured:>14.6g} {predicted:>14.6g}")
+        lines.append("")
+        lines.append(f"{'class':<14} {'error':>8}")
+        for fit in self.fits:
+            lines.append(f"{fit.name:<14} {fit.error:>8.1%}")
+        return "\n".join(lines)
+
+
+def fit_complexity(
+    name: str, sizes: Sequence[int], times: Sequence[float]
+) -> ComplexityFit:
+    """
+    Fit `time = intercept + coefficient * f(n)` by least squares on the relative errors
+    (so small inputs count as much as large ones), with both parameters non-negative.
+    """
+    f = COMPLEXITY_CLASSES[name]
+    xs = [f(n) for n in sizes]
+    weights = [1 / max(t, 1e-12) ** 2 for t in times]
+
+    def error(a: float, b: float) -> float:
+        squares = [((a + b * x - t) / max(t, 1e-12)) ** 2 for x, t in zip(xs, times)]
+        return math.sqrt(sum(squares) / len(squares))
+
+    def only_intercept() -> float:
+        return sum(w * t for w, t in zip(weights, times)) / sum(weights)
+
+    def only_coefficient() -> float:
+        return sum(w * x * t for w, x, t in zip(weights, xs, times)) / sum(
+            w * x * x for w, x in zip(weights, xs)
+        )
+
+    # Weighted normal equations of the 2-parameter model
+    sw = sum(weights)
+    sx = sum(w * x for w, x in zip(weights, xs))
+    sxx = sum(w * x * x for w, x in zip(weights, xs))
+    st = sum(w * t for w, t in zip(weights, times))
+    sxt = sum(w * x * t for w, x, t in zip(weights, xs, times))
+    determinant = sw * sxx - sx * sx
+
+    candidates = [(only_intercept(), 0.0), (0.0, only_coefficient())]
+    if determinant > 1e-12 * sw * sxx:
+        a = (sxx * st - sx * sxt) / determinant
+        b = (sw * sxt - sx * st) / determinant
+        if a >= 0 and b >= 0:
+            candidates.append((a, b))
+
+    a, b = min(candidates, key=lambda ab: error(*ab))
+    return ComplexityFit(name, a, b, error(a, b))
+
+
+@functools.lru_cache(maxsize=None)
+def _timer_overhead() -> float:
+    """The time between two back-to-back reads of the timer."""
+    overhead = math.inf
+    for _ in range(1000):
+        start = time.perf_counter()
+        overhead = min(overhead, time.perf_counter() - start)
+    return overhead
+
+
+def _reachable_ids(obj: Any) -> List[int]:
+    """
+    The ids of the objects reachable from `obj` (besides classes), once for every
+    reference and in a fixed order.
+    """
+    ids = [id(obj)]
+    seen = {id(obj)}
+    stack = [obj]
+    while stack:
+        for referent in gc.get_referents(stack.pop()):
+            if isinstance(referent, type):
+                continue
+            ids.append(id(referent))
+            if id(referent) not in seen:
+                seen.add(id(referent))
+                stack.append(referent)
+    return ids
+
+
+def _call_timer(
+    fn: Callable[[Any], Any],
+    create: Callable[[int], Any],
+    n: int,
+    repeats: int,
+    pure: Optional[bool],
+) -> Tuple[float, Callable[[], float]]:
+    """
+    Prepare to time `fn` on inputs of size n, excluding the inputs' creation. Returns
+    the first sample and a function that times another one.
+    """
+
+    def timed(arg: Any, number: int = 1) -> float:
+        # Like timeit, keep the garbage collector out of the timings
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(number):
+                fn(arg)
+            return (time.perf_counter() - start) / number
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    start = time.perf_counter()
+    arg = create(n)
+    build_time = time.perf_counter() - start
+    before = _reachable_ids(arg) if pure is None else None
+    first = timed(arg)
+    if first >= MIN_BATCH_TIME:
+        return first, lambda: timed(create(n))
+
+    if pure or (pure is None and _reachable_ids(arg) == before):
+        # Like timeit's autorange, grow the batch until it's long enough to time
+        number = 1
+        while number * first < MIN_BATCH_TIME:
+            number *= 10
+            first = timed(arg, number)
+        return first, lambda: timed(arg, number)
+
+    # Every call needs a fresh input, so the calls are timed one at a time, less the
+    # timer's own overhead. The median doesn't depend on the number of samples, which
+    # is smaller for inputs that take longer to build
+    samples = int(BUILD_BUDGET / max(2 * build_time, 1e-9) / repeats)
+    samples = max(1, min(samples, MAX_SAMPLES // repeats))
+    del arg
+
+    def sample() -> float:
+        times = []
+        for _ in range(samples):
+            spare, arg = create(n), create(n)
+            # Building the input evicts the code that calls `fn` from the CPU's caches,
+            # so a call on a spare input warms it up again
+            timed(spare)
+            times.append(timed(arg))
+        return max(statistics.median(times) - _timer_overhead(), 1e-9)
+
+    return sample(), sample
+
+
+def estimate_complexity(
+    fn: Callable[[Any], Any],
+    kind: Union[str, Callable[[int], Any]] = "array",
+    sizes: Optional[Sequence[int]] = None,
+    repeats: int = DEFAULT_REPEATS,
+    seed: Optional[int] = 0,
+    pure: Optional[bool] = None,
+) -> ComplexityEstimate:
+    """
+    Estimate the time complexity of `fn` by timing it on inputs of growing size, and
+    fitting the timings against common complexity classes (O(1), O(log n), O(n),
+    O(n log n), O(n^2), O(n^2 log n) and O(n^3)).
+
+    Inputs are created before the timer starts, and every call gets a fresh input (so
+    in-place changes don't leak into the next call), except that calls too fast for
+    the timer are repeated on the same input if `fn` is pure. Fast calls that change
+    their input are timed one by one instead, which is less accurate. The fastest of
+    the repeats is kept for every size.
+
+    Args:
+        fn: The function to measure. It's called with the input as its only argument.
+        kind: The shape of the inputs: "array", "sorted array", "reversed array",
+            "constant array", "small values array", "matrix", "linked list", "tree",
+            "bst", "complete tree", "left skewed tree", "right skewed tree", "graph",
+            "dense graph" (half of all possible edges), "tree graph" or "grid graph".
+            Alternatively, a function that creates an input of size n.
+        sizes: The input sizes, which should span at least an order of magnitude.
+            Defaults to 1000 to 32000, or 100 to 800 for "dense graph" (which allows
+            sizes up to 2000).
+        repeats: The number of calls (or batches of fast calls) for every size.
+        seed: The seed of the `random` module while creating inputs, for reproducible
+            inputs. Its previous state is restored afterwards. `None` leaves the random
+            module as is.
+        pure: Whether `fn` leaves its input unchanged, so that the same input can be
+            used for many calls. `None` checks whether the first call changed any
+            object reachable from its input.
+
+    Returns:
+        The fits from best to worst, the empirical exponent, and a table of
+        `(n, measured seconds, predicted seconds)` rows for plotting.
+    """
+    if isinstance(kind, str):
+        kinds = _input_kinds()
+        assert kind in kinds, f"Unknown kind {kind!r}, expected one of {list(kinds)}"
+        create = kinds[kind]
+    else:
+        create = kind
+    if sizes is None:
+        sizes = DENSE_GRAPH_SIZES if kind == "dense graph" else DEFAULT_SIZES
+    if kind == "dense graph" and max(sizes) > MAX_DENSE_GRAPH_SIZE:
+        raise ValueError(
+            f"Dense graphs have about n^2 / 4 edges, so sizes must be at most "
+            f"{MAX_DENSE_GRAPH_SIZE}"
+        )
+    assert len(sizes) >= 3, "At least 3 sizes are needed for a fit"
+    assert repeats >= 1
+
+    sizes = sorted(sizes)
+    state = random.getstate()
+    if seed is not None:
+        random.seed(seed)
+    try:
+        times, timers = map(
+            list, zip(*(_call_timer(fn, create, n, repeats, pure) for n in sizes))
+        )
+        # Every round times each size in turn, so that the machine's slow spells
+        # affect all sizes alike
+        for _ in range(repeats - 1):
+            for i, timer in enumerate(timers):
+                times[i] = min(times[i], timer())
+    finally:
+        if seed is not None:
+            random.setstate(state)
+
+    # Fits within ERROR_TOLERANCE of the lowest error are ordered from the slowest
+    # growing class, since timings rarely tell apart an extra log factor
+    fits = [fit_complexity(name, sizes, times) for name in COMPLEXITY_CLASSES]
+    lowest_error = min(fit.error for fit in fits)
+    order = {name: i for i, name in enumerate(COMPLEXITY_CLASSES)}
+    fits.sort(
+        key=lambda fit: (
+            (0, order[fit.name])
+            if fit.error <= lowest_error + ERROR_TOLERANCE
+            else (1, fit.error)
+        )
+    )
+
+    # Least squares slope of log(time) against log(n)
+    log_ns = [math.log(n) for n in sizes]
+    log_ts = [math.log(max(t, 1e-12)) for t in times]
+    mean_n = sum(log_ns) / len(log_ns)
+    mean_t = sum(log_ts) / len(log_ts)
+    exponent = sum((x - mean_n) * (y - mean_t) for x, y in zip(log_ns, log_ts)) / sum(
+        (x - mean_n) ** 2 for x in log_ns
+    )
+
+    table = [(n, t, fits[0].predict(n)) for n, t in zip(sizes, times)]
+    return ComplexityEstimate(fits, exponent, table)
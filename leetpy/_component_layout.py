@@ -0,0 +1,149 @@
+"""
+Lays out every connected component of a graph on its own, then packs the drawings.
+
+Vertices in different components only ever repel each other, so laying them out
+together costs O(V^2) work per iteration for nothing but pushing the components apart.
+Separately, the cost is the sum of the squared component sizes, and the components can
+be laid out in parallel.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import math
+from typing import Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from . import _graph_algorithms
+from ._force_layout import L
+from .rng import SeedLike, spawn
+from .undirected_graph import _layout_coords
+
+Vertex = TypeVar("Vertex")
+Coords = Dict[Vertex, Tuple[float, float]]
+# The arguments of `_layout_coords` for a single component
+LayoutJob = Tuple[
+    List[Vertex],
+    Dict[Vertex, List[Vertex]],
+    Optional[float],
+    bool,
+    Optional[float],
+    Optional[Coords],
+    SeedLike,
+]
+
+# Empty space between packed components, relative to the ideal edge length
+COMPONENT_GAP = 2
+
+
+def layout_component(job: LayoutJob) -> Coords:
+    """Lay out a single component (this runs in the worker processes)."""
+    *args, seed = job
+    vertices = args[0]
+    if len(vertices) == 1:
+        return {vertices[0]: (0.0, 0.0)}
+    return _layout_coords(*args, verbose=False, seed=seed)
+
+
+def shelf_pack(
+    boxes: Sequence[Tuple[float, float]], gap: float
+) -> List[Tuple[float, float]]:
+    """
+    The top-left corner of every `(width, height)` box, packed into rows ("shelves")
+    with the "next fit decreasing height" heuristic: the tallest boxes go first, and a
+    new shelf starts whenever a box doesn't fit in the width of a square with the same
+    total area as the boxes.
+    """
+    if not boxes:
+        return []
+
+    total_area = sum((w + gap) * (h + gap) for w, h in boxes)
+    shelf_width = max(math.sqrt(total_area), max(w for w, _ in boxes))
+
+    corners: List[Tuple[float, float]] = [(0.0, 0.0)] * len(boxes)
+    x = y = shelf_height = 0.0
+    for i in sorted(range(len(boxes)), key=lambda i: -boxes[i][1]):
+        w, h = boxes[i]
+        if x > 0 and x + w > shelf_width:
+            y += shelf_height + gap
+            x = shelf_height = 0.0
+        corners[i] = (x, y)
+        x += w + gap
+        shelf_height = max(shelf_height, h)
+
+    return corners
+
+
+def layout_components(
+    vertices: Sequence[Vertex],
+    graph: Dict[Vertex, List[Vertex]],
+    theta: Optional[float] = None,
+    multilevel: bool = False,
+    area: Optional[float] = None,
+    initial_positions: Optional[Coords] = None,
+    workers: Optional[int] = None,
+    seed: SeedLike = None,
+    verbose: bool = True,
+) -> Coords:
+    """
+    Lay out every connected component separately, and pack them next to each other.
+
+    Args:
+        area: The total area of the drawing, shared between the components in
+            proportion to their number of vertices.
+        workers: Enabling this lays out components in this many worker processes.
+        seed: Every component gets its own stream spawned from this seed, so the
+            result is the same for any number of workers.
+        verbose: Enabling this prints the number of components.
+    """
+    components = _graph_algorithms.connected_components(graph)
+    seeds = spawn(seed, len(components))
+
+    jobs: List[LayoutJob] = []
+    for component, component_seed in zip(components, seeds):
+        component_area = None if area is None else area * len(component) / len(vertices)
+        component_positions = None
+        if initial_positions:
+            component_positions = {
+                v: initial_positions[v] for v in component if v in initial_positions
+            }
+        subgraph = {v: list(graph[v]) for v in component}
+        jobs.append(
+            (
+                component,
+                subgraph,
+                theta,
+                multilevel,
+                component_area,
+                component_positions,
+                component_seed,
+            )
+        )
+
+    if workers is not None and workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            # Start with the largest components, so no worker is left with one at the end
+            order = sorted(range(len(jobs)), key=lambda i: -len(components[i]))
+            futures = {i: pool.submit(layout_component, jobs[i]) for i in order}
+            layouts = [futures[i].result() for i in range(len(jobs))]
+    else:
+        layouts = [layout_component(job) for job in jobs]
+
+    boxes = []
+    for component, coords in zip(components, layouts):
+        xs = [coords[v][0] for v in component]
+        ys = [coords[v][1] for v in component]
+        boxes.append((min(xs), min(ys), max(xs), max(ys)))
+
+    K = L if area is None else math.sqrt(area / max(1, len(vertices)))
+    corners = shelf_pack(
+        [(x2 - x1, y2 - y1) for x1, y1, x2, y2 in boxes], COMPONENT_GAP * K
+    )
+
+    packed: Coords = {}
+    for component, coords, box, corner in zip(components, layouts, boxes, corners):
+        dx, dy = corner[0] - box[0], corner[1] - box[1]
+        for v in component:
+            x, y = coords[v]
+            packed[v] = (x + dx, y + dy)
+
+    if verbose:
+        print(f"Components = {len(components)}")
+    return packed
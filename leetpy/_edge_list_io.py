@@ -0,0 +1,243 @@
+"""
+Streaming readers that build a `CSRGraph` from edge list files, a chunk at a time.
+
+The file is read twice: the first pass counts the degree of every vertex, the second
+places every edge endpoint in its slot (a counting sort). Only one chunk of edges is
+held in memory at a time, so peak memory is the size of the CSR arrays themselves.
+"""
+
+from array import array
+from collections import Counter
+from itertools import chain
+import re as regex
+from typing import BinaryIO, Callable, Iterator, Optional
+
+from .csr_graph import CSRGraph, _index_typecode
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# The first two integers of a line, separated by whitespace and/or a comma. Lines
+# starting with anything else (like "#" comments) are skipped, but a numeric "n m"
+# header line would be read as an edge, so it has to be consumed by `read_text_header`
+TEXT_EDGE_REGEX = regex.compile(rb"(?m)^[ \t]*(-?\d+)[ \t]*[ \t,][ \t]*(-?\d+)")
+# The first two integers inside every "[...]"
+LEETCODE_EDGE_REGEX = regex.compile(rb"\[\s*(-?\d+)\s*,\s*(-?\d+)")
+
+# Chunk readers yield flat arrays of edge endpoints: [u0, v0, u1, v1, ...]
+ChunkReader = Callable[[BinaryIO], Iterator[array]]
+
+
+def detect_text_format(fp: BinaryIO) -> str:
+    """Guess whether a text file is a LeetCode-style `[[u,v],...]` list or not."""
+    head = fp.read(4096)
+    fp.seek(0)
+    return "leetcode" if b"[" in head else "text"
+
+
+def read_leetcode_header(fp: BinaryIO) -> Optional[int]:
+    """
+    Read the (optional) number of vertices that precedes the `[[u,v],...]` list, and
+    leave the file positioned at the opening bracket.
+    """
+    prefix = b""
+    while True:
+        block = fp.read(4096)
+        if not block:
+            break
+        bracket = block.find(b"[")
+        if bracket != -1:
+            fp.seek(fp.tell() - len(block) + bracket)
+            prefix += block[:bracket]
+            break
+        prefix += block
+
+    numbers = regex.findall(rb"-?\d+", prefix)
+    return int(numbers[0]) if numbers else None
+
+
+def read_text_header(fp: BinaryIO) -> Optional[int]:
+    """
+    Read a numeric header line (like "n m", with the number of vertices first), skipping
+    the comments and blank lines before it, and leave the file positioned after it.
+    """
+    while True:
+        line = fp.readline()
+        if not line:
+            return None
+        numbers = regex.match(rb"[ \t]*(-?\d+)", line)
+        if numbers:
+            return int(numbers.group(1))
+
+
+def iter_text_chunks(
+    fp: BinaryIO, edge_regex: regex.Pattern, delimiter: bytes, chunk_bytes: int
+) -> Iterator[array]:
+    """
+    Yield the edges of a text file, parsing roughly `chunk_bytes` at a time. Everything
+    after the last `delimiter` of a chunk is carried over to the next one, so no edge
+    is ever split.
+    """
+    carry = b""
+    while True:
+        block = fp.read(chunk_bytes)
+        if not block:
+            break
+        block = carry + block
+        cut = block.rfind(delimiter) + 1
+        block, carry = block[:cut], block[cut:]
+        pairs = edge_regex.findall(block)
+        if pairs:
+            yield array("q", map(int, chain.from_iterable(pairs)))
+
+    pairs = edge_regex.findall(carry)
+    if pairs:
+        yield array("q", map(int, chain.from_iterable(pairs)))
+
+
+def iter_binary_chunks(
+    fp: BinaryIO, typecode: str, chunk_edges: int
+) -> Iterator[array]:
+    """Yield the edges of a file of packed integers (in native byte order)."""
+    while True:
+        chunk = array(typecode)
+        try:
+            chunk.fromfile(fp, 2 * chunk_edges)
+        except EOFError:
+            pass  # The partial chunk has still been read
+        if len(chunk) % 2:
+            raise ValueError("The file contains an odd number of integers")
+        if not chunk:
+            break
+        yield chunk
+
+
+class CSRBuilder:
+    """Builds a `CSRGraph` from two passes over the same chunks of edges."""
+
+    def __init__(self, n: int = 0) -> None:
+        self.degrees = array("q", bytes(8 * n))
+        self.offsets: Optional[array] = None
+        self.neighbours: Optional[array] = None
+        self.cursor: Optional[array] = None
+
+    def count(self, chunk: array):
+        """First pass: count the degree of every vertex."""
+        counts = Counter(chunk)
+        if not counts:
+            return
+        if min(counts) < 0:
+            raise ValueError("Vertices must be non-negative integers")
+        top = max(counts)
+        if top >= len(self.degrees):
+            self.degrees.frombytes(bytes(8 * (top + 1 - len(self.degrees))))
+        degrees = self.degrees
+        for v, c in counts.items():
+            degrees[v] += c
+
+    def allocate(self):
+        """Turn the degrees into offsets, and allocate the neighbours."""
+        n = len(self.degrees)
+        self.offsets = array("q", [0])
+        self.offsets.extend(self.degrees)
+        for i in range(n):
+            self.offsets[i + 1] += self.offsets[i]
+        self.degrees = None
+
+        self.neighbours = array(_index_typecode(n))
+        self.neighbours.frombytes(bytes(self.neighbours.itemsize * self.offsets[-1]))
+        self.cursor = array("q", self.offsets[:-1])
+
+    def place(self, chunk: array):
+        """Second pass: put every edge endpoint in its slot."""
+        neighbours = self.neighbours
+        cursor = self.cursor
+        for i in range(0, len(chunk), 2):
+            u, v = chunk[i], chunk[i + 1]
+            neighbours[cursor[u]] = v
+            cursor[u] += 1
+            neighbours[cursor[v]] = u
+            cursor[v] += 1
+
+    def build(self) -> CSRGraph:
+        return CSRGraph(range(len(self.offsets) - 1), self.offsets, self.neighbours)
+
+
+class NumpyCSRBuilder(CSRBuilder):
+    """Same as `CSRBuilder`, but handles every chunk with a few NumPy operations."""
+
+    def __init__(self, n: int = 0) -> None:
+        super().__init__(n)
+        self.degrees = np.zeros(n, dtype=np.int64)
+
+    def count(self, chunk: array):
+        endpoints = np.frombuffer(chunk, dtype=chunk.typecode)
+        if len(endpoints) == 0:
+            return
+        if endpoints.min() < 0:
+            raise ValueError("Vertices must be non-negative integers")
+        counts = np.bincount(endpoints)
+        if len(counts) > len(self.degrees):
+            self.degrees.resize(len(counts), refcheck=False)
+        self.degrees[: len(counts)] += counts
+
+    def allocate(self):
+        n = len(self.degrees)
+        self.offsets = array("q", [0])
+        self.offsets.frombytes(np.cumsum(self.degrees, dtype=np.int64).tobytes())
+        self.degrees = None
+
+        self.neighbours = array(_index_typecode(n))
+        self.neighbours.frombytes(bytes(self.neighbours.itemsize * self.offsets[-1]))
+        self.cursor = np.frombuffer(self.offsets, dtype=np.int64)[:-1].copy()
+
+    def place(self, chunk: array):
+        endpoints = np.frombuffer(chunk, dtype=chunk.typecode).astype(np.int64)
+        if len(endpoints) == 0:
+            return
+        # For every endpoint, the vertex at the other end of its edge
+        others = endpoints.reshape(-1, 2)[:, ::-1].ravel()
+
+        # Group the endpoints by vertex, keeping them in file order within a group
+        order = np.argsort(endpoints, kind="stable")
+        grouped = endpoints[order]
+        starts = np.flatnonzero(np.r_[True, grouped[1:] != grouped[:-1]])
+        sizes = np.diff(np.r_[starts, len(grouped)])
+        rank = np.arange(len(grouped)) - np.repeat(starts, sizes)
+
+        neighbours = np.frombuffer(self.neighbours, dtype=self.neighbours.typecode)
+        neighbours[self.cursor[grouped] + rank] = others[order]
+        self.cursor[grouped[starts]] += sizes
+
+
+def load_csr_graph(
+    filename: str,
+    read_chunks: ChunkReader,
+    n: Optional[int] = None,
+    read_header: Optional[Callable[[BinaryIO], Optional[int]]] = None,
+) -> CSRGraph:
+    """
+    Build a `CSRGraph` on the vertices `0 ... n - 1` by reading the file twice. If `n`
+    isn't given, it is one more than the largest vertex in the file (or the header).
+    """
+    Builder = CSRBuilder if np is None else NumpyCSRBuilder
+
+    with open(filename, "rb") as fp:
+        if read_header is not None:
+            header_n = read_header(fp)
+            if header_n is not None and n is None:
+                n = header_n
+        builder = Builder(n or 0)
+        start = fp.tell()
+
+        for chunk in read_chunks(fp):
+            builder.count(chunk)
+        builder.allocate()
+
+        fp.seek(start)
+        for chunk in read_chunks(fp):
+            builder.place(chunk)
+
+    return builder.build()
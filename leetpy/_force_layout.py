@@ -1,8 +1,9 @@
 import math
-from random import randint, random
 import re as regex
 from typing import TypeVar, TypedDict, Optional, Dict, List, Tuple, Sequence
 
+from .rng import SeedLike, as_random
+
 # TODO: Add documentation
 
 Vertex = TypeVar("Vertex")
@@ -39,55 +40,260 @@ def f_rep(u: EmbedNode, v: EmbedNode, L: float) -> complex:
     return magnitude * (-u_to_v)
 
 
-def f_attr(u: EmbedNode, v: EmbedNode, L: float) -> complex:
+def f_attr(u: EmbedNode, v: EmbedNode, L: float, squared: bool = False) -> complex:
     u_to_v = v.pos - u.pos
     if abs(u_to_v) == 0:
         u_to_v = 1
     u_to_v = u_to_v / abs(u_to_v)
 
     # TODO: Squaring is mathematically correct but causes large attractive forces
+    # (only safe when the step length doesn't scale with the force, see refine_layout)
     dist = abs(u.pos - v.pos)
-    # dist = abs(u.pos - v.pos) ** 2
+    if squared:
+        dist = abs(u.pos - v.pos) ** 2
     magnitude = dist / L
     return magnitude * u_to_v
 
 
-def create_embedding(vertices: Sequence[Vertex]) -> Dict[Vertex, EmbedNode]:
+def create_embedding(
+    vertices: Sequence[Vertex],
+    initial_positions: Optional[Dict[Vertex, Tuple[float, float]]] = None,
+    graph: Optional[Dict[Vertex, List[Vertex]]] = None,
+    seed: SeedLike = None,
+) -> Dict[Vertex, EmbedNode]:
+    """
+    Give every vertex a distinct random starting position.
+
+    With `initial_positions` (a warm start), the vertices in it start where they were,
+    and every other vertex is placed near its already placed neighbours in `graph`
+    (spreading outwards from the placed vertices). Vertices that can't be reached that
+    way are scattered around the placed ones.
+
+    `seed` is passed to `leetpy.rng.as_random`.
+    """
+    rng = as_random(seed)
     embeds: Dict[Vertex, EmbedNode] = {}
 
-    points = set()
+    if not initial_positions:
+        # The box has at least 4 points per vertex, so the sampling always ends quickly
+        radius = max(100, math.isqrt(len(vertices)))
+        points = set()
+        for v in vertices:
+            embeds[v] = EmbedNode()
+            pos = 0 + 0j
+            while pos in points:
+                pos = rng.randint(-radius, radius) + 1j * rng.randint(-radius, radius)
+            points.add(pos)
+            embeds[v].pos = pos
+
+        return embeds
+
+    missing = []
     for v in vertices:
         embeds[v] = EmbedNode()
-        pos = 0 + 0j
-        while pos in points:
-            pos = randint(-100, +100) + 1j * randint(-100, +100)
-        points.add(pos)
-        embeds[v].pos = pos
+        if v in initial_positions:
+            x, y = initial_positions[v]
+            embeds[v].pos = complex(x, y)
+        else:
+            missing.append(v)
+    if not missing:
+        return embeds
+    if len(missing) == len(vertices):
+        return create_embedding(vertices, seed=rng)
+
+    placed = set(vertices) - set(missing)
+
+    def jitter() -> complex:
+        return complex(rng.uniform(-1, 1), rng.uniform(-1, 1)) * (L / 2)
+
+    # Place the missing vertices one "ring" of neighbours at a time
+    frontier = missing if graph is not None else []
+    while frontier:
+        ring = []
+        for v in frontier:
+            if v in placed:
+                continue
+            neighbours = [embeds[u].pos for u in graph[v] if u in placed and u != v]
+            if neighbours:
+                ring.append((v, sum(neighbours) / len(neighbours)))
+        for v, pos in ring:
+            embeds[v].pos = pos + jitter()
+            placed.add(v)
+        frontier = list(
+            dict.fromkeys(u for v, _ in ring for u in graph[v] if u not in placed)
+        )
+
+    # Anything left over has no placed vertex in its component
+    if len(placed) < len(vertices):
+        center, spread = layout_spread({v: embeds[v] for v in placed})
+        for v in missing:
+            if v not in placed:
+                embeds[v].pos = center + jitter() * (1 + 2 * spread / L)
 
     return embeds
 
 
+# A quadtree cell is never split below this depth, so coincident (or nearly coincident)
+# vertices share a leaf instead of recursing forever
+BH_MAX_DEPTH = 32
+
+
+class BH_Cell:
+    """A square cell of the Barnes-Hut quadtree, summarising the vertices inside it."""
+
+    __slots__ = ("center", "half_width", "mass", "pos_sum", "com", "children", "body")
+
+    def __init__(self, center: complex, half_width: float) -> None:
+        self.center: complex = center
+        self.half_width: float = half_width
+        self.mass: int = 0  # Number of vertices inside the cell
+        self.pos_sum: complex = 0 + 0j  # Sum of the positions of those vertices
+        self.com: complex = 0 + 0j  # Center of mass (set by `BH_Tree.finalize`)
+        self.children: Optional[List[Optional["BH_Cell"]]] = None  # None for leaves
+        self.body: Optional[complex] = None  # Position of the vertex in a leaf
+
+    def quadrant(self, pos: complex) -> int:
+        return (pos.real >= self.center.real) + 2 * (pos.imag >= self.center.imag)
+
+    def child(self, quadrant: int) -> "BH_Cell":
+        cell = self.children[quadrant]
+        if cell is None:
+            quarter = self.half_width / 2
+            dx = quarter if quadrant & 1 else -quarter
+            dy = quarter if quadrant & 2 else -quarter
+            cell = BH_Cell(self.center + complex(dx, dy), quarter)
+            self.children[quadrant] = cell
+        return cell
+
+
+class BH_Tree:
+    """
+    A Barnes-Hut quadtree over vertex positions.
+
+    Distant groups of vertices are approximated by a single body at their center of
+    mass, which brings the cost of the repulsive forces on one vertex down from O(V) to
+    O(log V) for reasonably spread out layouts.
+    """
+
+    def __init__(self, positions: Sequence[complex]) -> None:
+        min_x = min(p.real for p in positions)
+        max_x = max(p.real for p in positions)
+        min_y = min(p.imag for p in positions)
+        max_y = max(p.imag for p in positions)
+        half_width = max(max_x - min_x, max_y - min_y, 1) / 2
+        center = complex((min_x + max_x) / 2, (min_y + max_y) / 2)
+
+        self.root = BH_Cell(center, half_width * 1.0001)
+        for pos in positions:
+            self.insert(pos)
+        self.finalize()
+
+    def insert(self, pos: complex):
+        cell = self.root
+        depth = 0
+        while True:
+            cell.mass += 1
+            cell.pos_sum += pos
+
+            if cell.children is not None:  # Internal cell: go one level deeper
+                cell = cell.child(cell.quadrant(pos))
+                depth += 1
+                continue
+
+            if cell.mass == 1:  # The cell was empty
+                cell.body = pos
+                return
+
+            if depth >= BH_MAX_DEPTH or cell.body == pos:
+                # Coincident vertices are summarised by the leaf as they are
+                return
+
+            # Split the leaf and push its old body one level down
+            old_body = cell.body
+            cell.body = None
+            cell.children = [None, None, None, None]
+            old_cell = cell.child(cell.quadrant(old_body))
+            old_cell.mass += cell.mass - 1
+            old_cell.pos_sum += cell.pos_sum - pos
+            old_cell.body = old_body
+
+            cell = cell.child(cell.quadrant(pos))
+            depth += 1
+
+    def finalize(self):
+        """Compute the center of mass of every cell."""
+        stack = [self.root]
+        while stack:
+            cell = stack.pop()
+            cell.com = cell.pos_sum / cell.mass
+            if cell.children is not None:
+                stack.extend(c for c in cell.children if c is not None)
+
+    def repulsion(self, pos: complex, theta: float, L: float) -> complex:
+        """
+        The (approximate) sum of repulsive forces acting on a vertex at `pos`.
+
+        A cell is treated as a single body when `cell width / distance < theta`, so
+        `theta = 0` gives the exact forces and larger values trade accuracy for speed.
+        """
+        # f_rep summed over a body of mass m at a displacement d is -L^2 * m / conj(d)
+        force = 0 + 0j
+        stack = [self.root]
+        while stack:
+            cell = stack.pop()
+            d = cell.com - pos
+            if cell.children is None:
+                if d != 0:  # Skip the vertex itself (and anything coincident with it)
+                    force -= cell.mass / d.conjugate()
+            elif 2 * cell.half_width < theta * abs(d):
+                force -= cell.mass / d.conjugate()
+            else:
+                stack.extend(c for c in cell.children if c is not None)
+
+        return (L**2) * force
+
+
 def calculate_forces(
     vertices: Sequence[Vertex],
     graph: Dict[Vertex, List[Vertex]],
     embeds: Dict[Vertex, EmbedNode],
+    theta: Optional[float] = None,
+    spring_length: float = L,
+    squared_attraction: bool = False,
 ) -> Dict[Vertex, complex]:
     """
     Calculate forces on every vertex.
+
+    Args:
+        theta: When given, repulsive forces are approximated with a Barnes-Hut quadtree
+            using this opening angle, in O(V log V) instead of O(V^2). (example: 0.8)
+        spring_length: The ideal edge length, at which the attractive and repulsive
+            forces between two adjacent vertices cancel out.
+        squared_attraction: Enabling this makes attraction grow with the square of the
+            edge length (as in Fruchterman & Reingold).
     """
     # L = math.sqrt(AREA / len(vertices))
     F = {v: 0 + 0j for v in vertices}
 
+    bh_tree = None
+    if theta is not None and vertices:
+        bh_tree = BH_Tree([embeds[v].pos for v in vertices])
+
     for u in vertices:
         f_rep_sum = 0 + 0j
-        for v in vertices:
-            if u == v:
-                continue
-            f_rep_sum += f_rep(embeds[u], embeds[v], L)
+        if bh_tree is not None:
+            f_rep_sum = bh_tree.repulsion(embeds[u].pos, theta, spring_length)
+        else:
+            for v in vertices:
+                if u == v:
+                    continue
+                f_rep_sum += f_rep(embeds[u], embeds[v], spring_length)
 
         f_attr_sum = 0 + 0j
         for v in graph[u]:
-            f_attr_sum += f_attr(embeds[u], embeds[v], L)
+            f_attr_sum += f_attr(
+                embeds[u], embeds[v], spring_length, squared_attraction
+            )
 
         F[u] = f_rep_sum + f_attr_sum
 
@@ -105,3 +311,300 @@ def apply_forces(
     """
     for u in vertices:
         embeds[u].pos += DELTA * forces[u]
+
+
+def run_layout(
+    vertices: Sequence[Vertex],
+    graph: Dict[Vertex, List[Vertex]],
+    embeds: Dict[Vertex, EmbedNode],
+    iteration_limit: int,
+    epsilon: float,
+    theta: Optional[float] = None,
+    use_numpy: bool = True,
+    frames: Optional[List[List[complex]]] = None,
+    frame_every: int = 1,
+) -> Tuple[int, Dict[Vertex, complex]]:
+    """
+    Move the vertices until the largest force drops below `epsilon`, or the iteration
+    limit is reached. Returns the last iteration and the final forces.
+
+    The exact forces are computed by the vectorised kernel in `_force_layout_numpy` if
+    NumPy is installed, and by `calculate_forces` otherwise.
+
+    If `frames` is given, the positions of the vertices (in order) are appended to it
+    before the first iteration, every `frame_every` iterations, and after the last one.
+    """
+    if theta is None and use_numpy:
+        try:
+            from ._force_layout_numpy import run_layout_numpy
+        except ImportError:
+            pass
+        else:
+            return run_layout_numpy(
+                vertices, graph, embeds, iteration_limit, epsilon, frames, frame_every
+            )
+
+    def record_frame():
+        frames.append([embeds[v].pos for v in vertices])
+
+    if frames is not None:
+        record_frame()
+
+    iteration = 0
+    F = calculate_forces(vertices, graph, embeds, theta)
+    for iteration in range(iteration_limit):
+        apply_forces(vertices, graph, embeds, F)
+        F = calculate_forces(vertices, graph, embeds, theta)
+
+        if frames is not None and (iteration + 1) % frame_every == 0:
+            record_frame()
+
+        if max(abs(f) for f in F.values()) < epsilon:
+            break
+
+    if frames is not None and iteration_limit > 0 and (iteration + 1) % frame_every:
+        record_frame()
+
+    return iteration, F
+
+
+# Coarsening stops once a graph has at most this many vertices
+COARSEST_SIZE = 50
+# ... or when a round of coarsening removes less than this fraction of the vertices
+MIN_COARSENING_RATIO = 0.1
+# Unmatched vertices are collapsed into a neighbour if matching leaves more than this
+# fraction of the vertices
+COLLAPSE_THRESHOLD = 0.75
+# Initial step length (relative to the spring length) when refining an interpolated layout
+FINE_LEVEL_STEP = 0.2
+# ... and when refining a warm start, where most vertices are already in place
+WARM_START_STEP = 0.1
+# Adaptive cooling: multiply (or divide) the step length by this factor
+COOLING_FACTOR = 0.9
+
+
+class AdaptiveCooling:
+    """
+    The adaptive step length control from "Efficient and High Quality Force-Directed
+    Graph Drawing" by Yifan Hu (2005).
+
+    The step grows again after 5 consecutive iterations that lower the energy, and
+    shrinks after every iteration that doesn't, so layouts neither oscillate nor crawl.
+    """
+
+    def __init__(self, step: float, t: float = COOLING_FACTOR) -> None:
+        self.step = step
+        self.t = t
+        self.progress = 0
+        self.energy = math.inf
+
+    def update(self, energy: float) -> float:
+        if energy < self.energy:
+            self.progress += 1
+            if self.progress >= 5:
+                self.progress = 0
+                self.step /= self.t
+        else:
+            self.progress = 0
+            self.step *= self.t
+        self.energy = energy
+        return self.step
+
+
+def refine_layout(
+    vertices: Sequence[Vertex],
+    graph: Dict[Vertex, List[Vertex]],
+    embeds: Dict[Vertex, EmbedNode],
+    spring_length: float,
+    iteration_limit: int,
+    tolerance: float,
+    theta: Optional[float] = None,
+    use_numpy: bool = True,
+    initial_step: Optional[float] = None,
+) -> int:
+    """
+    Move every vertex a fixed step in the direction of its force, with the step length
+    controlled by `AdaptiveCooling`. Since steps don't scale with the forces, this uses
+    the stronger (squared) attraction. Stops when the step drops below
+    `tolerance * spring_length`. Returns the number of force evaluations.
+    """
+    if theta is None and use_numpy:
+        try:
+            from ._force_layout_numpy import refine_layout_numpy
+        except ImportError:
+            pass
+        else:
+            return refine_layout_numpy(
+                vertices,
+                graph,
+                embeds,
+                spring_length,
+                iteration_limit,
+                tolerance,
+                initial_step,
+            )
+
+    cooling = AdaptiveCooling(initial_step or spring_length)
+    step = cooling.step
+    iterations = 0
+    while iterations < iteration_limit and step >= tolerance * spring_length:
+        F = calculate_forces(vertices, graph, embeds, theta, spring_length, True)
+        iterations += 1
+
+        energy = 0.0
+        for u in vertices:
+            magnitude = abs(F[u])
+            if magnitude != 0:
+                embeds[u].pos += step * F[u] / magnitude
+            energy += magnitude**2
+        step = cooling.update(energy)
+
+    return iterations
+
+
+def coarsen(
+    vertices: Sequence[Vertex], graph: Dict[Vertex, List[Vertex]]
+) -> Tuple[List[int], Dict[int, List[int]], Dict[Vertex, int]]:
+    """
+    Create a smaller graph by merging every vertex with (at most) one of its neighbours,
+    preferring neighbours of low degree.
+
+    If matching alone doesn't shrink the graph enough (e.g. for stars), the remaining
+    unmatched vertices are collapsed into the group of any of their neighbours.
+
+    Returns the vertices (`0, 1, ...`) and adjacency lists of the coarse graph, and the
+    coarse vertex that every vertex was merged into.
+    """
+    parent: Dict[Vertex, int] = {}
+    unmatched: List[Vertex] = []
+    group_count = 0
+
+    for u in sorted(vertices, key=lambda v: len(graph[v])):
+        if u in parent:
+            continue
+        partner = None
+        for v in graph[u]:
+            if v == u or v in parent:
+                continue
+            if partner is None or len(graph[v]) < len(graph[partner]):
+                partner = v
+
+        parent[u] = group_count
+        if partner is None:
+            unmatched.append(u)
+        else:
+            parent[partner] = group_count
+        group_count += 1
+
+    if group_count > COLLAPSE_THRESHOLD * len(vertices):
+        for u in unmatched:
+            for v in graph[u]:
+                if v != u:
+                    parent[u] = parent[v]
+                    break
+
+    # Renumber the groups that are still in use
+    renumbered: Dict[int, int] = {}
+    for u in vertices:
+        parent[u] = renumbered.setdefault(parent[u], len(renumbered))
+
+    coarse_vertices = list(range(len(renumbered)))
+    coarse_neighbours = [set() for _ in coarse_vertices]
+    for u in vertices:
+        a = parent[u]
+        for v in graph[u]:
+            b = parent[v]
+            if a != b:
+                coarse_neighbours[a].add(b)
+    coarse_graph = {a: list(coarse_neighbours[a]) for a in coarse_vertices}
+
+    return coarse_vertices, coarse_graph, parent
+
+
+def layout_spread(embeds: Dict[Vertex, EmbedNode]) -> Tuple[complex, float]:
+    """The centroid of the vertices and their root-mean-square distance from it."""
+    center = sum(e.pos for e in embeds.values()) / len(embeds)
+    variance = sum(abs(e.pos - center) ** 2 for e in embeds.values()) / len(embeds)
+    return center, math.sqrt(variance)
+
+
+def run_multilevel_layout(
+    vertices: Sequence[Vertex],
+    graph: Dict[Vertex, List[Vertex]],
+    embeds: Dict[Vertex, EmbedNode],
+    iteration_limit: int,
+    tolerance: float,
+    theta: Optional[float] = None,
+    area: Optional[float] = None,
+    use_numpy: bool = True,
+    seed: SeedLike = None,
+) -> int:
+    """
+    Lay out the graph by repeatedly coarsening it, laying out the smallest graph, and
+    then interpolating and refining the positions at every finer level.
+
+    The spring length of every level is `sqrt(area / |V|)`, so all levels fill the same
+    drawing area. By default, `area` is chosen so that the final level uses `L`.
+
+    Returns the total number of force evaluations.
+    """
+    if not vertices:
+        return 0
+    rng = as_random(seed)
+    if area is None:
+        area = (L**2) * len(vertices)
+
+    levels: List[Tuple[Sequence[Vertex], Dict[Vertex, List[Vertex]], Dict]] = []
+    coarse_vertices, coarse_graph = vertices, graph
+    while len(coarse_vertices) > COARSEST_SIZE:
+        next_vertices, next_graph, parent = coarsen(coarse_vertices, coarse_graph)
+        if len(next_vertices) > (1 - MIN_COARSENING_RATIO) * len(coarse_vertices):
+            break
+        levels.append((coarse_vertices, coarse_graph, parent))
+        coarse_vertices, coarse_graph = next_vertices, next_graph
+
+    coarse_embeds = create_embedding(coarse_vertices, seed=rng) if levels else embeds
+    total_iterations = refine_layout(
+        coarse_vertices,
+        coarse_graph,
+        coarse_embeds,
+        math.sqrt(area / len(coarse_vertices)),
+        iteration_limit,
+        tolerance,
+        theta,
+        use_numpy,
+    )
+
+    # Every level settles into a somewhat larger layout than the one before it. The
+    # interpolated positions are stretched by the growth seen at the previous level, so
+    # that refinement doesn't spend its iterations on a global expansion.
+    growth = 1.0
+    for level_vertices, level_graph, parent in reversed(levels):
+        K = math.sqrt(area / len(level_vertices))
+        center, coarse_spread = layout_spread(coarse_embeds)
+        level_embeds = embeds if level_vertices is vertices else {}
+        # Place every vertex near the coarse vertex it was merged into
+        for u in level_vertices:
+            if u not in level_embeds:
+                level_embeds[u] = EmbedNode()
+            jitter = complex(rng.uniform(-1, 1), rng.uniform(-1, 1)) * (K / 10)
+            coarse_pos = coarse_embeds[parent[u]].pos
+            level_embeds[u].pos = center + growth * (coarse_pos - center) + jitter
+
+        # The interpolated layout is already close, so start with a shorter step
+        total_iterations += refine_layout(
+            level_vertices,
+            level_graph,
+            level_embeds,
+            K,
+            iteration_limit,
+            tolerance,
+            theta,
+            use_numpy,
+            FINE_LEVEL_STEP * K,
+        )
+        if coarse_spread > 0:
+            growth = layout_spread(level_embeds)[1] / coarse_spread
+        coarse_embeds = level_embeds
+
+    return total_iterations
@@ -0,0 +1,464 @@
+"""
+Iterative (recursion-free) graph algorithms that work on any adjacency mapping: the
+dictionary form (vertex -> list of neighbours) or a `CSRGraph`.
+
+Shortest path algorithms also accept weighted adjacency lists, where every entry is a
+`(neighbour, weight)` pair.
+"""
+
+from collections import deque
+from heapq import heappop, heappush
+import math
+from numbers import Real
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+Vertex = TypeVar("Vertex")
+Adjacency = Mapping[Vertex, Sequence[Vertex]]
+
+
+class DisjointSet:
+    """
+    A union-find structure over the integers `0 ... n - 1`, with path compression (path
+    halving) and union by rank, so a sequence of operations runs in near-linear time.
+    """
+
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
+        self.rank = [0] * n
+        self.count = n  # The number of disjoint sets
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, x: int, y: int) -> bool:
+        """Merge the sets of `x` and `y`. Returns `False` if they were already merged."""
+        x = self.find(x)
+        y = self.find(y)
+        if x == y:
+            return False
+        if self.rank[x] < self.rank[y]:
+            x, y = y, x
+        self.parent[y] = x
+        if self.rank[x] == self.rank[y]:
+            self.rank[x] += 1
+        self.count -= 1
+        return True
+
+
+def travel_bfs(graph: Adjacency, source: Vertex) -> Iterator[Vertex]:
+    """Yield the vertices reachable from `source` in breadth-first order."""
+    seen = {source}
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        yield u
+        for v in graph[u]:
+            if v not in seen:
+                seen.add(v)
+                queue.append(v)
+
+
+def travel_dfs(graph: Adjacency, source: Vertex) -> Iterator[Vertex]:
+    """
+    Yield the vertices reachable from `source` in depth-first preorder (the same order
+    as the recursive algorithm), using an explicit stack of neighbour iterators.
+    """
+    seen = {source}
+    yield source
+    stack = [iter(graph[source])]
+    while stack:
+        for v in stack[-1]:
+            if v not in seen:
+                seen.add(v)
+                yield v
+                stack.append(iter(graph[v]))
+                break
+        else:
+            stack.pop()
+
+
+def union_edges(graph: Adjacency) -> DisjointSet:
+    """
+    A `DisjointSet` over the indices of the vertices (in iteration order), with the
+    endpoints of every edge merged.
+    """
+    index: Dict[Vertex, int] = {v: i for i, v in enumerate(graph)}
+    components = DisjointSet(len(index))
+    for u, i in index.items():
+        for v in graph[u]:
+            components.union(i, index[v])
+    return components
+
+
+def connected_components(graph: Adjacency) -> List[List[Vertex]]:
+    """
+    The vertices of every connected component, in the order in which the components
+    (and the vertices within them) first appear in the graph.
+    """
+    vertices = list(graph)
+    components = union_edges(graph)
+
+    groups: Dict[int, List[Vertex]] = {}
+    for i, v in enumerate(vertices):
+        groups.setdefault(components.find(i), []).append(v)
+    return list(groups.values())
+
+
+def is_bipartite(graph: Adjacency) -> bool:
+    """Check whether the vertices can be 2-coloured with no edge inside a colour."""
+    color: Dict[Vertex, int] = {}
+    for source in graph:
+        if source in color:
+            continue
+        color[source] = 0
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            for v in graph[u]:
+                if v not in color:
+                    color[v] = 1 - color[u]
+                    queue.append(v)
+                elif color[v] == color[u]:
+                    return False
+    return True
+
+
+def is_cyclic(graph: Adjacency) -> bool:
+    """
+    Check whether an undirected graph contains a cycle (including self-loops and
+    parallel edges).
+
+    Every edge is stored twice in the adjacency lists, so it is only merged from its
+    endpoint with the smaller index; an edge whose endpoints are already connected
+    closes a cycle.
+    """
+    index: Dict[Vertex, int] = {v: i for i, v in enumerate(graph)}
+    components = DisjointSet(len(index))
+    for u, i in index.items():
+        for v in graph[u]:
+            j = index[v]
+            if i < j and not components.union(i, j):
+                return True
+            if i == j:
+                return True
+    return False
+
+
+def is_weighted(graph: Adjacency) -> bool:
+    """
+    Check whether the adjacency lists hold `(neighbour, weight)` pairs, from their first
+    entry: a pair of a vertex and a number, which isn't a vertex itself (unlike the
+    `(row, col)` vertices of a grid).
+    """
+    for u in graph:
+        for entry in graph[u]:
+            return (
+                isinstance(entry, tuple)
+                and len(entry) == 2
+                and entry not in graph
+                and entry[0] in graph
+                and isinstance(entry[1], Real)
+            )
+    return False
+
+
+def classify_weights(
+    graph: Adjacency, weighted: Optional[bool] = None
+) -> Tuple[str, float]:
+    """
+    Pick the fastest shortest path algorithm that the edge weights allow:
+
+    - ("bfs", w) if every edge has the same positive weight `w` (or no weights at all)
+    - ("0-1 bfs", w) if every edge has a weight of either 0 or `w`
+    - ("dijkstra", 0) otherwise
+
+    Raises `ValueError` for negative weights. If `weighted` isn't given, it's detected
+    with `is_weighted`.
+    """
+    if weighted is None:
+        weighted = is_weighted(graph)
+    if not weighted:
+        return "bfs", 1
+
+    weights: Set[float] = set()
+    for u in graph:
+        for _, w in graph[u]:
+            if w < 0:
+                raise ValueError(f"Negative edge weight: {w}")
+            if w not in weights:
+                weights.add(w)
+                if len(weights) > 2:
+                    return "dijkstra", 0
+
+    positive = [w for w in weights if w > 0]
+    if len(positive) == 0:
+        return "0-1 bfs", 1
+    if len(weights) == 1:
+        return "bfs", positive[0]
+    if len(positive) == 1:
+        return "0-1 bfs", positive[0]
+    return "dijkstra", 0
+
+
+def _unweighted_neighbours(
+    graph: Adjacency, u: Vertex, weighted: bool
+) -> Iterator[Vertex]:
+    """The neighbours of `u`, without their weights."""
+    if weighted:
+        return (v for v, _ in graph[u])
+    return iter(graph[u])
+
+
+def reconstruct_path(parent: Dict[Vertex, Vertex], target: Vertex) -> List[Vertex]:
+    """The path from the root of a shortest path tree to `target`."""
+    path = [target]
+    while path[-1] in parent:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
+
+
+def bfs_shortest_paths(
+    graph: Adjacency,
+    source: Vertex,
+    weight: float = 1,
+    target: Optional[Vertex] = None,
+    weighted: bool = False,
+) -> Tuple[Dict[Vertex, float], Dict[Vertex, Vertex]]:
+    """
+    Distances (and BFS tree parents) from `source`, when every edge has the same
+    `weight`. Stops early once `target` is reached. `weighted` tells whether the
+    adjacency lists hold `(neighbour, weight)` pairs.
+    """
+    hops = {source: 0}
+    parent: Dict[Vertex, Vertex] = {}
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        if u == target:
+            break
+        for v in _unweighted_neighbours(graph, u, weighted):
+            if v not in hops:
+                hops[v] = hops[u] + 1
+                parent[v] = u
+                queue.append(v)
+    return {v: h * weight for v, h in hops.items()}, parent
+
+
+def zero_one_bfs_shortest_paths(
+    graph: Adjacency,
+    source: Vertex,
+    target: Optional[Vertex] = None,
+) -> Tuple[Dict[Vertex, float], Dict[Vertex, Vertex]]:
+    """
+    Distances (and shortest path tree parents) from `source`, when every edge weighs
+    either 0 or some other constant. 0-weight edges are pushed to the front of a deque
+    and the others to the back, so vertices leave the deque in order of distance.
+    """
+    dist = {source: 0}
+    parent: Dict[Vertex, Vertex] = {}
+    done: Set[Vertex] = set()
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        if u in done:
+            continue
+        done.add(u)
+        if u == target:
+            break
+        for v, w in graph[u]:
+            d = dist[u] + w
+            if v not in dist or d < dist[v]:
+                dist[v] = d
+                parent[v] = u
+                if w == 0:
+                    queue.appendleft(v)
+                else:
+                    queue.append(v)
+    return dist, parent
+
+
+def dijkstra_shortest_paths(
+    graph: Adjacency,
+    source: Vertex,
+    target: Optional[Vertex] = None,
+) -> Tuple[Dict[Vertex, float], Dict[Vertex, Vertex]]:
+    """
+    Distances (and shortest path tree parents) from `source`, using a binary heap with
+    lazy deletion: outdated heap entries are skipped when popped instead of being
+    removed when a shorter distance is found.
+    """
+    dist = {source: 0}
+    parent: Dict[Vertex, Vertex] = {}
+    done: Set[Vertex] = set()
+    # The counter breaks ties, so vertices themselves are never compared
+    heap = [(0, 0, source)]
+    counter = 1
+    while heap:
+        d, _, u = heappop(heap)
+        if u in done:
+            continue
+        done.add(u)
+        if u == target:
+            break
+        for v, w in graph[u]:
+            nd = d + w
+            if v not in dist or nd < dist[v]:
+                dist[v] = nd
+                parent[v] = u
+                heappush(heap, (nd, counter, v))
+                counter += 1
+    return dist, parent
+
+
+def bidirectional_dijkstra(
+    graph: Adjacency, source: Vertex, target: Vertex
+) -> Tuple[float, List[Vertex]]:
+    """
+    The shortest distance and path between two vertices of an undirected graph, by
+    running Dijkstra's algorithm from both ends until the searches meet. Returns
+    `(inf, [])` if `target` can't be reached.
+    """
+    if source == target:
+        return 0, [source]
+
+    dists = ({source: 0}, {target: 0})
+    parents: Tuple[Dict, Dict] = ({}, {})
+    done: Tuple[Set, Set] = (set(), set())
+    heaps = ([(0, 0, source)], [(0, 0, target)])
+    counter = 1
+
+    best = math.inf
+    meeting = None
+    while heaps[0] and heaps[1]:
+        # The searches can stop once no unexplored path can beat the best one so far
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+
+        # Advance the search with the smaller frontier
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        dist, other_dist = dists[side], dists[1 - side]
+
+        d, _, u = heappop(heaps[side])
+        if u in done[side]:
+            continue
+        done[side].add(u)
+
+        for v, w in graph[u]:
+            nd = d + w
+            if v not in dist or nd < dist[v]:
+                dist[v] = nd
+                parents[side][v] = u
+                heappush(heaps[side], (nd, counter, v))
+                counter += 1
+            if v in other_dist and nd + other_dist[v] < best:
+                best = nd + other_dist[v]
+                meeting = v
+
+    if meeting is None:
+        return math.inf, []
+
+    # Both halves of the path, through the meeting vertex
+    forward = reconstruct_path(parents[0], meeting)
+    backward = reconstruct_path(parents[1], meeting)
+    backward.reverse()
+    return best, forward + backward[1:]
+
+
+def reverse_graph(graph: Adjacency) -> Dict[Vertex, List[Vertex]]:
+    """The directed graph with every edge `u -> v` replaced by `v -> u`."""
+    reverse: Dict[Vertex, List[Vertex]] = {u: [] for u in graph}
+    for u in graph:
+        for v in graph[u]:
+            reverse[v].append(u)
+    return reverse
+
+
+def topological_sort(graph: Adjacency) -> Optional[List[Vertex]]:
+    """
+    An ordering of the vertices of a directed graph where every edge points forward,
+    using Kahn's algorithm. Returns `None` if the graph contains a cycle.
+    """
+    indegree: Dict[Vertex, int] = {u: 0 for u in graph}
+    for u in graph:
+        for v in graph[u]:
+            indegree[v] += 1
+
+    order = [u for u, d in indegree.items() if d == 0]
+    # `order` doubles as the queue: vertices are appended once all their edges are seen
+    for u in order:
+        for v in graph[u]:
+            indegree[v] -= 1
+            if indegree[v] == 0:
+                order.append(v)
+
+    return order if len(order) == len(indegree) else None
+
+
+def strongly_connected_components(graph: Adjacency) -> List[List[Vertex]]:
+    """
+    The strongly connected components of a directed graph, using Tarjan's algorithm with
+    an explicit stack of neighbour iterators.
+
+    Tarjan's algorithm finds the components in reverse topological order; they are
+    returned in topological order (every edge between two components points forward).
+    """
+    index: Dict[Vertex, int] = {}
+    low: Dict[Vertex, int] = {}
+    on_stack: Set[Vertex] = set()
+    stack: List[Vertex] = []
+    components: List[List[Vertex]] = []
+
+    for root in graph:
+        if root in index:
+            continue
+
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph[root]))]
+
+        while work:
+            u, neighbours = work[-1]
+            for v in neighbours:
+                if v not in index:
+                    index[v] = low[v] = len(index)
+                    stack.append(v)
+                    on_stack.add(v)
+                    work.append((v, iter(graph[v])))
+                    break
+                elif v in on_stack and index[v] < low[u]:
+                    low[u] = index[v]
+            else:
+                # Every neighbour of u is done
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[u] < low[parent]:
+                        low[parent] = low[u]
+                if low[u] == index[u]:
+                    component = []
+                    while True:
+                        v = stack.pop()
+                        on_stack.discard(v)
+                        component.append(v)
+                        if v == u:
+                            break
+                    components.append(component)
+
+    components.reverse()
+    return components
@@ -0,0 +1,201 @@
+"""
+Streaming writers for exporting graphs as Python code or LeetCode-style test input.
+
+Edges are written to a file-like object a batch at a time, so exporting a graph never
+builds a string proportional to its size (unless the caller asks for one).
+"""
+
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, TypeVar
+
+Vertex = TypeVar("Vertex")
+
+# The number of edges written with a single `write` call
+EDGES_PER_BATCH = 4096
+# The number of edges on every line of an edge list literal in exported code
+EDGES_PER_LINE = 8
+# The number of edges on every line of a constant table
+TABLE_EDGES_PER_LINE = 16
+
+
+def batches(items: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def vertex_index(vertices: Sequence[Vertex]) -> Optional[Dict[Vertex, int]]:
+    """
+    The index of every vertex, or `None` if the vertices are `0 ... n - 1` in order (in
+    which case every vertex is its own index).
+    """
+    if isinstance(vertices, range) and vertices.start == 0 and vertices.step == 1:
+        return None
+    if all(type(v) is int and v == i for i, v in enumerate(vertices)):
+        return None
+    return {v: i for i, v in enumerate(vertices)}
+
+
+def write_leetcode_edges(
+    fp: TextIO, vertices: Sequence[Vertex], edge_list: Iterable[Sequence[Vertex]]
+):
+    """
+    Write the number of vertices, and then every edge as `[u,v]` (or `[u,v,weight]`) in
+    a single `[[...],...]` list, with vertices replaced by their indices.
+    """
+    index = vertex_index(vertices)
+    fp.write(f"{len(vertices)}\n[")
+    first = True
+    for batch in batches(edge_list, EDGES_PER_BATCH):
+        items = []
+        for edge in batch:
+            u, v = edge[0], edge[1]
+            if index is not None:
+                u, v = index[u], index[v]
+            extra = "".join(f",{w!r}" for w in edge[2:])
+            items.append(f"[{u},{v}{extra}]")
+        fp.write(("" if first else ",") + ",".join(items))
+        first = False
+    fp.write("]\n")
+
+
+def write_leetcode_adjacency(
+    fp: TextIO,
+    vertices: Sequence[Vertex],
+    graph: Dict[Vertex, List[Vertex]],
+    weighted: bool = False,
+):
+    """
+    Write the neighbours of every vertex (by index) as one `[[...],...]` list, where
+    the i'th inner list holds the neighbours of the i'th vertex (as `[neighbour,weight]`
+    pairs if the adjacency lists are `weighted`).
+    """
+    index = vertex_index(vertices)
+    fp.write("[")
+    first = True
+    for batch in batches(vertices, EDGES_PER_BATCH):
+        items = []
+        for u in batch:
+            if weighted:
+                entries = (
+                    f"[{v if index is None else index[v]},{w!r}]" for v, w in graph[u]
+                )
+            else:
+                neighbours = graph[u]
+                if index is not None:
+                    neighbours = [index[v] for v in neighbours]
+                entries = map(str, neighbours)
+            items.append("[" + ",".join(entries) + "]")
+        fp.write(("" if first else ",") + ",".join(items))
+        first = False
+    fp.write("]\n")
+
+
+def check_edge(edge: Sequence, weighted: bool) -> Sequence:
+    if weighted:
+        assert len(edge) == 3, f"Expected a (u, v, weight) edge, got {edge!r}"
+    else:
+        assert len(edge) == 2, f"Expected a (u, v) edge, got {edge!r}"
+    return edge
+
+
+def write_code(
+    fp: TextIO,
+    vertices: Sequence[Vertex],
+    edge_list: Iterable[Sequence[Vertex]],
+    edge_count: int,
+    indent: int,
+    function_name: str,
+    type_hints: bool,
+    table_threshold: int,
+    weighted: bool = False,
+):
+    """
+    Write a Python function that returns the adjacency lists of the graph, with
+    `(neighbour, weight)` pairs if `weighted` (like `create_from_edge_list`).
+
+    Graphs with at most `table_threshold` edges are written as readable `vertices` and
+    `edge_list` literals. Larger graphs store their edges (as vertex indices, and
+    numeric weights) in a module-level string constant, which compiles as a single
+    constant no matter how many edges there are, and is parsed when the function runs.
+    """
+    edge_list = (check_edge(edge, weighted) for edge in edge_list)
+    pad = " " * indent
+    return_type = " -> dict" if type_hints else ""
+    index = vertex_index(vertices)
+    if index is None:
+        vertices_code = f"range({len(vertices)})"
+    else:
+        vertices_code = "[" + ", ".join(map(repr, vertices)) + "]"
+
+    if edge_count <= table_threshold:
+        fp.write(f"def {function_name}(){return_type}:\n")
+        fp.write(f"{pad}vertices = {vertices_code}\n")
+        fp.write(f"{pad}edge_list = [\n")
+        for line in batches(edge_list, EDGES_PER_LINE):
+            edges = ", ".join(repr(tuple(edge)) for edge in line)
+            fp.write(f"{pad}{pad}{edges},\n")
+        fp.write(f"{pad}]\n")
+        fp.write(f"{pad}graph = {{vertex: [] for vertex in vertices}}\n")
+        if weighted:
+            fp.write(
+                f"{pad}for u, v, weight in edge_list:\n"
+                f"{pad}{pad}graph[u].append((v, weight))\n"
+                f"{pad}{pad}graph[v].append((u, weight))\n"
+            )
+        else:
+            fp.write(
+                f"{pad}for u, v in edge_list:\n"
+                f"{pad}{pad}graph[u].append(v)\n"
+                f"{pad}{pad}graph[v].append(u)\n"
+            )
+        fp.write(f"{pad}return graph\n")
+        return
+
+    table = f"{function_name.upper()}_EDGES"
+    fp.write(f'{table} = """\n')
+    for line in batches(edge_list, TABLE_EDGES_PER_LINE):
+        items = []
+        for edge in line:
+            u, v = edge[0], edge[1]
+            if index is not None:
+                u, v = index[u], index[v]
+            if weighted:
+                weight = edge[2]
+                assert type(weight) in (int, float), "Large graphs need numeric weights"
+                items.append(f"{u} {v} {weight!r}")
+            else:
+                items.append(f"{u} {v}")
+        fp.write(" ".join(items) + "\n")
+    fp.write('"""\n\n\n')
+
+    fp.write(
+        f"def {function_name}(){return_type}:\n"
+        f"{pad}vertices = {vertices_code}\n"
+        f"{pad}tokens = {table}.split()\n"
+        f"{pad}graph = {{vertex: [] for vertex in vertices}}\n"
+    )
+    if weighted:
+        fp.write(
+            f"{pad}for i in range(0, len(tokens), 3):\n"
+            f"{pad}{pad}u, v = vertices[int(tokens[i])], vertices[int(tokens[i + 1])]\n"
+            f"{pad}{pad}weight = tokens[i + 2]\n"
+            f'{pad}{pad}if weight.lstrip("-").isdigit():\n'
+            f"{pad}{pad}{pad}weight = int(weight)\n"
+            f"{pad}{pad}else:\n"
+            f"{pad}{pad}{pad}weight = float(weight)\n"
+            f"{pad}{pad}graph[u].append((v, weight))\n"
+            f"{pad}{pad}graph[v].append((u, weight))\n"
+        )
+    else:
+        fp.write(
+            f"{pad}endpoints = [vertices[int(i)] for i in tokens]\n"
+            f"{pad}for i in range(0, len(endpoints), 2):\n"
+            f"{pad}{pad}u, v = endpoints[i], endpoints[i + 1]\n"
+            f"{pad}{pad}graph[u].append(v)\n"
+            f"{pad}{pad}graph[v].append(u)\n"
+        )
+    fp.write(f"{pad}return graph\n")
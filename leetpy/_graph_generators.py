@@ -0,0 +1,187 @@
+"""
+Random graph generators that run in time proportional to the size of their output.
+
+Every generator returns a flat array of edge endpoints `[u0, v0, u1, v1, ...]` on the
+vertices `0 ... n - 1`.
+"""
+
+from array import array
+import math
+from random import Random
+from typing import Iterator, List, Optional
+
+
+def sample_indices(
+    N: int, rng: Random, p: Optional[float] = None, m: Optional[int] = None
+) -> Iterator[int]:
+    """
+    Yield a sorted random subset of `range(N)`: either every index independently with
+    probability `p`, or exactly `m` distinct indices.
+
+    With `p`, the gaps between chosen indices are drawn from a geometric distribution
+    ("Efficient generation of large random networks" by Batagelj & Brandes), so only
+    the chosen indices are ever visited. With `m`, `random.sample` picks indices
+    without the blowup of rejecting duplicate edges when `m` is close to `N`.
+    """
+    if m is not None:
+        assert 0 <= m <= N, f"Can't choose {m} edges out of {N}"
+        yield from sorted(rng.sample(range(N), m))
+        return
+
+    assert p is not None and 0 <= p <= 1, "Expected a probability between 0 and 1"
+    if p == 0:
+        return
+    if p == 1:
+        yield from range(N)
+        return
+
+    log_q = math.log(1 - p)
+    index = -1
+    while True:
+        # 1 - random() is in (0, 1], which keeps the logarithm finite
+        index += 1 + int(math.log(1 - rng.random()) / log_q)
+        if index >= N:
+            return
+        yield index
+
+
+def pair_of_index(k: int) -> List[int]:
+    """The `k`'th pair `(u, v)` with `u < v`, ordered by `v` and then `u`."""
+    v = (1 + math.isqrt(1 + 8 * k)) // 2
+    return [k - v * (v - 1) // 2, v]
+
+
+def index_of_pair(u: int, v: int) -> int:
+    """The inverse of `pair_of_index`."""
+    if u > v:
+        u, v = v, u
+    return v * (v - 1) // 2 + u
+
+
+def random_graph(
+    n: int, rng: Random, p: Optional[float] = None, m: Optional[int] = None
+) -> array:
+    """The Erdős–Rényi random graph G(n, p), or G(n, m)."""
+    edges = array("q")
+    for k in sample_indices(n * (n - 1) // 2, rng, p, m):
+        edges.extend(pair_of_index(k))
+    return edges
+
+
+def random_tree(n: int, rng: Random) -> array:
+    """
+    A uniformly random labelled tree, decoded from a random Prüfer sequence in O(n).
+    """
+    edges = array("q")
+    if n <= 1:
+        return edges
+
+    sequence = [rng.randrange(n) for _ in range(n - 2)]
+    degree = [1] * n
+    for v in sequence:
+        degree[v] += 1
+
+    # `leaf` is always the smallest leaf; `ptr` only ever moves forward
+    ptr = 0
+    while degree[ptr] != 1:
+        ptr += 1
+    leaf = ptr
+    for v in sequence:
+        edges.extend((leaf, v))
+        degree[leaf] -= 1
+        degree[v] -= 1
+        if degree[v] == 1 and v < ptr:
+            leaf = v
+        else:
+            ptr += 1
+            while degree[ptr] != 1:
+                ptr += 1
+            leaf = ptr
+    edges.extend((leaf, n - 1))
+
+    return edges
+
+
+def random_connected_graph(n: int, m: int, rng: Random) -> array:
+    """
+    A random connected graph with `m` edges: a random spanning tree, plus `m - (n - 1)`
+    edges chosen uniformly among the remaining pairs.
+    """
+    N = n * (n - 1) // 2
+    assert n - 1 <= m <= N or (n == 0 and m == 0), f"Can't connect {n} with {m} edges"
+
+    edges = random_tree(n, rng)
+    tree_indices = sorted(
+        index_of_pair(edges[i], edges[i + 1]) for i in range(0, len(edges), 2)
+    )
+
+    # The r'th pair that isn't a tree edge is pair r + (the number of tree edges before
+    # it). The samples are sorted, so a single pointer into the tree edges suffices.
+    j = 0
+    for r in sample_indices(N - len(tree_indices), rng, m=m - len(tree_indices)):
+        while j < len(tree_indices) and tree_indices[j] <= r + j:
+            j += 1
+        edges.extend(pair_of_index(r + j))
+
+    return edges
+
+
+def grid_graph(rows: int, cols: int) -> array:
+    """A `rows` x `cols` grid, where the vertex in row `r` and column `c` is `r*cols+c`."""
+    edges = array("q")
+    for r in range(rows):
+        for c in range(cols):
+            v = r * cols + c
+            if c + 1 < cols:
+                edges.extend((v, v + 1))
+            if r + 1 < rows:
+                edges.extend((v, v + cols))
+    return edges
+
+
+def random_bipartite_graph(
+    n1: int, n2: int, rng: Random, p: Optional[float] = None, m: Optional[int] = None
+) -> array:
+    """
+    A random bipartite graph between the vertices `0 ... n1 - 1` and
+    `n1 ... n1 + n2 - 1`, with every edge present with probability `p` (or exactly `m`
+    edges). `p = 1` gives the complete bipartite graph.
+    """
+    edges = array("q")
+    for k in sample_indices(n1 * n2, rng, p, m):
+        edges.extend((k // n2, n1 + k % n2))
+    return edges
+
+
+def random_digraph(
+    n: int, rng: Random, p: Optional[float] = None, m: Optional[int] = None
+) -> array:
+    """
+    A random directed graph without self-loops, where every ordered pair `(u, v)` is an
+    edge with probability `p` (or exactly `m` edges are chosen).
+    """
+    edges = array("q")
+    if n <= 1:
+        return edges
+    for k in sample_indices(n * (n - 1), rng, p, m):
+        # The r'th vertex other than u
+        u, r = divmod(k, n - 1)
+        edges.extend((u, r + (r >= u)))
+    return edges
+
+
+def random_dag(
+    n: int, rng: Random, p: Optional[float] = None, m: Optional[int] = None
+) -> array:
+    """
+    A random directed acyclic graph: the vertices are shuffled into a random topological
+    order, and every pair is an edge (pointing forward in that order) with probability
+    `p` (or exactly `m` edges are chosen).
+    """
+    order = list(range(n))
+    rng.shuffle(order)
+    edges = array("q")
+    for k in sample_indices(n * (n - 1) // 2, rng, p, m):
+        u, v = pair_of_index(k)
+        edges.extend((order[u], order[v]))
+    return edges
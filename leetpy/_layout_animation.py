@@ -0,0 +1,297 @@
+"""
+Recorded force-directed layouts, saved as a single animation file.
+
+A recording is a list of frames, each holding the positions of every vertex. Positions
+are quantized to integers (in tenths of the node radius), and every frame after the
+first is stored as its change from the previous frame: once a layout starts to settle,
+that is mostly a stream of small numbers.
+"""
+
+import html
+import json
+from typing import Dict, List, Sequence, Tuple, TypeVar
+
+from .undirected_graph import _closest_distance_and_bounds
+
+Vertex = TypeVar("Vertex")
+
+# The node radius, in quantized units
+NODE_RADIUS = 10
+FONT_HEIGHT = NODE_RADIUS
+CHAR_WIDTH = FONT_HEIGHT / 2
+
+
+def quantize(frames: Sequence[Sequence[complex]]) -> List[List[int]]:
+    """
+    Round every frame to a flat list of integers `[x0, y0, x1, y1, ...]`, scaled so that
+    the node radius of the final frame (as in `save_as_svg`) is `NODE_RADIUS` units.
+    """
+    closest, _, _ = _closest_distance_and_bounds([(p.real, p.imag) for p in frames[-1]])
+    radius = min(999, closest / 4) or 1
+    scale = NODE_RADIUS / radius
+
+    quantized = []
+    for frame in frames:
+        flat = []
+        for p in frame:
+            flat.append(round(p.real * scale))
+            flat.append(round(p.imag * scale))
+        quantized.append(flat)
+    return quantized
+
+
+def frame_deltas(quantized: Sequence[Sequence[int]]) -> List[int]:
+    """The first frame, followed by the difference between every pair of frames."""
+    deltas = list(quantized[0])
+    for prev, frame in zip(quantized, quantized[1:]):
+        deltas.extend(b - a for a, b in zip(prev, frame))
+    return deltas
+
+
+def view_box(quantized: Sequence[Sequence[int]]) -> str:
+    """A view box that fits the nodes in every frame."""
+    xs = [min(frame[0::2]) for frame in quantized] + [
+        max(frame[0::2]) for frame in quantized
+    ]
+    ys = [min(frame[1::2]) for frame in quantized] + [
+        max(frame[1::2]) for frame in quantized
+    ]
+    margin = 2 * NODE_RADIUS
+    x, y = min(xs) - margin, min(ys) - margin
+    return f"{x} {y} {max(xs) - x + margin} {max(ys) - y + margin}"
+
+
+def node_label_svg(label: str) -> str:
+    """The label of a node centered at the origin."""
+    x = -CHAR_WIDTH * len(label) / 2
+    y = FONT_HEIGHT / 2 * 0.8
+    return (
+        f'<text x="{x}" y="{y}" style="font-family: monospace; '
+        f'font-size: {FONT_HEIGHT};">{html.escape(label)}</text>'
+    )
+
+
+# Moves every edge onto the current positions of its endpoints (read from the nodes'
+# animated transforms), on every animation frame until the animation ends
+SMIL_EDGE_SCRIPT = """<script><![CDATA[
+const EDGES = %(edges)s;
+const DURATION = %(duration)s;
+const edges = document.getElementById("edges");
+const lines = edges.children;
+const nodes = document.getElementById("nodes").children;
+function follow() {
+  const toEdges = edges.getCTM().inverse();
+  const pos = Array.from(nodes, (node) => toEdges.multiply(node.getCTM()));
+  for (let e = 0; e < lines.length; e++) {
+    const u = pos[EDGES[2 * e]], v = pos[EDGES[2 * e + 1]];
+    lines[e].setAttribute("x1", u.e);
+    lines[e].setAttribute("y1", u.f);
+    lines[e].setAttribute("x2", v.e);
+    lines[e].setAttribute("y2", v.f);
+  }
+  if (document.documentElement.getCurrentTime() <= DURATION) {
+    requestAnimationFrame(follow);
+  }
+}
+requestAnimationFrame(follow);
+]]></script>"""
+
+
+def write_smil_svg(
+    labels: Sequence[str],
+    edges: Sequence[Tuple[int, int]],
+    quantized: Sequence[Sequence[int]],
+    filename: str,
+    frame_duration: float,
+):
+    """
+    Save the recording as an SVG file animated with SMIL.
+
+    Every node moves along a path of relative `l dx,dy` segments (one per frame), so
+    node positions are stored once, as deltas. Edges store no frames at all: a small
+    script moves them with their endpoints. (Viewers that don't run scripts, like an
+    `<img>` tag, show the edges where the nodes start.)
+    """
+    seconds = max(1, len(quantized) - 1) * frame_duration
+    timing = f'dur="{seconds:g}s" calcMode="linear" fill="freeze"'
+    first = quantized[0]
+
+    parts = [
+        f'<svg version="1.1" viewBox="{view_box(quantized)}" '
+        'xmlns="http://www.w3.org/2000/svg">',
+        f'<g id="edges" stroke="black" stroke-width="{NODE_RADIUS / 10}">',
+    ]
+    for u, v in edges:
+        parts.append(
+            f'<line x1="{first[2 * u]}" y1="{first[2 * u + 1]}" '
+            f'x2="{first[2 * v]}" y2="{first[2 * v + 1]}"></line>'
+        )
+    parts.append('</g><g id="nodes">')
+
+    for i, label in enumerate(labels):
+        steps = []
+        for prev, frame in zip(quantized, quantized[1:]):
+            steps.append(frame[2 * i] - prev[2 * i])
+            steps.append(frame[2 * i + 1] - prev[2 * i + 1])
+        # Repeated "l" commands can be left out, and so can commas before minus signs
+        path = f"M{first[2 * i]},{first[2 * i + 1]}"
+        if steps:
+            path += "l" + ",".join(map(str, steps)).replace(",-", "-")
+        parts.append(
+            f'<g><animateMotion path="{path}" {timing}/>'
+            f'<ellipse rx="{NODE_RADIUS}" ry="{NODE_RADIUS}" fill="white" '
+            f'stroke="black" stroke-width="{NODE_RADIUS / 10}"></ellipse>'
+            f"{node_label_svg(label)}</g>"
+        )
+    parts.append("</g>")
+    parts.append(
+        SMIL_EDGE_SCRIPT
+        % {
+            "edges": json.dumps(
+                [i for edge in edges for i in edge], separators=(",", ":")
+            ),
+            "duration": f"{seconds:g}",
+        }
+    )
+    parts.append("</svg>")
+
+    with open(filename, "w") as f:
+        f.write("".join(parts))
+
+
+HTML_PLAYER = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Layout</title></head>
+<body style="margin: 0; font-family: monospace;">
+<svg id="graph" viewBox="%(view_box)s" style="width: 100%%; height: 90vh;"
+  xmlns="http://www.w3.org/2000/svg">
+  <g id="edges" stroke="black" stroke-width="%(stroke)s"></g>
+  <g id="nodes">%(nodes)s</g>
+</svg>
+<div style="display: flex; gap: 1em; padding: 0 1em;">
+  <button id="play">Play</button>
+  <input id="slider" type="range" min="0" max="%(last)d" value="0" style="flex: 1;">
+  <span id="label"></span>
+</div>
+<script>
+const N = %(n)d;
+const EDGES = %(edges)s;
+const DELTAS = %(deltas)s;
+const FRAME_MS = %(frame_ms)d;
+
+// Rebuild every frame from the deltas
+const frames = [Int32Array.from(DELTAS.slice(0, 2 * N))];
+for (let start = 2 * N; start < DELTAS.length; start += 2 * N) {
+  const frame = Int32Array.from(frames[frames.length - 1]);
+  for (let i = 0; i < 2 * N; i++) frame[i] += DELTAS[start + i];
+  frames.push(frame);
+}
+
+const SVG_NS = "http://www.w3.org/2000/svg";
+const lines = [];
+for (let i = 0; i < EDGES.length; i += 2) {
+  lines.push(document.getElementById("edges").appendChild(
+    document.createElementNS(SVG_NS, "line")));
+}
+const nodes = document.getElementById("nodes").children;
+const slider = document.getElementById("slider");
+const label = document.getElementById("label");
+
+function show(f) {
+  const pos = frames[f];
+  for (let i = 0; i < N; i++) {
+    nodes[i].setAttribute("transform", `translate(${pos[2 * i]},${pos[2 * i + 1]})`);
+  }
+  lines.forEach((line, e) => {
+    const u = EDGES[2 * e], v = EDGES[2 * e + 1];
+    line.setAttribute("x1", pos[2 * u]);
+    line.setAttribute("y1", pos[2 * u + 1]);
+    line.setAttribute("x2", pos[2 * v]);
+    line.setAttribute("y2", pos[2 * v + 1]);
+  });
+  slider.value = f;
+  label.textContent = `Frame ${f} / ${frames.length - 1}`;
+}
+
+let timer = null;
+document.getElementById("play").onclick = (event) => {
+  if (timer !== null) {
+    clearInterval(timer);
+    timer = null;
+    event.target.textContent = "Play";
+    return;
+  }
+  if (+slider.value === frames.length - 1) show(0);
+  event.target.textContent = "Pause";
+  timer = setInterval(() => {
+    const f = +slider.value + 1;
+    if (f < frames.length) return show(f);
+    clearInterval(timer);
+    timer = null;
+    event.target.textContent = "Play";
+  }, FRAME_MS);
+};
+slider.oninput = () => show(+slider.value);
+show(0);
+</script>
+</body>
+</html>
+"""
+
+
+def write_html_player(
+    labels: Sequence[str],
+    edges: Sequence[Tuple[int, int]],
+    quantized: Sequence[Sequence[int]],
+    filename: str,
+    frame_duration: float,
+):
+    """
+    Save the recording as a standalone HTML page with a play button and a frame slider.
+    Only the deltas between frames are stored; the page rebuilds the frames on load.
+    """
+    nodes = "".join(
+        f'<g><ellipse rx="{NODE_RADIUS}" ry="{NODE_RADIUS}" fill="white" '
+        f'stroke="black" stroke-width="{NODE_RADIUS / 10}"></ellipse>'
+        f"{node_label_svg(label)}</g>"
+        for label in labels
+    )
+
+    def to_json(values: List[int]) -> str:
+        return json.dumps(values, separators=(",", ":"))
+
+    code = HTML_PLAYER % {
+        "view_box": view_box(quantized),
+        "stroke": NODE_RADIUS / 10,
+        "nodes": nodes,
+        "last": len(quantized) - 1,
+        "n": len(labels),
+        "edges": to_json([i for edge in edges for i in edge]),
+        "deltas": to_json(frame_deltas(quantized)),
+        "frame_ms": round(frame_duration * 1000),
+    }
+
+    with open(filename, "w") as f:
+        f.write(code)
+
+
+def save_animation(
+    vertices: Sequence[Vertex],
+    edge_list: Sequence[Tuple[Vertex, Vertex]],
+    frames: Sequence[Sequence[complex]],
+    filename: str,
+    frame_duration: float = 0.1,
+):
+    """
+    Save recorded frames (vertex positions, in the order of `vertices`) as an HTML
+    player if the filename ends with ".html", and as a SMIL-animated SVG otherwise.
+    """
+    index: Dict[Vertex, int] = {v: i for i, v in enumerate(vertices)}
+    labels = [str(v) for v in vertices]
+    edges = [(index[edge[0]], index[edge[1]]) for edge in edge_list]
+    quantized = quantize(frames)
+
+    if filename.lower().endswith((".html", ".htm")):
+        write_html_player(labels, edges, quantized, filename, frame_duration)
+    else:
+        write_smil_svg(labels, edges, quantized, filename, frame_duration)
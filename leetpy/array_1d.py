@@ -1,7 +1,7 @@
-import random
-from rich import print as rich_print
 from typing import Iterable, List, Optional
 
+from .rng import SeedLike, as_random
+
 
 INT_MIN = -2147483648
 INT_MAX = 2147483647
@@ -20,6 +20,7 @@ class Array1D:
         max_val: int = INT_MAX,
         index_as_val: bool = False,
         choices: Iterable = [],
+        seed: SeedLike = None,
     ):
         """
         Create a 1-D array based on the given parameters.
@@ -35,13 +36,17 @@ class Array1D:
             index_as_val: Enabling this sets entry values to the 0-based order in which
                 they were created. Overrides `min_val` and `max_val`.
             choices: A list of possible entry values to be randomly chosen from.
+            seed: The seed for the random number generator: an int, a str, a
+                `SeedSequence` or a `random.Random` instance (see `leetpy.rng`).
+                (default = None, i.e. the global `random` module)
         """
+        rng = as_random(seed)
         arr = None
         if choices:
-            arr = [random.choice(choices) for index in range(n)]
+            arr = [rng.choice(choices) for index in range(n)]
         else:
             arr = [
-                (index if index_as_val else random.randint(min_val, max_val))
+                (index if index_as_val else rng.randint(min_val, max_val))
                 for index in range(n)
             ]
 
@@ -50,6 +55,8 @@ class Array1D:
     @staticmethod
     def print(arr: List[any], title: Optional[str] = None):
         """Print the 1-D array with indices."""
+        from rich import print as rich_print
+
         N = len(arr)
 
         # The size of the columns (based on the largest element)
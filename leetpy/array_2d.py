@@ -1,7 +1,7 @@
-import random
-from rich import print as rich_print
 from typing import Iterable, List, Optional, Tuple
 
+from .rng import SeedLike, as_random
+
 
 INT_MIN = -2147483648
 INT_MAX = 2147483647
@@ -26,6 +26,7 @@ class Array2D:
         max_val: int = INT_MAX,
         index_as_val: bool = False,
         choices: Iterable = [],
+        seed: SeedLike = None,
     ):
         """
         Create a 2-D array based on the given parameters.
@@ -41,19 +42,21 @@ class Array2D:
             index_as_val: Enabling this sets cell values to the 0-based order in which
                 they were created. Overrides `min_val` and `max_val`.
             choices: A list of possible cell values to be randomly chosen from.
+            seed: The seed for the random number generator: an int, a str, a
+                `SeedSequence` or a `random.Random` instance (see `leetpy.rng`).
+                (default = None, i.e. the global `random` module)
         """
+        rng = as_random(seed)
         arr = None
         if choices:
-            arr = [
-                [random.choice(choices) for col in range(cols)] for row in range(rows)
-            ]
+            arr = [[rng.choice(choices) for col in range(cols)] for row in range(rows)]
         else:
             arr = [
                 [
                     (
                         row * cols + col
                         if index_as_val
-                        else random.randint(min_val, max_val)
+                        else rng.randint(min_val, max_val)
                     )
                     for col in range(cols)
                 ]
@@ -65,6 +68,8 @@ class Array2D:
     @staticmethod
     def print(arr: List[List[any]], title: Optional[str] = None):
         """Print the 2-D array with row and column indices."""
+        from rich import print as rich_print
+
         ROWS = len(arr)
         COLS = len(arr[0])
 
@@ -1,11 +1,22 @@
 from collections import deque
-import json
-import random
-import re as regex
-from rich import print as rich_print
-from typing import Deque, Iterator, List, Optional, Set, TypedDict, TypeVar, Type
-
-from ._reingold_tilford_algorithm import TR_create_drawing, TR_Node
+from operator import attrgetter, le
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    TypedDict,
+    TypeVar,
+    Type,
+)
+
+from .rng import SeedLike, as_random
 
 
 INT_MIN = -2147483648
@@ -61,16 +72,200 @@ The default node configuration, which represents an instance of `TreeNode`.
 """
 
 
+class _NodeAccessors(NamedTuple):
+    """Getters for the attributes of a node, compiled from a `NodeConfig`."""
+
+    data: Callable[[NodeLike], any]
+    left: Callable[[NodeLike], Optional[NodeLike]]
+    right: Callable[[NodeLike], Optional[NodeLike]]
+    # Returns the `(left, right)` children of a node with a single call
+    children: Callable[[NodeLike], Tuple[Optional[NodeLike], Optional[NodeLike]]]
+
+
+_accessor_cache: Dict[Tuple[str, str, str], _NodeAccessors] = {}
+
+
+def _accessors(config: NodeConfig) -> _NodeAccessors:
+    """
+    The accessors of a node configuration, created once per configuration and then
+    cached, so hot loops don't look up attribute names in the config for every node.
+    """
+    key = (config["data_attr"], config["left_attr"], config["right_attr"])
+    accessors = _accessor_cache.get(key)
+    if accessors is None:
+        data_attr, left_attr, right_attr = key
+        accessors = _NodeAccessors(
+            attrgetter(data_attr),
+            attrgetter(left_attr),
+            attrgetter(right_attr),
+            attrgetter(left_attr, right_attr),
+        )
+        _accessor_cache[key] = accessors
+    return accessors
+
+
 def _indented(s: str, spaces: int):
     return " " * spaces + s
 
 
+class OrderIndex:
+    """
+    Order statistics of a binary search tree: the k'th smallest node, the rank of a value,
+    and the number of values in a range, each in O(h) time for a tree of height h.
+
+    The index is a snapshot of the tree (see `BinaryTree.order_index`). The nodes, their
+    values, their children and their subtree sizes are kept in side arrays, indexed in
+    preorder (-1 stands for a missing child), so queries never touch the nodes.
+    """
+
+    def __init__(self, root: Optional[NodeLike], config: NodeConfig = TreeNodeConfig):
+        get_data, _, _, children = _accessors(config)
+
+        self.nodes: List[NodeLike] = []
+        self.values: List[any] = []
+        self.left: List[int] = []
+        self.right: List[int] = []
+
+        # (node, index of its parent, whether it's a left child)
+        stack = [] if root is None else [(root, -1, False)]
+        while stack:
+            node, parent, is_left = stack.pop()
+            index = len(self.nodes)
+            self.nodes.append(node)
+            self.values.append(get_data(node))
+            self.left.append(-1)
+            self.right.append(-1)
+            if parent >= 0:
+                (self.left if is_left else self.right)[parent] = index
+
+            left, right = children(node)
+            if right is not None:
+                stack.append((right, index, False))
+            if left is not None:
+                stack.append((left, index, True))
+
+        # Children come after their parents in preorder, so a reversed pass sees every
+        # subtree before its root
+        self.sizes: List[int] = [1] * len(self.nodes)
+        for index in range(len(self.nodes) - 1, -1, -1):
+            if self.left[index] >= 0:
+                self.sizes[index] += self.sizes[self.left[index]]
+            if self.right[index] >= 0:
+                self.sizes[index] += self.sizes[self.right[index]]
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def _size(self, index: int) -> int:
+        return self.sizes[index] if index >= 0 else 0
+
+    def kth(self, k: int) -> NodeLike:
+        """The k'th smallest node (1-based, so `kth(1)` is the minimum)."""
+        assert 1 <= k <= len(self.nodes), f"Expected 1 <= k <= {len(self.nodes)}"
+
+        index = 0
+        while True:
+            left_size = self._size(self.left[index])
+            if k <= left_size:
+                index = self.left[index]
+            elif k == left_size + 1:
+                return self.nodes[index]
+            else:
+                k -= left_size + 1
+                index = self.right[index]
+
+    def _count_below(self, val: any, inclusive: bool) -> int:
+        """The number of values less than `val` (or equal to it, if `inclusive`)."""
+        count = 0
+        index = 0 if self.nodes else -1
+        while index >= 0:
+            node_val = self.values[index]
+            if node_val < val or (inclusive and node_val == val):
+                count += self._size(self.left[index]) + 1
+                index = self.right[index]
+            else:
+                index = self.left[index]
+        return count
+
+    def rank(self, val: any) -> int:
+        """
+        The number of values less than `val`, i.e. the 0-based position of its first
+        occurrence in the inorder traversal (or where it would be inserted).
+        """
+        return self._count_below(val, inclusive=False)
+
+    def count_in_range(self, lo: any, hi: any) -> int:
+        """The number of values `v` such that `lo <= v <= hi`."""
+        if hi < lo:
+            return 0
+        at_most_hi = self._count_below(hi, inclusive=True)
+        return at_most_hi - self._count_below(lo, inclusive=False)
+
+
 class BinaryTree:
     """
     Algorithms and utility functions related to the Binary Tree data structure. All
     functions are static and stateless.
     """
 
+    @staticmethod
+    def avl_delete(
+        root: Optional[NodeLike],
+        val: any,
+        heights: Dict[NodeLike, int],
+        config: NodeConfig = TreeNodeConfig,
+    ) -> Optional[NodeLike]:
+        """
+        Delete a node with the given value from an AVL tree (a binary search tree where
+        the heights of the two subtrees of any node differ by at most 1), keeping it
+        balanced. Runs in O(log n) time. Returns the new root, which is unchanged if no
+        node has the value.
+
+        The other nodes are moved rather than relabelled, so references to them stay
+        valid.
+
+        Args:
+            heights: The side table of subtree heights, keyed by node. Pass the same
+                dictionary to every call on a tree (see `create_balanced_bst`). Missing
+                heights are computed in time proportional to the subtree, so an empty
+                dictionary also works.
+            config: A dictionary that maps the three attributes of `TreeNode` to the
+                corresponding attribute names in `root`. This is only needed if `root` is
+                not an instance of `TreeNode`.
+        """
+        from ._avl import delete
+
+        return delete(root, val, config, heights)
+
+    @staticmethod
+    def avl_insert(
+        root: Optional[NodeLike],
+        val: any,
+        heights: Dict[NodeLike, int],
+        klass: Type[NodeLike] = TreeNode,
+        config: NodeConfig = TreeNodeConfig,
+    ) -> NodeLike:
+        """
+        Insert a new node with the given value into an AVL tree (a binary search tree
+        where the heights of the two subtrees of any node differ by at most 1), keeping
+        it balanced. Runs in O(log n) time. Returns the new root.
+
+        Values equal to existing ones are inserted after them in an inorder traversal.
+
+        Args:
+            heights: The side table of subtree heights, keyed by node. Pass the same
+                dictionary to every call on a tree (see `create_balanced_bst`). Missing
+                heights are computed in time proportional to the subtree, so an empty
+                dictionary also works.
+            klass: The class of the new node, created with `klass(val)`.
+            config: A dictionary that maps the three attributes of `TreeNode` to the
+                corresponding attribute names in `root`. This is only needed if `root` is
+                not an instance of `TreeNode`.
+        """
+        from ._avl import insert
+
+        return insert(root, val, klass, config, heights)
+
     @staticmethod
     def count_leaf_nodes(
         root: Optional[NodeLike], config: NodeConfig = TreeNodeConfig
@@ -82,15 +277,15 @@ class BinaryTree:
         ), "Cycle detected while traveling from the root"
 
         count = [0]
+        children = _accessors(config).children
 
         def _count_leaf_nodes(root):
             if root is None:
                 return
-            if getattr(root, config["left_attr"]) or getattr(
-                root, config["right_attr"]
-            ):
-                _count_leaf_nodes(getattr(root, config["left_attr"]))
-                _count_leaf_nodes(getattr(root, config["right_attr"]))
+            left, right = children(root)
+            if left or right:
+                _count_leaf_nodes(left)
+                _count_leaf_nodes(right)
             else:
                 count[0] += 1
 
@@ -106,15 +301,14 @@ class BinaryTree:
             root, config
         ), "Cycle detected while traveling from the root"
 
+        children = _accessors(config).children
+
         def _count_nodes(root: Optional[NodeLike]):
             if root is None:
                 return 0
 
-            return (
-                1
-                + _count_nodes(getattr(root, config["left_attr"]))
-                + _count_nodes(getattr(root, config["right_attr"]))
-            )
+            left, right = children(root)
+            return 1 + _count_nodes(left) + _count_nodes(right)
 
         return _count_nodes(root)
 
@@ -128,6 +322,7 @@ class BinaryTree:
         make_bst: bool = False,
         klass: Type[NodeLike] = TreeNode,
         config: NodeConfig = TreeNodeConfig,
+        seed: SeedLike = None,
     ) -> Optional[NodeLike]:
         """
         Create a rooted binary tree based on the parameters.
@@ -145,14 +340,24 @@ class BinaryTree:
             make_bst: Enabling this ensures the generated binary tree will satisfy the
                 properties of a Binary Search Tree i.e. the inorder traversal of node
                 values yields a sorted array.
+            seed: The seed for the random number generator: an int, a str, a
+                `SeedSequence` or a `random.Random` instance (see `leetpy.rng`).
+                (default = None, i.e. the global `random` module)
         """
         if n <= 0:
             return None
 
-        root = klass(random.randint(min_val, max_val))
+        rng = as_random(seed)
+        root = klass(rng.randint(min_val, max_val))
+        data_attr, left_attr, right_attr = (
+            config["data_attr"],
+            config["left_attr"],
+            config["right_attr"],
+        )
+        _, get_left, get_right, _ = _accessors(config)
 
         if index_as_val:
-            setattr(root, config["data_attr"], 0)
+            setattr(root, data_attr, 0)
 
         created_count = 1
         q: Deque[klass] = deque([root])
@@ -161,55 +366,78 @@ class BinaryTree:
                 pass
             else:
                 # Choose a random element to be the parent
-                index = random.randint(0, len(q) - 1)
+                index = rng.randint(0, len(q) - 1)
                 q[index], q[0] = q[0], q[index]
             curr = q.popleft()
 
             # Create the new node
             new_node = klass(
-                created_count if index_as_val else random.randint(min_val, max_val)
+                created_count if index_as_val else rng.randint(min_val, max_val)
             )
 
             # Set it to the left or right child randomly
-            child = random.randint(0, 1)
+            child = rng.randint(0, 1)
             if make_complete:  # override random child if 'make_complete' is enabled
                 child = 0
             if child == 0:  # left first
-                if getattr(curr, config["left_attr"]) is None:
-                    setattr(curr, config["left_attr"], new_node)
+                if get_left(curr) is None:
+                    setattr(curr, left_attr, new_node)
                 else:
-                    setattr(curr, config["right_attr"], new_node)
+                    setattr(curr, right_attr, new_node)
             else:  # right first
-                if getattr(curr, config["right_attr"]) is None:
-                    setattr(curr, config["right_attr"], new_node)
+                if get_right(curr) is None:
+                    setattr(curr, right_attr, new_node)
                 else:
-                    setattr(curr, config["left_attr"], new_node)
+                    setattr(curr, left_attr, new_node)
 
             # Add the newly created node to the queue
             q.append(new_node)
             created_count += 1
 
             # If the parent isn't fully filled, add it to the queue
-            if (
-                getattr(curr, config["left_attr"]) is None
-                or getattr(curr, config["right_attr"]) is None
-            ):
+            if get_left(curr) is None or get_right(curr) is None:
                 # appendleft only matters when 'make_complete' is enabled
                 q.appendleft(curr)
 
         if make_bst:
-            arr = [
-                getattr(node, config["data_attr"])
-                for node in BinaryTree.travel_inorder(root)
-            ]
+            get_data = _accessors(config).data
+            arr = [get_data(node) for node in BinaryTree.travel_inorder(root, config)]
             arr.sort()
             i = 0
-            for node in BinaryTree.travel_inorder(root):
-                setattr(node, config["data_attr"], arr[i])
+            for node in BinaryTree.travel_inorder(root, config):
+                setattr(node, data_attr, arr[i])
                 i += 1
 
         return root
 
+    @staticmethod
+    def create_balanced_bst(
+        values: Iterable[any],
+        klass: Type[NodeLike] = TreeNode,
+        config: NodeConfig = TreeNodeConfig,
+        heights: Optional[Dict[NodeLike, int]] = None,
+    ) -> Optional[NodeLike]:
+        """
+        Create a binary search tree of minimum height with the given values, in O(n) time
+        for sorted values (unsorted ones are sorted first). Every node is the middle
+        value of its subtree, so the tree is also a valid AVL tree.
+
+        Args:
+            values: The node values. Duplicates are kept.
+            klass: The class of the nodes, created with `klass(val)`.
+            heights: Enabling this fills the dictionary with the height of every node,
+                ready for `avl_insert` and `avl_delete`.
+            config: A dictionary that maps the three attributes of `TreeNode` to the
+                corresponding attribute names in `root`. This is only needed if `root` is
+                not an instance of `TreeNode`.
+        """
+        from ._avl import build_balanced
+
+        values = list(values)
+        if not all(map(le, values, values[1:])):
+            values.sort()
+        return build_balanced(values, klass, config, heights)
+
     @staticmethod
     def create_from_leetcode_array(
         leetcode_str: str,
@@ -226,12 +454,14 @@ class BinaryTree:
         Example:
             `create_from_leetcode_array("[1,null,2,null,3]")`
         """
+        import json
 
         leetcode_arr: List[Optional[int]] = json.loads(leetcode_str)
 
         if len(leetcode_arr) == 0:
             return None
 
+        left_attr, right_attr = config["left_attr"], config["right_attr"]
         root = klass(leetcode_arr[0])
         q = deque([root])
         is_left = True
@@ -241,9 +471,9 @@ class BinaryTree:
                 node = klass(val)
 
             if is_left:
-                setattr(q[0], config["left_attr"], node)
+                setattr(q[0], left_attr, node)
             else:
-                setattr(q[0], config["right_attr"], node)
+                setattr(q[0], right_attr, node)
 
             if node is not None:
                 q.append(node)
@@ -277,28 +507,24 @@ class BinaryTree:
                 is not an instance of `TreeNode`.
         """
 
-        if root1 is None and root2 is None:
-            return True
+        data1, _, _, children1 = _accessors(config1)
+        data2, _, _, children2 = _accessors(config2)
 
-        data1 = getattr(root1, config1["data_attr"])
-        data2 = getattr(root2, config2["data_attr"])
-        if data1 != data2:
-            return False
+        def _equals(root1: Optional[NodeLike], root2: Optional[NodeLike]) -> bool:
+            if root1 is None and root2 is None:
+                return True
 
-        is_left_equal = BinaryTree.equals(
-            getattr(root1, config1["left_attr"]),
-            getattr(root2, config2["left_attr"]),
-            config1,
-            config2,
-        )
-        is_right_equal = BinaryTree.equals(
-            getattr(root1, config1["right_attr"]),
-            getattr(root2, config2["right_attr"]),
-            config1,
-            config2,
-        )
+            if data1(root1) != data2(root2):
+                return False
+
+            left1, right1 = children1(root1)
+            left2, right2 = children2(root2)
+            is_left_equal = _equals(left1, left2)
+            is_right_equal = _equals(right1, right2)
+
+            return is_left_equal and is_right_equal
 
-        return is_left_equal and is_right_equal
+        return _equals(root1, root2)
 
     @staticmethod
     def export_as_leetcode_array(
@@ -315,6 +541,7 @@ class BinaryTree:
                 corresponding attribute names in `root`. This is only needed if `root` is
                 not an instance of `TreeNode`.
         """
+        get_data, _, _, children = _accessors(config)
         arr = []
         q = deque([root])
         while q:
@@ -324,9 +551,8 @@ class BinaryTree:
                 arr.append("null")
                 continue
 
-            arr.append(str(getattr(curr, config["data_attr"])))
-            q.append(getattr(curr, config["left_attr"]))
-            q.append(getattr(curr, config["right_attr"]))
+            arr.append(str(get_data(curr)))
+            q.extend(children(curr))
 
         # Get rid of redundant "null" nodes
         while arr and arr[-1] == "null":
@@ -379,6 +605,8 @@ class BinaryTree:
             code += "\n" + _indented("return None", indent)
             return code
 
+        get_data, _, _, children = _accessors(source_config)
+
         def get_node_repr(
             node: Optional[NodeLike],
             left: str = "None",
@@ -386,7 +614,7 @@ class BinaryTree:
         ) -> str:
             if node is None:
                 return "None"
-            data = getattr(node, source_config["data_attr"])
+            data = get_data(node)
             if left == "None" and right == "None":
                 return f"{node_alias}({data})"
             else:
@@ -403,8 +631,9 @@ class BinaryTree:
             if node is None:
                 return "None"
 
-            left_var = travel(getattr(node, source_config["left_attr"]), code_lines)
-            right_var = travel(getattr(node, source_config["right_attr"]), code_lines)
+            left, right = children(node)
+            left_var = travel(left, code_lines)
+            right_var = travel(right, code_lines)
 
             node_var = f"node_{N_ptr[0]}"
             N_ptr[0] -= 1
@@ -463,6 +692,10 @@ class BinaryTree:
             node_color: The background color of a node as a CSS-string.
             stroke_color: The color of edges and node outlines as a CSS-string.
         """
+        import re as regex
+
+        from ._reingold_tilford_algorithm import TR_create_drawing, TR_Node
+
         TR_root = TR_create_drawing(root, "val", "left", "right", minimum_separation=1)
 
         # Find the minimum and maximum x and y coordinates (grid bounds)
@@ -613,12 +846,15 @@ class BinaryTree:
             root, config
         ), "Cycle detected while traveling from the root"
 
-        if root is None:
-            return 0
-        return 1 + max(
-            BinaryTree.get_depth(getattr(root, config["left_attr"]), config),
-            BinaryTree.get_depth(getattr(root, config["right_attr"]), config),
-        )
+        children = _accessors(config).children
+
+        def _get_depth(root: Optional[NodeLike]) -> int:
+            if root is None:
+                return 0
+            left, right = children(root)
+            return 1 + max(_get_depth(left), _get_depth(right))
+
+        return _get_depth(root)
 
     @staticmethod
     def get_max_width(
@@ -641,6 +877,7 @@ class BinaryTree:
             return 0
 
         widths = {}
+        children = _accessors(config).children
 
         def dfs(root: Optional[NodeLike], depth: int) -> None:
             if root is None:
@@ -650,8 +887,9 @@ class BinaryTree:
                 widths[depth] = 0
             widths[depth] += 1
 
-            dfs(getattr(root, config["left_attr"]), depth + 1)
-            dfs(getattr(root, config["right_attr"]), depth + 1)
+            left, right = children(root)
+            dfs(left, depth + 1)
+            dfs(right, depth + 1)
 
         dfs(root, 0)
 
@@ -675,25 +913,20 @@ class BinaryTree:
             root, config
         ), "Cycle detected while traveling from the root"
 
+        get_data, _, _, children = _accessors(config)
+
         def util(root: Optional[NodeLike], min_val: any, max_val: any) -> bool:
             if root is None:
                 return True
 
-            root_data = getattr(root, config["data_attr"])
+            root_data = get_data(root)
 
             if root_data >= max_val or root_data <= min_val:
                 return False
 
-            left_is_bst = util(
-                getattr(root, config["left_attr"]),
-                min_val,
-                root_data,
-            )
-            right_is_bst = util(
-                getattr(root, config["right_attr"]),
-                root_data,
-                max_val,
-            )
+            left, right = children(root)
+            left_is_bst = util(left, min_val, root_data)
+            right_is_bst = util(right, root_data, max_val)
             return left_is_bst and right_is_bst
 
         return util(root, -float("inf"), float("inf"))
@@ -713,15 +946,44 @@ class BinaryTree:
                 not an instance of `TreeNode`.
         """
 
+        children = _accessors(config).children
         visited: Set[NodeLike] = set()
 
-        for node in BinaryTree.travel_inorder(root, config):
+        stack = [] if root is None else [root]
+        while stack:
+            node = stack.pop()
             if node in visited:
                 return True
             visited.add(node)
+            for child in children(node):
+                if child is not None:
+                    stack.append(child)
 
         return False
 
+    @staticmethod
+    def order_index(
+        root: Optional[NodeLike], config: NodeConfig = TreeNodeConfig
+    ) -> OrderIndex:
+        """
+        Index a binary search tree for order statistic queries: `kth(k)`, `rank(val)`
+        and `count_in_range(lo, hi)`, each in O(h) time for a tree of height h. Building
+        the index takes a single O(n) pass.
+
+        NOTE: The index is a snapshot, so it must be rebuilt after the tree changes.
+
+        Args:
+            config: A dictionary that maps the three attributes of `TreeNode` to the
+                corresponding attribute names in `root`. This is only needed if `root` is
+                not an instance of `TreeNode`.
+        """
+
+        assert not BinaryTree.is_cyclic(
+            root, config
+        ), "Cycle detected while traveling from the root"
+
+        return OrderIndex(root, config)
+
     @staticmethod
     def print_structure(root: Optional[NodeLike], config: NodeConfig = TreeNodeConfig):
         """
@@ -732,6 +994,7 @@ class BinaryTree:
                 corresponding attribute names in `root`. This is only needed if `root` is
                 not an instance of `TreeNode`.
         """
+        from ._reingold_tilford_algorithm import TR_create_drawing, TR_Node
 
         TR_root = TR_create_drawing(
             root, config["data_attr"], config["left_attr"], config["right_attr"]
@@ -840,24 +1103,27 @@ class BinaryTree:
                 not an instance of `TreeNode`.
         """
 
+        from rich import print as rich_print
+
         assert not BinaryTree.is_cyclic(
             root
         ), "Cycle detected while traveling from the root"
 
+        get_data, _, _, children = _accessors(config)
+
         def _print__leveled(root: Optional[NodeLike], level: int):
             if root is None:
                 return
 
             indent_string = " " * (2 * level)
-            print(indent_string, getattr(root, config["data_attr"]), sep="")
+            print(indent_string, get_data(root), sep="")
 
-            left_child = getattr(root, config["left_attr"])
+            left_child, right_child = children(root)
             if left_child:
                 _print__leveled(left_child, level + 1)
             else:
                 rich_print(indent_string, "  ", "[italic]~ no left node[/]", sep="")
 
-            right_child = getattr(root, config["right_attr"])
             if right_child:
                 _print__leveled(right_child, level + 1)
             else:
@@ -878,8 +1144,9 @@ class BinaryTree:
                 corresponding attribute names in `root`. This is only needed if `root` is
                 not an instance of `TreeNode`.
         """
+        get_data = _accessors(config).data
         for node in BinaryTree.travel_inorder(root, config):
-            if getattr(root, config["data_attr"]) == val:
+            if get_data(node) == val:
                 return node
         return None
 
@@ -896,14 +1163,17 @@ class BinaryTree:
                 corresponding attribute names in `root`. This is only needed if `root` is
                 not an instance of `TreeNode`.
         """
-        if root is not None:
-            yield from BinaryTree.travel_inorder(
-                getattr(root, config["left_attr"]), config
-            )
-            yield root
-            yield from BinaryTree.travel_inorder(
-                getattr(root, config["right_attr"]), config
-            )
+        _, get_left, get_right, _ = _accessors(config)
+
+        stack = []
+        node = root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = get_left(node)
+            node = stack.pop()
+            yield node
+            node = get_right(node)
 
     @staticmethod
     def travel_levelorder(
@@ -918,16 +1188,17 @@ class BinaryTree:
                 corresponding attribute names in `root`. This is only needed if `root` is
                 not an instance of `TreeNode`.
         """
-        q = deque([root])
+        children = _accessors(config).children
+
+        q = deque([] if root is None else [root])
         while q:
             curr = q.popleft()
 
             yield curr
 
-            left_child = getattr(root, config["left_attr"])
+            left_child, right_child = children(curr)
             if left_child:
                 q.append(left_child)
-            right_child = getattr(root, config["right_attr"])
             if right_child:
                 q.append(right_child)
 
@@ -944,14 +1215,22 @@ class BinaryTree:
                 corresponding attribute names in `root`. This is only needed if `root` is
                 not an instance of `TreeNode`.
         """
-        if root is not None:
-            yield from BinaryTree.travel_postorder(
-                getattr(root, config["left_attr"]), config
-            )
-            yield from BinaryTree.travel_postorder(
-                getattr(root, config["right_attr"]), config
-            )
-            yield root
+        _, get_left, get_right, _ = _accessors(config)
+
+        stack = []
+        node = root
+        last_yielded = None
+        while stack or node is not None:
+            if node is not None:
+                stack.append(node)
+                node = get_left(node)
+                continue
+            right = get_right(stack[-1])
+            if right is not None and right is not last_yielded:
+                node = right
+            else:
+                last_yielded = stack.pop()
+                yield last_yielded
 
     @staticmethod
     def travel_preorder(
@@ -966,11 +1245,14 @@ class BinaryTree:
                 corresponding attribute names in `root`. This is only needed if `root` is
                 not an instance of `TreeNode`.
         """
-        if root is not None:
-            yield root
-            yield from BinaryTree.travel_preorder(
-                getattr(root, config["left_attr"]), config
-            )
-            yield from BinaryTree.travel_preorder(
-                getattr(root, config["right_attr"]), config
-            )
+        children = _accessors(config).children
+
+        stack = [] if root is None else [root]
+        while stack:
+            node = stack.pop()
+            yield node
+            left, right = children(node)
+            if right is not None:
+                stack.append(right)
+            if left is not None:
+                stack.append(left)
@@ -0,0 +1,589 @@
+"""
+An indexed binary file format for storing many generated testcases.
+
+Loading thousands of testcases from code made by `export_as_code` means compiling huge
+modules, and there's no way to pick out a single case. A corpus file stores every case
+as a packed binary payload, and an index of where every payload starts, so any case can
+be loaded by its id (or found by its tag) without reading the others.
+
+Layout of a corpus file:
+
+    header:   magic, version, byte order of the arrays, case count, index offset
+    payloads: one per case, appended in order
+    index:    one fixed-size entry per case (offset, length, tag number, kind)
+    tags:     the distinct tags, numbered in order of first use
+
+Cases are appended with a `CorpusWriter`, which writes new payloads after the old index,
+and a new index after them when it's closed. Only then is the header pointed at the new
+index, so a writer that never closes (like a crashed process) leaves the corpus as it
+was. Payloads never move while a writer is open, and old indices are left in place as
+unused space. Once that space passes `MAX_UNUSED_FRACTION` of the file, closing the
+writer rewrites the file without it (see `compact`).
+
+Cases are read with a `Corpus`, which maps the file into memory: looking up a case
+unpacks one index entry, and its payload is only decoded when the case is materialised.
+
+Example:
+    with CorpusWriter("cases.lpc") as writer:
+        writer.add_binary_tree(BinaryTree.create(20), tag="random")
+
+    with Corpus("cases.lpc") as corpus:
+        root = corpus[0].materialize()
+"""
+
+from array import array
+import marshal
+import mmap
+import os
+import struct
+import sys
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+Vertex = TypeVar("Vertex")
+
+MAGIC = b"LEETPYC\x00"
+VERSION = 1
+# magic, version, byte order (0 = little, 1 = big), case count, index offset
+HEADER = struct.Struct("<8sHB5xQQ")
+# payload offset, payload length, tag number, kind
+INDEX_ENTRY = struct.Struct("<QIIB3x")
+NO_TAG = 2**32 - 1
+# A closed writer compacts the file when more than this fraction of it is unused
+MAX_UNUSED_FRACTION = 0.25
+
+KIND_ARRAY_1D = 1
+KIND_ARRAY_2D = 2
+KIND_LINKED_LIST = 3
+KIND_BINARY_TREE = 4
+KIND_UNDIRECTED_GRAPH = 5
+KIND_DIRECTED_GRAPH = 6
+KIND_NAMES = {
+    KIND_ARRAY_1D: "array_1d",
+    KIND_ARRAY_2D: "array_2d",
+    KIND_LINKED_LIST: "linked_list",
+    KIND_BINARY_TREE: "binary_tree",
+    KIND_UNDIRECTED_GRAPH: "undirected_graph",
+    KIND_DIRECTED_GRAPH: "directed_graph",
+}
+
+# How a list of values is packed
+VALUES_INT64 = 0
+VALUES_FLOAT64 = 1
+VALUES_RANGE = 2  # 0 ... n - 1, stored as n
+VALUES_MARSHAL = 3  # anything else (strings, None, mixed types, big integers...)
+
+INT64_MIN = -(2**63)
+INT64_MAX = 2**63 - 1
+
+NATIVE_BYTE_ORDER = 0 if sys.byteorder == "little" else 1
+
+
+def _pack_values(values: Sequence[Any]) -> bytes:
+    if isinstance(values, range) and values.start == 0 and values.step == 1:
+        return struct.pack("<BQ", VALUES_RANGE, len(values))
+    if all(type(v) is int for v in values):
+        if all(INT64_MIN <= v <= INT64_MAX for v in values):
+            return bytes([VALUES_INT64]) + array("q", values).tobytes()
+    elif all(type(v) is float for v in values):
+        return bytes([VALUES_FLOAT64]) + array("d", values).tobytes()
+    return bytes([VALUES_MARSHAL]) + marshal.dumps(list(values))
+
+
+def _pack_indices(indices: Sequence[int], count: int) -> bytes:
+    from .csr_graph import _index_typecode
+
+    typecode = _index_typecode(count)
+    return typecode.encode() + array(typecode, indices).tobytes()
+
+
+class _Reader:
+    """Reads the fields of a payload one after another."""
+
+    def __init__(self, payload: memoryview, swap_bytes: bool):
+        self.payload = payload
+        self.position = 0
+        self.swap_bytes = swap_bytes
+
+    def unpack(self, fmt: str) -> Tuple:
+        values = struct.unpack_from(fmt, self.payload, self.position)
+        self.position += struct.calcsize(fmt)
+        return values
+
+    def array(self, typecode: str, count: int) -> array:
+        result = array(typecode)
+        end = self.position + count * result.itemsize
+        result.frombytes(self.payload[self.position : end])
+        if self.swap_bytes:
+            result.byteswap()
+        self.position = end
+        return result
+
+    def indices(self, count: int) -> array:
+        typecode = bytes(self.payload[self.position : self.position + 1]).decode()
+        self.position += 1
+        return self.array(typecode, count)
+
+    def values(self) -> Sequence[Any]:
+        """Unpack a list of values, which is always the last field of a payload."""
+        (encoding,) = self.unpack("<B")
+        rest = self.payload[self.position :]
+        if encoding == VALUES_RANGE:
+            return range(struct.unpack_from("<Q", rest)[0])
+        if encoding == VALUES_MARSHAL:
+            return marshal.loads(rest)
+        typecode = "q" if encoding == VALUES_INT64 else "d"
+        return self.array(typecode, len(rest) // 8).tolist()
+
+
+class CorpusCase:
+    """
+    A single case of a corpus. Nothing is decoded until `values` or `materialize` is
+    used, and the case must not be used after its corpus is closed.
+    """
+
+    def __init__(
+        self,
+        corpus: "Corpus",
+        id: int,
+        kind: int,
+        tag: Optional[str],
+        offset: int,
+        length: int,
+    ):
+        self.id = id
+        self.kind = kind
+        self.tag = tag
+        self._corpus = corpus
+        self._offset = offset
+        self._length = length
+
+    def _reader(self) -> _Reader:
+        # The payload is sliced on demand, so closing the corpus isn't blocked by cases
+        buffer = self._corpus._buffer
+        payload = buffer[self._offset : self._offset + self._length]
+        return _Reader(payload, self._corpus._swap_bytes)
+
+    @property
+    def kind_name(self) -> str:
+        return KIND_NAMES[self.kind]
+
+    def values(self) -> Sequence[Any]:
+        """
+        The values stored in the case: the elements of an array (row by row for a 2-D
+        array), the node values of a linked list or binary tree, or the vertices of a
+        graph.
+        """
+        reader = self._reader()
+        if self.kind == KIND_ARRAY_2D:
+            reader.unpack("<QQ")
+        elif self.kind == KIND_LINKED_LIST:
+            reader.unpack("<q")
+        elif self.kind == KIND_BINARY_TREE:
+            (n,) = reader.unpack("<Q")
+            reader.indices(n)
+            reader.indices(n)
+        elif self.kind in (KIND_UNDIRECTED_GRAPH, KIND_DIRECTED_GRAPH):
+            (endpoint_count,) = reader.unpack("<Q")
+            reader.indices(endpoint_count)
+        return reader.values()
+
+    def materialize(self, klass: Optional[type] = None, config: Optional[Dict] = None):
+        """
+        Build the data structure stored in the case: a list (of lists) for arrays, the
+        head `ListNode` of a linked list, the root `TreeNode` of a binary tree, or the
+        adjacency lists of a graph.
+
+        Args:
+            klass: The class of the nodes of a binary tree (default = `TreeNode`).
+            config: The `NodeConfig` of `klass`, only needed if it's not `TreeNode`.
+        """
+        reader = self._reader()
+
+        if self.kind == KIND_ARRAY_1D:
+            return list(reader.values())
+
+        if self.kind == KIND_ARRAY_2D:
+            rows, cols = reader.unpack("<QQ")
+            values = reader.values()
+            return [list(values[r * cols : (r + 1) * cols]) for r in range(rows)]
+
+        if self.kind == KIND_LINKED_LIST:
+            from .linked_list import ListNode
+
+            (cycle_index,) = reader.unpack("<q")
+            nodes = [ListNode(value) for value in reader.values()]
+            for i in range(len(nodes) - 1):
+                nodes[i].next = nodes[i + 1]
+            if cycle_index >= 0:
+                nodes[-1].next = nodes[cycle_index]
+            return nodes[0] if nodes else None
+
+        if self.kind == KIND_BINARY_TREE:
+            from .binary_tree import TreeNode, TreeNodeConfig
+
+            klass = TreeNode if klass is None else klass
+            config = TreeNodeConfig if config is None else config
+            left_attr, right_attr = config["left_attr"], config["right_attr"]
+
+            (n,) = reader.unpack("<Q")
+            lefts = reader.indices(n)
+            rights = reader.indices(n)
+            nodes = [klass(value) for value in reader.values()]
+            for node, left, right in zip(nodes, lefts, rights):
+                if left >= 0:
+                    setattr(node, left_attr, nodes[left])
+                if right >= 0:
+                    setattr(node, right_attr, nodes[right])
+            return nodes[0] if nodes else None
+
+        (endpoint_count,) = reader.unpack("<Q")
+        endpoints = reader.indices(endpoint_count)
+        vertices = reader.values()
+        graph: Dict[Vertex, List[Vertex]] = {vertex: [] for vertex in vertices}
+        for i in range(0, endpoint_count, 2):
+            u, v = vertices[endpoints[i]], vertices[endpoints[i + 1]]
+            graph[u].append(v)
+            if self.kind == KIND_UNDIRECTED_GRAPH:
+                graph[v].append(u)
+        return graph
+
+    def __repr__(self) -> str:
+        return f"CorpusCase(id={self.id}, kind={self.kind_name!r}, tag={self.tag!r})"
+
+
+def _read_tags(buffer: Any, offset: int) -> List[str]:
+    (count,) = struct.unpack_from("<I", buffer, offset)
+    offset += 4
+    tags = []
+    for _ in range(count):
+        (length,) = struct.unpack_from("<I", buffer, offset)
+        offset += 4
+        tags.append(bytes(buffer[offset : offset + length]).decode())
+        offset += length
+    return tags
+
+
+def _read_index(
+    fp: BinaryIO, filename: str
+) -> Tuple[int, List[Tuple[int, int, int, int]], List[str]]:
+    """
+    The byte order, index entries and tags of an open corpus file, read without the
+    payloads.
+    """
+    fp.seek(0)
+    magic, version, byte_order, count, index_offset = HEADER.unpack(
+        fp.read(HEADER.size)
+    )
+    assert magic == MAGIC, f"{filename} is not a corpus file"
+    assert version == VERSION, f"Unsupported corpus version {version}"
+
+    fp.seek(index_offset)
+    entries = list(INDEX_ENTRY.iter_unpack(fp.read(count * INDEX_ENTRY.size)))
+    (tag_count,) = struct.unpack("<I", fp.read(4))
+    tags = []
+    for _ in range(tag_count):
+        (length,) = struct.unpack("<I", fp.read(4))
+        tags.append(fp.read(length).decode())
+    return byte_order, entries, tags
+
+
+def _index_bytes(entries: Sequence[Tuple[int, int, int, int]], tags: Sequence[str]):
+    parts = [INDEX_ENTRY.pack(*entry) for entry in entries]
+    parts.append(struct.pack("<I", len(tags)))
+    for tag in tags:
+        encoded = tag.encode()
+        parts.append(struct.pack("<I", len(encoded)) + encoded)
+    return b"".join(parts)
+
+
+def _write_header(fp: BinaryIO, byte_order: int, count: int, index_offset: int):
+    # The index must be on disk before the header points to it
+    fp.flush()
+    os.fsync(fp.fileno())
+    fp.seek(0)
+    fp.write(HEADER.pack(MAGIC, VERSION, byte_order, count, index_offset))
+    fp.flush()
+    os.fsync(fp.fileno())
+
+
+def compact(filename: str) -> int:
+    """
+    Rewrite a corpus file without its unused space: the old indices left by every
+    reopened `CorpusWriter`, and the payloads of writers that were never closed. Case
+    ids don't change. The file is replaced in one step (by `os.replace`), so a crash
+    leaves either the old or the new file. Returns the number of bytes reclaimed.
+    """
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(filename))
+    with open(filename, "rb") as source:
+        byte_order, entries, tags = _read_index(source, filename)
+        old_size = os.fstat(source.fileno()).st_size
+
+        fd, temp_filename = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w+b") as target:
+                target.write(bytes(HEADER.size))
+                new_entries = []
+                for offset, length, tag_number, kind in entries:
+                    source.seek(offset)
+                    new_entries.append((target.tell(), length, tag_number, kind))
+                    target.write(source.read(length))
+                index_offset = target.tell()
+                target.write(_index_bytes(new_entries, tags))
+                new_size = target.tell()
+                _write_header(target, byte_order, len(new_entries), index_offset)
+            os.replace(temp_filename, filename)
+        except BaseException:
+            os.remove(temp_filename)
+            raise
+
+    return old_size - new_size
+
+
+class CorpusWriter:
+    """
+    Appends cases to a corpus file (creating it if needed). Every `add_*` method returns
+    the id of the new case. The index is written by `close`, so use the writer as a
+    context manager.
+    """
+
+    def __init__(self, filename: str):
+        self._filename = filename
+        self._file = open(filename, "r+b" if os.path.exists(filename) else "w+b")
+        self._entries: List[Tuple[int, int, int, int]] = []
+        self._tags: List[str] = []
+        self._tag_numbers: Dict[str, int] = {}
+
+        header = self._file.read(HEADER.size)
+        if not header:
+            # An empty index right away, so the file is a valid corpus until closed
+            self._file.write(
+                HEADER.pack(MAGIC, VERSION, NATIVE_BYTE_ORDER, 0, HEADER.size)
+            )
+            self._file.write(struct.pack("<I", 0))
+            self._file.flush()
+            return
+
+        byte_order, self._entries, self._tags = _read_index(self._file, filename)
+        assert byte_order == NATIVE_BYTE_ORDER, "Cannot append with another byte order"
+        for tag in self._tags:
+            self._tag_numbers[tag] = len(self._tag_numbers)
+
+        # New payloads go after the old index, which stays valid until `close`
+        self._file.seek(0, os.SEEK_END)
+
+    def _add(self, kind: int, payload: bytes, tag: Optional[str]) -> int:
+        tag_number = NO_TAG
+        if tag is not None:
+            tag_number = self._tag_numbers.get(tag)
+            if tag_number is None:
+                tag_number = self._tag_numbers[tag] = len(self._tags)
+                self._tags.append(tag)
+
+        offset = self._file.tell()
+        self._file.write(payload)
+        self._entries.append((offset, len(payload), tag_number, kind))
+        return len(self._entries) - 1
+
+    def add_array_1d(self, arr: Sequence[Any], tag: Optional[str] = None) -> int:
+        return self._add(KIND_ARRAY_1D, _pack_values(arr), tag)
+
+    def add_array_2d(
+        self, arr: Sequence[Sequence[Any]], tag: Optional[str] = None
+    ) -> int:
+        rows = len(arr)
+        cols = len(arr[0]) if rows else 0
+        assert all(
+            len(row) == cols for row in arr
+        ), "All rows must have the same length"
+        values = [value for row in arr for value in row]
+        return self._add(
+            KIND_ARRAY_2D, struct.pack("<QQ", rows, cols) + _pack_values(values), tag
+        )
+
+    def add_linked_list(self, head: Optional[Any], tag: Optional[str] = None) -> int:
+        """Add a linked list of `ListNode`s, which may end in a cycle."""
+        values = []
+        index_of: Dict[int, int] = {}
+        cycle_index = -1
+        node = head
+        while node is not None:
+            if id(node) in index_of:
+                cycle_index = index_of[id(node)]
+                break
+            index_of[id(node)] = len(values)
+            values.append(node.val)
+            node = node.next
+
+        return self._add(
+            KIND_LINKED_LIST, struct.pack("<q", cycle_index) + _pack_values(values), tag
+        )
+
+    def add_binary_tree(
+        self,
+        root: Optional[Any],
+        tag: Optional[str] = None,
+        config: Optional[Dict] = None,
+    ) -> int:
+        """
+        Add a binary tree, stored as its node values in level order, and the index of
+        the left and right child of every node (or -1).
+
+        Args:
+            config: The `NodeConfig` of the nodes, only needed if they aren't
+                `TreeNode`s.
+        """
+        from .binary_tree import TreeNodeConfig, _accessors
+
+        get_data, _, _, children = _accessors(
+            TreeNodeConfig if config is None else config
+        )
+
+        nodes = [] if root is None else [root]
+        lefts = []
+        rights = []
+        # `nodes` doubles as the queue of a level order traversal
+        for node in nodes:
+            left, right = children(node)
+            for child, indices in ((left, lefts), (right, rights)):
+                if child is None:
+                    indices.append(-1)
+                else:
+                    indices.append(len(nodes))
+                    nodes.append(child)
+
+        n = len(nodes)
+        payload = (
+            struct.pack("<Q", n)
+            + _pack_indices(lefts, n)
+            + _pack_indices(rights, n)
+            + _pack_values([get_data(node) for node in nodes])
+        )
+        return self._add(KIND_BINARY_TREE, payload, tag)
+
+    def add_graph(
+        self,
+        vertices: Sequence[Vertex],
+        edge_list: Sequence[Tuple[Vertex, Vertex]],
+        directed: bool = False,
+        tag: Optional[str] = None,
+    ) -> int:
+        """
+        Add a graph from its vertices and edges. It materialises into the adjacency lists
+        made by `UndirectedGraph.create_from_edge_list` (or `DirectedGraph`'s).
+        """
+        if isinstance(vertices, range) and vertices.start == 0 and vertices.step == 1:
+            endpoints = [v for edge in edge_list for v in edge[:2]]
+        else:
+            index = {v: i for i, v in enumerate(vertices)}
+            endpoints = [index[v] for edge in edge_list for v in edge[:2]]
+
+        payload = (
+            struct.pack("<Q", len(endpoints))
+            + _pack_indices(endpoints, len(vertices))
+            + _pack_values(vertices)
+        )
+        kind = KIND_DIRECTED_GRAPH if directed else KIND_UNDIRECTED_GRAPH
+        return self._add(kind, payload, tag)
+
+    def close(self):
+        if self._file.closed:
+            return
+
+        index_offset = self._file.tell()
+        index = _index_bytes(self._entries, self._tags)
+        self._file.write(index)
+        _write_header(self._file, NATIVE_BYTE_ORDER, len(self._entries), index_offset)
+        self._file.close()
+
+        size = index_offset + len(index)
+        used = HEADER.size + sum(entry[1] for entry in self._entries) + len(index)
+        if size - used > MAX_UNUSED_FRACTION * size:
+            compact(self._filename)
+
+    def __enter__(self) -> "CorpusWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Corpus:
+    """
+    Random access to the cases of a corpus file, which is memory-mapped. `corpus[id]`
+    returns a lazy `CorpusCase`.
+    """
+
+    def __init__(self, filename: str):
+        with open(filename, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+
+        magic, version, byte_order, count, index_offset = HEADER.unpack_from(
+            self._buffer
+        )
+        assert magic == MAGIC, f"{filename} is not a corpus file"
+        assert version == VERSION, f"Unsupported corpus version {version}"
+
+        self._swap_bytes = byte_order != NATIVE_BYTE_ORDER
+        self._count = count
+        self._index_offset = index_offset
+        self.tags = _read_tags(self._buffer, index_offset + count * INDEX_ENTRY.size)
+        self._ids_by_tag: Optional[Dict[str, List[int]]] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, id: int) -> CorpusCase:
+        if id < 0:
+            id += self._count
+        if not 0 <= id < self._count:
+            raise IndexError(f"Case {id} is out of range")
+
+        offset, length, tag_number, kind = INDEX_ENTRY.unpack_from(
+            self._buffer, self._index_offset + id * INDEX_ENTRY.size
+        )
+        tag = None if tag_number == NO_TAG else self.tags[tag_number]
+        return CorpusCase(self, id, kind, tag, offset, length)
+
+    def __iter__(self) -> Iterator[CorpusCase]:
+        for id in range(self._count):
+            yield self[id]
+
+    def ids_with_tag(self, tag: str) -> List[int]:
+        """The ids of every case with the given tag (the first call reads the index)."""
+        if self._ids_by_tag is None:
+            self._ids_by_tag = {t: [] for t in self.tags}
+            index = self._buffer[
+                self._index_offset : self._index_offset + self._count * INDEX_ENTRY.size
+            ]
+            for id, (_, _, tag_number, _) in enumerate(INDEX_ENTRY.iter_unpack(index)):
+                if tag_number != NO_TAG:
+                    self._ids_by_tag[self.tags[tag_number]].append(id)
+            index.release()
+        return self._ids_by_tag.get(tag, [])
+
+    def cases_with_tag(self, tag: str) -> Iterator[CorpusCase]:
+        for id in self.ids_with_tag(tag):
+            yield self[id]
+
+    def close(self):
+        self._buffer.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "Corpus":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,194 @@
+"""
+A compact representation of undirected graphs in the Compressed Sparse Row (CSR) format.
+"""
+
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+Vertex = TypeVar("Vertex")
+
+INDEX_TYPECODE_32 = "i"  # 4 bytes per neighbour
+INDEX_TYPECODE_64 = "q"  # 8 bytes per neighbour, for graphs with > 2^31 - 1 vertices
+
+
+def _index_typecode(n: int) -> str:
+    return INDEX_TYPECODE_32 if n <= 2**31 - 1 else INDEX_TYPECODE_64
+
+
+def _counting_sort(n: int, edges: Sequence[int]) -> Tuple[array, array]:
+    """
+    Build the `offsets` and `neighbours` arrays from a flat sequence of edge endpoints
+    (vertex indices), in two passes: the first counts the degree of every vertex, the
+    second places every endpoint in its slot.
+    """
+    assert len(edges) % 2 == 0, "Expected an even number of edge endpoints"
+    # An endpoint outside 0 ... n - 1 would silently corrupt the offsets
+    if len(edges) and (min(edges) < 0 or max(edges) >= n):
+        raise ValueError(f"Edge endpoints must be vertex indices in [0, {n})")
+
+    offsets = array("q", bytes(8 * (n + 1)))
+    for v in edges:
+        offsets[v + 1] += 1
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+
+    neighbours = array(_index_typecode(n))
+    neighbours.frombytes(bytes(neighbours.itemsize * len(edges)))
+    cursor = array("q", offsets[:-1])
+    for i in range(0, len(edges), 2):
+        u, v = edges[i], edges[i + 1]
+        neighbours[cursor[u]] = v
+        cursor[u] += 1
+        neighbours[cursor[v]] = u
+        cursor[v] += 1
+
+    return offsets, neighbours
+
+
+class CSRGraph:
+    """
+    An undirected graph stored as two flat integer arrays: the neighbours of the i'th
+    vertex are `neighbours[offsets[i] : offsets[i + 1]]` (as vertex indices).
+
+    This takes 4 bytes per edge endpoint instead of the ~100 bytes of a dictionary of
+    lists. A `CSRGraph` is read-only, and behaves like the dictionary form (`Graph`):
+    `graph[vertex]` is a list of neighbours, and iterating over it yields the vertices.
+    Self-loops appear twice in the neighbours of their vertex, just like in the
+    dictionary form.
+    """
+
+    def __init__(
+        self,
+        vertices: Sequence[Vertex],
+        offsets: array,
+        neighbours: array,
+    ) -> None:
+        """
+        Args:
+            vertices: The vertices, in index order. Pass a `range` when the vertices are
+                the integers `0 ... n - 1`, which avoids storing a lookup table.
+            offsets: `n + 1` offsets into `neighbours`.
+            neighbours: The indices of the neighbours of every vertex, concatenated.
+        """
+        assert len(offsets) == len(vertices) + 1
+
+        self.vertices = vertices
+        self.offsets = offsets
+        self.neighbours = neighbours
+
+        self._index: Optional[Dict[Vertex, int]] = None
+        if not (
+            isinstance(vertices, range) and vertices.start == 0 and vertices.step == 1
+        ):
+            self._index = {v: i for i, v in enumerate(vertices)}
+
+    @staticmethod
+    def from_edge_array(n: int, edges: Sequence[int]) -> "CSRGraph":
+        """
+        Create a graph on the vertices `0 ... n - 1` from a flat sequence of edge
+        endpoints `[u0, v0, u1, v1, ...]` (for example, an `array`).
+        """
+        offsets, neighbours = _counting_sort(n, edges)
+        return CSRGraph(range(n), offsets, neighbours)
+
+    @staticmethod
+    def from_edge_list(
+        vertices: Sequence[Vertex], edge_list: Sequence[Tuple[Vertex, Vertex]]
+    ) -> "CSRGraph":
+        """
+        Create a graph from a sequence of vertices and `(u, v)` edges, like
+        `UndirectedGraph.create_from_edge_list`.
+        """
+        if isinstance(vertices, range) and vertices.start == 0 and vertices.step == 1:
+            index = None
+        else:
+            index = {v: i for i, v in enumerate(vertices)}
+
+        edges = array(_index_typecode(len(vertices)))
+        for u, v in edge_list:
+            if index is None:
+                edges.append(u)
+                edges.append(v)
+            else:
+                edges.append(index[u])
+                edges.append(index[v])
+
+        offsets, neighbours = _counting_sort(len(vertices), edges)
+        return CSRGraph(vertices, offsets, neighbours)
+
+    @staticmethod
+    def from_dict(graph: Dict[Vertex, List[Vertex]]) -> "CSRGraph":
+        """Create a graph from its dictionary form (vertex -> list of neighbours)."""
+        vertices = list(graph)
+        index = {v: i for i, v in enumerate(vertices)}
+
+        offsets = array("q", [0])
+        neighbours = array(_index_typecode(len(vertices)))
+        for u in vertices:
+            neighbours.extend(index[v] for v in graph[u])
+            offsets.append(len(neighbours))
+
+        return CSRGraph(vertices, offsets, neighbours)
+
+    def to_dict(self) -> Dict[Vertex, List[Vertex]]:
+        """Convert the graph into its dictionary form (vertex -> list of neighbours)."""
+        return {u: self[u] for u in self.vertices}
+
+    def index_of(self, vertex: Vertex) -> int:
+        """The index of the given vertex in the `offsets` array."""
+        if self._index is None:
+            if not (0 <= vertex < len(self.vertices)):
+                raise KeyError(vertex)
+            return vertex
+        return self._index[vertex]
+
+    def degree(self, vertex: Vertex) -> int:
+        """The number of edge endpoints at the given vertex (self-loops count twice)."""
+        i = self.index_of(vertex)
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def neighbours_of(self, vertex: Vertex) -> Iterator[Vertex]:
+        """Generator function that yields the neighbours of the given vertex."""
+        i = self.index_of(vertex)
+        vertices = self.vertices
+        for j in self.neighbours[self.offsets[i] : self.offsets[i + 1]]:
+            yield vertices[j]
+
+    def edge_count(self) -> int:
+        """The number of edges in the graph."""
+        return len(self.neighbours) // 2
+
+    def edges(self) -> Iterator[Tuple[Vertex, Vertex]]:
+        """Generator function that yields every edge once, as a `(u, v)` pair."""
+        vertices = self.vertices
+        offsets = self.offsets
+        neighbours = self.neighbours
+        for i in range(len(vertices)):
+            self_loops = 0
+            for j in neighbours[offsets[i] : offsets[i + 1]]:
+                if i < j:
+                    yield vertices[i], vertices[j]
+                elif i == j:
+                    # Self-loops are stored twice
+                    self_loops += 1
+                    if self_loops % 2 == 0:
+                        yield vertices[i], vertices[i]
+
+    def __getitem__(self, vertex: Vertex) -> List[Vertex]:
+        return list(self.neighbours_of(vertex))
+
+    def __contains__(self, vertex: Vertex) -> bool:
+        try:
+            self.index_of(vertex)
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[Vertex]:
+        return iter(self.vertices)
+
+    def __len__(self) -> int:
+        return len(self.vertices)
+
+    def __repr__(self) -> str:
+        return f"CSRGraph(vertices={len(self)}, edges={self.edge_count()})"
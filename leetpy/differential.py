@@ -0,0 +1,516 @@
+"""
+Differential testing: compare a candidate solution against a reference solution on
+random inputs, across a process pool.
+
+    from leetpy import BinaryTree, differential
+
+    result = differential.compare_solutions(
+        candidate, reference, (BinaryTree.create, {"n": 20}), cases=10000, workers=8
+    )
+    print(result.report())
+
+Every case seeds the `random` module with its own seed, and calls the generator to
+create the input (the state of the `random` module is restored afterwards). The input is
+created twice (once for each solution), so solutions that modify their input in-place
+don't affect each other. If the generator returns a tuple, its items are passed as
+separate arguments.
+
+Every solution call is interrupted after `timeout` seconds (with `signal.setitimer`, so
+only on Unix), and the whole run stops at the first case where the solutions diverge.
+The failing input is then shrunk (by removing subtrees, list nodes, array elements, rows
+and columns) while the solutions still diverge, and returned as LeetCode testcase input
+and as Python code from `export_as_code`.
+
+NOTE: Solutions, generators and `equals` must be picklable (defined at the top level of
+a module) to run with `workers`, and generators must only use the `random` module for
+randomness.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import copy
+import random
+import signal
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+GeneratorSpec = Union[Callable[[], Any], Tuple[Callable[..., Any], Dict[str, Any]]]
+
+DEFAULT_TIMEOUT = 2.0
+# Batches are small enough to balance the workers, and to stop soon after a divergence
+MAX_CHUNK_SIZE = 256
+CHUNKS_PER_WORKER = 8
+DEFAULT_MAX_SHRINK_CALLS = 2000
+
+PASSED = "passed"
+MISMATCH = "mismatch"
+CANDIDATE_ERROR = "candidate error"
+CANDIDATE_TIMEOUT = "candidate timeout"
+REFERENCE_ERROR = "reference error"
+REFERENCE_TIMEOUT = "reference timeout"
+# A shrunk input must still fail because of the candidate
+CANDIDATE_FAILURES = (MISMATCH, CANDIDATE_ERROR, CANDIDATE_TIMEOUT)
+
+
+class CaseResult(NamedTuple):
+    index: int
+    seed: str
+    status: str
+    candidate_time: float
+    reference_time: float
+    # What went wrong (empty if the case passed)
+    message: str
+
+
+class Divergence(NamedTuple):
+    # The first case where the solutions diverged
+    case: CaseResult
+    # The status and message of the minimal failing input
+    status: str
+    message: str
+    # The minimal failing input, with one line per argument
+    leetcode: str
+    code: str
+
+
+class DifferentialResult(NamedTuple):
+    # Every case that ran (in order), up to the first divergence
+    cases: List[CaseResult]
+    divergence: Optional[Divergence]
+
+    @property
+    def passed(self) -> bool:
+        return self.divergence is None
+
+    def slowest(self, count: int = 10) -> List[CaseResult]:
+        """The cases where the candidate took the longest."""
+        return sorted(self.cases, key=lambda case: -case.candidate_time)[:count]
+
+    def report(self, count: int = 5) -> str:
+        lines = [f"{len(self.cases)} cases run"]
+        if self.cases:
+            total = sum(case.candidate_time for case in self.cases)
+            reference_total = sum(case.reference_time for case in self.cases)
+            lines.append(
+                f"candidate {total:.4f} s total, reference {reference_total:.4f} s total"
+            )
+            lines.append("Slowest cases:")
+            for case in self.slowest(count):
+                lines.append(
+                    f"  #{case.index} (seed {case.seed!r}): candidate "
+                    f"{case.candidate_time:.6f} s, reference {case.reference_time:.6f} s"
+                )
+        if self.divergence is None:
+            lines.append("No divergence")
+        else:
+            divergence = self.divergence
+            lines.append(
+                f"Divergence at case #{divergence.case.index} "
+                f"(seed {divergence.case.seed!r}): {divergence.status}"
+            )
+            lines.append(divergence.message)
+            lines.append("Minimal failing input:")
+            lines.append(divergence.leetcode)
+        return "\n".join(lines)
+
+
+class _CaseTimeout(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise _CaseTimeout()
+
+
+def _case_seed(seed: int, index: int) -> str:
+    # String seeds are hashed, so neighbouring cases get unrelated random streams
+    return f"{seed}:{index}"
+
+
+def _generate(generator: GeneratorSpec, seed: str) -> Tuple:
+    # Generators use the global stream, which belongs to the caller
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        if isinstance(generator, tuple):
+            function, kwargs = generator
+            value = function(**kwargs)
+        else:
+            value = generator()
+    finally:
+        random.setstate(state)
+    return value if isinstance(value, tuple) else (value,)
+
+
+def _normalize(value: Any) -> Any:
+    """A comparable (and picklable) form of a solution's output."""
+    from .binary_tree import BinaryTree, TreeNode
+    from .linked_list import ListNode
+
+    if isinstance(value, TreeNode):
+        if BinaryTree.is_cyclic(value):
+            return ("TreeNode", "<cyclic>")
+        return ("TreeNode", BinaryTree.export_as_leetcode_array(value))
+    if isinstance(value, ListNode):
+        values = []
+        seen = set()
+        while value is not None and id(value) not in seen:
+            seen.add(id(value))
+            values.append(value.val)
+            value = value.next
+        return ("ListNode", values, value is not None)
+    if isinstance(value, (list, tuple)):
+        return type(value)(_normalize(item) for item in value)
+    return value
+
+
+def _call(
+    solution: Callable, args: Tuple, timeout: Optional[float]
+) -> Tuple[str, Any, float]:
+    """Call a solution, and return `("ok" | "error" | "timeout", output, runtime)`."""
+    use_timer = timeout is not None and hasattr(signal, "setitimer")
+    if use_timer:
+        previous_handler = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    start = time.perf_counter()
+    try:
+        output = solution(*args)
+        return "ok", output, time.perf_counter() - start
+    except _CaseTimeout:
+        return "timeout", None, time.perf_counter() - start
+    except Exception as e:
+        return "error", f"{type(e).__name__}: {e}", time.perf_counter() - start
+    finally:
+        if use_timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+
+def _run(
+    candidate: Callable,
+    reference: Callable,
+    make_args: Callable[[], Tuple],
+    equals: Optional[Callable[[Any, Any], bool]],
+    timeout: Optional[float],
+) -> Tuple[str, float, float, str]:
+    """Run both solutions on fresh copies of an input: `(status, times, message)`."""
+    reference_status, expected, reference_time = _call(reference, make_args(), timeout)
+    candidate_status, actual, candidate_time = _call(candidate, make_args(), timeout)
+
+    if reference_status == "timeout":
+        status, message = REFERENCE_TIMEOUT, f"reference took over {timeout} s"
+    elif candidate_status == "timeout":
+        status, message = CANDIDATE_TIMEOUT, f"candidate took over {timeout} s"
+    elif reference_status == "error" and candidate_status == "error":
+        # Both solutions rejecting an input is agreement
+        status, message = PASSED, ""
+    elif reference_status == "error":
+        status, message = REFERENCE_ERROR, expected
+    elif candidate_status == "error":
+        status, message = CANDIDATE_ERROR, actual
+    else:
+        if equals is not None:
+            is_equal = equals(expected, actual)
+        else:
+            expected, actual = _normalize(expected), _normalize(actual)
+            is_equal = expected == actual
+        status = PASSED if is_equal else MISMATCH
+        message = "" if is_equal else f"expected {expected!r}, got {actual!r}"
+
+    return status, candidate_time, reference_time, message
+
+
+def _run_case(
+    candidate: Callable,
+    reference: Callable,
+    generator: GeneratorSpec,
+    equals: Optional[Callable[[Any, Any], bool]],
+    timeout: Optional[float],
+    seed: int,
+    index: int,
+) -> CaseResult:
+    case_seed = _case_seed(seed, index)
+    result = _run(
+        candidate,
+        reference,
+        lambda: _generate(generator, case_seed),
+        equals,
+        timeout,
+    )
+    return CaseResult(index, case_seed, *result)
+
+
+def _run_batch(job: Tuple) -> List[CaseResult]:
+    """Run a batch of cases, stopping at the first divergence (in worker processes)."""
+    candidate, reference, generator, equals, timeout, seed, indices = job
+    results = []
+    for index in indices:
+        results.append(
+            _run_case(candidate, reference, generator, equals, timeout, seed, index)
+        )
+        if results[-1].status != PASSED:
+            break
+    return results
+
+
+def _blueprint(arg: Any) -> Tuple[str, Any]:
+    """A copyable description of an input argument, that can also be shrunk."""
+    from .binary_tree import BinaryTree, TreeNode
+    from .linked_list import ListNode
+
+    if isinstance(arg, TreeNode):
+        return "tree", BinaryTree.export_as_leetcode_array(arg)
+    if isinstance(arg, ListNode):
+        values = []
+        seen = set()
+        while arg is not None and id(arg) not in seen:
+            seen.add(id(arg))
+            values.append(arg.val)
+            arg = arg.next
+        return "linked list", values
+    if isinstance(arg, list) and arg and all(isinstance(row, list) for row in arg):
+        if all(len(row) == len(arg[0]) for row in arg):
+            return "2d array", arg
+    if isinstance(arg, list):
+        return "array", arg
+    return "value", arg
+
+
+def _build(blueprint: Tuple[str, Any]) -> Any:
+    from .binary_tree import BinaryTree
+    from .linked_list import LinkedList
+
+    kind, data = blueprint
+    if kind == "tree":
+        return BinaryTree.create_from_leetcode_array(data)
+    if kind == "linked list":
+        return LinkedList.create_from_array(data)
+    return copy.deepcopy(data)
+
+
+def _without_chunks(values: List) -> Iterator[List]:
+    """Every copy of `values` with one chunk removed, from the largest chunks down."""
+    size = len(values) // 2
+    while size >= 1:
+        for start in range(0, len(values), size):
+            yield values[:start] + values[start + size :]
+        size //= 2
+
+
+def _shrink_candidates(blueprint: Tuple[str, Any]) -> Iterator[Tuple[str, Any]]:
+    """Smaller versions of an input argument, roughly from smallest to largest."""
+    from .binary_tree import BinaryTree
+
+    kind, data = blueprint
+    if kind == "tree":
+        root = BinaryTree.create_from_leetcode_array(data)
+        if root is None:
+            return
+        # Replace every subtree with nothing, or with one of its children
+        slots = [(None, None, root)]
+        for parent, attribute, node in slots:
+            for child_attribute in ("left", "right"):
+                child = getattr(node, child_attribute)
+                if child is not None:
+                    slots.append((node, child_attribute, child))
+        for parent, attribute, node in slots:
+            children = [child for child in (node.left, node.right) if child is not None]
+            for replacement in [None, *children]:
+                if parent is None:
+                    yield kind, BinaryTree.export_as_leetcode_array(replacement)
+                    continue
+                setattr(parent, attribute, replacement)
+                yield kind, BinaryTree.export_as_leetcode_array(root)
+                setattr(parent, attribute, node)
+    elif kind in ("array", "linked list"):
+        for values in _without_chunks(data):
+            yield kind, values
+    elif kind == "2d array":
+        for rows in _without_chunks(data):
+            if rows:
+                yield kind, rows
+        columns = [list(column) for column in zip(*data)]
+        for remaining in _without_chunks(columns):
+            if remaining:
+                yield kind, [list(row) for row in zip(*remaining)]
+
+
+def _shrink(
+    candidate: Callable,
+    reference: Callable,
+    blueprints: List[Tuple[str, Any]],
+    equals: Optional[Callable[[Any, Any], bool]],
+    timeout: Optional[float],
+    max_calls: int,
+) -> Tuple[List[Tuple[str, Any]], str, str]:
+    """
+    Greedily replace arguments with smaller versions while the candidate still fails.
+    Returns the smallest arguments found, and their status and message.
+    """
+
+    def run(blueprints):
+        make_args = lambda: tuple(_build(blueprint) for blueprint in blueprints)
+        status, _, _, message = _run(candidate, reference, make_args, equals, timeout)
+        return status, message
+
+    status, message = run(blueprints)
+    calls = 1
+    improved = True
+    while improved and calls < max_calls:
+        improved = False
+        for i in range(len(blueprints)):
+            for smaller in _shrink_candidates(blueprints[i]):
+                if calls >= max_calls:
+                    break
+                attempt = blueprints[:i] + [smaller] + blueprints[i + 1 :]
+                new_status, new_message = run(attempt)
+                calls += 1
+                if new_status in CANDIDATE_FAILURES:
+                    blueprints = attempt
+                    status, message = new_status, new_message
+                    improved = True
+                    break
+            if improved:
+                break
+    return blueprints, status, message
+
+
+def _format_input(blueprints: List[Tuple[str, Any]]) -> Tuple[str, str]:
+    """The arguments as LeetCode testcase input, and as Python code."""
+    import json
+
+    from .binary_tree import BinaryTree
+    from .linked_list import LinkedList
+
+    leetcode_lines = []
+    code_blocks = []
+    for i, blueprint in enumerate(blueprints):
+        kind, data = blueprint
+        function_name = f"get_input_{i}"
+        if kind == "tree":
+            leetcode_lines.append(data)
+            code_blocks.append(
+                BinaryTree.export_as_code(
+                    _build(blueprint), function_name=function_name
+                )
+            )
+            continue
+        if kind == "linked list":
+            code_blocks.append(
+                LinkedList.export_as_code(
+                    _build(blueprint), function_name=function_name
+                )
+            )
+        else:
+            code_blocks.append(f"def {function_name}():\n    return {data!r}")
+        try:
+            leetcode_lines.append(json.dumps(data, separators=(",", ":")))
+        except TypeError:
+            leetcode_lines.append(repr(data))
+    return "\n".join(leetcode_lines), "\n\n\n".join(code_blocks)
+
+
+def compare_solutions(
+    candidate: Callable,
+    reference: Callable,
+    generator: GeneratorSpec,
+    cases: int = 1000,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+    equals: Optional[Callable[[Any, Any], bool]] = None,
+    shrink: bool = True,
+    chunk_size: Optional[int] = None,
+    max_shrink_calls: int = DEFAULT_MAX_SHRINK_CALLS,
+) -> DifferentialResult:
+    """
+    Run a candidate solution and a reference solution on random inputs, until they
+    diverge or all cases pass.
+
+    Args:
+        generator: Creates an input, as a function without arguments, or a
+            `(function, kwargs)` pair like `(BinaryTree.create, {"n": 20})`.
+        cases: The number of random inputs.
+        seed: The seed of the whole run. Every case is reproducible from its own seed
+            (in `CaseResult.seed`), with `random.seed(case.seed)`.
+        workers: Enabling this runs the cases in this many worker processes.
+        timeout: The time limit (in seconds) of every solution call.
+        equals: Compares the reference's output with the candidate's. By default,
+            outputs are compared by value, with binary trees and linked lists
+            compared by structure and node values.
+        shrink: Enabling this shrinks the failing input before returning it.
+        chunk_size: The number of cases sent to a worker at a time (by default, up
+            to 256, so that every worker gets about 8 batches).
+        max_shrink_calls: The maximum number of inputs tried while shrinking.
+    """
+    results: List[CaseResult] = []
+
+    if workers is None or workers <= 1:
+        for index in range(cases):
+            results.append(
+                _run_case(candidate, reference, generator, equals, timeout, seed, index)
+            )
+            if results[-1].status != PASSED:
+                break
+    else:
+        if chunk_size is None:
+            chunk_size = cases // (workers * CHUNKS_PER_WORKER)
+            chunk_size = max(1, min(MAX_CHUNK_SIZE, chunk_size))
+        jobs = [
+            (
+                candidate,
+                reference,
+                generator,
+                equals,
+                timeout,
+                seed,
+                range(start, min(start + chunk_size, cases)),
+            )
+            for start in range(0, cases, chunk_size)
+        ]
+        with ProcessPoolExecutor(workers) as pool:
+            first_case = {pool.submit(_run_batch, job): job[-1].start for job in jobs}
+            pending = set(first_case)
+            first_failure = cases
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for result in future.result():
+                        results.append(result)
+                        if result.status != PASSED:
+                            first_failure = min(first_failure, result.index)
+                # Batches after the first divergence are skipped, but earlier batches
+                # still run, since they could find an earlier divergence
+                for future in list(pending):
+                    if first_case[future] > first_failure and future.cancel():
+                        pending.remove(future)
+        results.sort(key=lambda result: result.index)
+
+    failures = [result for result in results if result.status != PASSED]
+    if not failures:
+        return DifferentialResult(results, None)
+
+    # Keep the cases before the first divergence, so the result doesn't depend on how
+    # the batches were scheduled
+    failure = failures[0]
+    results = [result for result in results if result.index <= failure.index]
+
+    blueprints = [_blueprint(arg) for arg in _generate(generator, failure.seed)]
+    status, message = failure.status, failure.message
+    if shrink and failure.status in CANDIDATE_FAILURES:
+        blueprints, status, message = _shrink(
+            candidate, reference, blueprints, equals, timeout, max_shrink_calls
+        )
+    leetcode, code = _format_input(blueprints)
+    return DifferentialResult(
+        results, Divergence(failure, status, message, leetcode, code)
+    )
@@ -0,0 +1,209 @@
+"""
+Directed graphs, stored as adjacency lists of out-neighbours.
+"""
+
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from . import _graph_algorithms
+from .rng import SeedLike, as_random
+from .undirected_graph import (
+    UndirectedGraph,
+    _layout_coords,
+    _save_position_cache,
+    _warm_start_positions,
+    _write_svg,
+)
+
+Vertex = TypeVar("Vertex")
+Edge = Tuple[Vertex, Vertex]
+Graph = Dict[Vertex, List[Vertex]]
+
+
+def _digraph_from_edge_array(n: int, edges: Sequence[int]) -> Graph[int]:
+    """Out-neighbours of the vertices `0 ... n - 1` from a flat array of endpoints."""
+    graph: Graph = {v: [] for v in range(n)}
+    for i in range(0, len(edges), 2):
+        graph[edges[i]].append(edges[i + 1])
+    return graph
+
+
+class DirectedGraph:
+    @staticmethod
+    def create(
+        n: int,
+        p: Optional[float] = None,
+        m: Optional[int] = None,
+        seed: SeedLike = None,
+        as_edge_array: bool = False,
+    ) -> Union[Graph[int], array]:
+        """
+        Create a random directed graph on the vertices `0 ... n - 1` (without
+        self-loops), where either every edge `u -> v` is present with probability `p`,
+        or exactly `m` distinct edges are chosen uniformly. Runs in O(n + m) time.
+
+        Args:
+            p: The probability of any edge being present.
+            m: The exact number of edges. Overrides `p`.
+            seed: The seed for the random number generator: an int, a str, a
+                `SeedSequence` or a `random.Random` instance (see `leetpy.rng`).
+                (default = None, i.e. the global `random` module)
+            as_edge_array: Enabling this returns a flat array of edge endpoints
+                `[u0, v0, u1, v1, ...]` instead of adjacency lists.
+        """
+        from ._graph_generators import random_digraph
+
+        assert p is not None or m is not None, "Either p or m is required"
+        edges = random_digraph(n, as_random(seed), p, m)
+        return edges if as_edge_array else _digraph_from_edge_array(n, edges)
+
+    @staticmethod
+    def create_dag(
+        n: int,
+        p: Optional[float] = None,
+        m: Optional[int] = None,
+        seed: SeedLike = None,
+        as_edge_array: bool = False,
+    ) -> Union[Graph[int], array]:
+        """
+        Create a random directed acyclic graph on the vertices `0 ... n - 1`. The
+        vertices are shuffled into a random topological order, so vertex labels don't
+        give the order away. Runs in O(n + m) time.
+
+        Args:
+            p: The probability of an edge between any two vertices.
+            m: The exact number of edges. Overrides `p`.
+            seed: The seed for the random number generator: an int, a str, a
+                `SeedSequence` or a `random.Random` instance (see `leetpy.rng`).
+                (default = None, i.e. the global `random` module)
+            as_edge_array: Enabling this returns a flat array of edge endpoints
+                `[u0, v0, u1, v1, ...]` instead of adjacency lists.
+        """
+        from ._graph_generators import random_dag
+
+        assert p is not None or m is not None, "Either p or m is required"
+        edges = random_dag(n, as_random(seed), p, m)
+        return edges if as_edge_array else _digraph_from_edge_array(n, edges)
+
+    @staticmethod
+    def create_from_edge_list(
+        vertices: Sequence[Vertex], edge_list: Sequence[Edge]
+    ) -> Graph[Vertex]:
+        """
+        Create the adjacency lists of a directed graph from its vertices and edges,
+        where every edge `(u, v)` points from `u` to `v`.
+        """
+        graph: Graph = {}
+
+        for vertex in vertices:
+            graph[vertex] = []
+
+        for v1, v2 in edge_list:
+            graph[v1].append(v2)
+
+        return graph
+
+    @staticmethod
+    def reverse(graph: Graph) -> Graph:
+        """Return the graph with the direction of every edge reversed."""
+        return _graph_algorithms.reverse_graph(graph)
+
+    @staticmethod
+    def topological_sort(graph: Graph) -> Optional[List[Vertex]]:
+        """
+        Return the vertices in an order where every edge points forward (Kahn's
+        algorithm), or `None` if the graph contains a cycle.
+        """
+        return _graph_algorithms.topological_sort(graph)
+
+    @staticmethod
+    def is_acyclic(graph: Graph) -> bool:
+        """Check whether the graph is a DAG (self-loops count as cycles)."""
+        return _graph_algorithms.topological_sort(graph) is not None
+
+    @staticmethod
+    def get_strongly_connected_components(graph: Graph) -> List[List[Vertex]]:
+        """
+        Return the vertices of every strongly connected component (Tarjan's algorithm).
+
+        Components are in topological order: every edge between two different
+        components points from an earlier component to a later one.
+
+        NOTE: The algorithm is iterative, so long paths don't hit the recursion limit.
+        """
+        return _graph_algorithms.strongly_connected_components(graph)
+
+    @staticmethod
+    def print(graph: Graph):
+        for vertex in graph:
+            edge_repr = "[" + ", ".join(map(str, graph[vertex])) + "]"
+            print(f"{vertex}: {edge_repr}")
+
+    @staticmethod
+    def travel_bfs(graph: Graph, source: Vertex) -> Iterator[Vertex]:
+        """
+        Generator function that yields the vertices reachable from `source` in a
+        breadth-first order.
+        """
+        return _graph_algorithms.travel_bfs(graph, source)
+
+    @staticmethod
+    def travel_dfs(graph: Graph, source: Vertex) -> Iterator[Vertex]:
+        """
+        Generator function that yields the vertices reachable from `source` in a
+        depth-first (pre)order.
+        """
+        return _graph_algorithms.travel_dfs(graph, source)
+
+    @staticmethod
+    def save_as_svg(
+        vertices: Sequence[Vertex],
+        edge_list: Sequence[Edge],
+        coords: Dict[Vertex, Tuple[float, float]],
+        svg_filename: str,
+    ):
+        _write_svg(vertices, edge_list, coords, svg_filename, directed=True)
+
+    @staticmethod
+    def draw(
+        vertices: Sequence[Vertex],
+        edge_list: Sequence[Edge],
+        svg_filename: str,
+        theta: Optional[float] = None,
+        multilevel: bool = False,
+        area: Optional[float] = None,
+        initial_positions: Optional[Dict[Vertex, Tuple[float, float]]] = None,
+        position_cache: Optional[str] = None,
+        split_components: bool = False,
+        workers: Optional[int] = None,
+        seed: SeedLike = None,
+    ) -> Dict[Vertex, Tuple[float, float]]:
+        """
+        Lay out the graph with a force-directed algorithm and save it as an SVG file,
+        with an arrowhead on every edge. The layout ignores edge directions. Returns
+        the coordinates of the vertices.
+
+        See `UndirectedGraph.draw` for the arguments.
+        """
+        initial_positions = _warm_start_positions(
+            vertices, multilevel, initial_positions, position_cache
+        )
+
+        G = UndirectedGraph.create_from_edge_list(vertices, edge_list)
+        coords = _layout_coords(
+            vertices,
+            G,
+            theta,
+            multilevel,
+            area,
+            initial_positions,
+            split_components,
+            workers,
+            seed=seed,
+        )
+        DirectedGraph.save_as_svg(vertices, edge_list, coords, svg_filename)
+
+        if position_cache is not None:
+            _save_position_cache(position_cache, coords)
+
+        return coords
@@ -1,6 +1,6 @@
-import random
 from typing import Iterable, Iterator, List, Optional, Set
-from rich import print as rich_print
+
+from .rng import SeedLike, as_random
 
 
 INT_MIN = -2147483648
@@ -51,6 +51,7 @@ class LinkedList:
         max_val: int = INT_MAX,
         index_as_val: bool = False,
         choices: Iterable[any] = [],
+        seed: SeedLike = None,
     ) -> Optional[ListNode]:
         """
         Create a linked list based on the given parameters.
@@ -62,8 +63,12 @@ class LinkedList:
             index_as_val: Enabling this sets node values to the 0-based order in which
                 they were created. Overrides `min_val` and `max_val`.
             choices: A list of possible node values to be randomly chosen from.
+            seed: The seed for the random number generator: an int, a str, a
+                `SeedSequence` or a `random.Random` instance (see `leetpy.rng`).
+                (default = None, i.e. the global `random` module)
         """
 
+        rng = as_random(seed)
         sentinel = ListNode(-1)
         tail = sentinel
         for i in range(n):
@@ -71,9 +76,9 @@ class LinkedList:
             if index_as_val:
                 data = i
             elif len(choices) >= 1:
-                data = random.choice(choices)
+                data = rng.choice(choices)
             else:
-                data = random.randint(min_val, max_val)
+                data = rng.randint(min_val, max_val)
 
             node = ListNode(data)
             tail.next = node
@@ -174,14 +179,12 @@ class LinkedList:
         if n < 0:
             n += N
 
-        def _get(head: Optional[ListNode], n: int):
-            if head is None:
-                return None
-            if n == 0:
-                return head
-            return _get(head.next, n - 1)
-
-        return _get(head, n)
+        if n < 0:
+            return None
+        while head is not None and n > 0:
+            head = head.next
+            n -= 1
+        return head
 
     @staticmethod
     def get_cyclic_node(head: Optional[ListNode]) -> Optional[ListNode]:
@@ -207,6 +210,7 @@ class LinkedList:
 
         NOTE: Cyclic references do not cause a problem.
         """
+        from rich import print as rich_print
 
         cycle_start_node = LinkedList.get_cyclic_node(head)
 
@@ -0,0 +1,340 @@
+"""
+Opt-in instrumentation for leetpy calls.
+
+Profiling is off by default, and costs nothing while it's off: enabling it replaces
+every public static method (and a few internal phases, like the Reingold-Tilford layout
+of a binary tree or the SVG writer of a graph) with a wrapper that records statistics,
+and disabling it puts the original functions back.
+
+Enable it around some code:
+
+    from leetpy import BinaryTree, profiling
+
+    with profiling.profile():
+        BinaryTree.save_as_svg(root, fp)
+    print(profiling.report())
+
+Or for a whole program, by setting the `LEETPY_PROFILE` environment variable (to
+anything but "" or "0"), which prints the report to stderr when the program exits.
+
+Every call is recorded under its name ("BinaryTree.save_as_svg"), and every internal
+phase under the public method that ran it ("BinaryTree.save_as_svg > TR_setup"). The
+statistics of each are:
+
+    calls: The number of calls (recursive calls aren't counted again).
+    time: The cumulative time spent inside the call, in seconds.
+    self_time: The time not spent inside other recorded calls. For example, the
+        `self_time` of `BinaryTree.save_as_svg` is its SVG assembly.
+    nodes: The number of nodes visited, counted as the number of items yielded by a
+        generator, plus the number of recursive calls.
+    bytes: The number of bytes written to `fp` (or to stdout by the `print` methods),
+        returned as a string, or saved to `svg_filename`.
+
+NOTE: Profiling isn't thread-safe, and doesn't see into worker processes.
+"""
+
+import atexit
+from contextlib import contextmanager
+import functools
+import importlib
+import inspect
+import os
+import sys
+import time
+from types import GeneratorType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+ENVIRONMENT_VARIABLE = "LEETPY_PROFILE"
+
+# The modules (relative to leetpy) and names of the wrapper classes
+PUBLIC_CLASSES = (
+    ("array_1d", "Array1D"),
+    ("array_2d", "Array2D"),
+    ("binary_tree", "BinaryTree"),
+    ("csr_graph", "CSRGraph"),
+    ("directed_graph", "DirectedGraph"),
+    ("linked_list", "LinkedList"),
+    ("undirected_graph", "UndirectedGraph"),
+)
+# The internal functions that are recorded as phases of public methods
+PHASES = (
+    ("_reingold_tilford_algorithm", "_TR_create_tree_copy"),
+    ("_reingold_tilford_algorithm", "TR_setup"),
+    ("_reingold_tilford_algorithm", "TR_petrify"),
+    ("undirected_graph", "_layout_coords"),
+    ("undirected_graph", "_write_svg"),
+    ("_force_layout", "create_embedding"),
+    ("_force_layout", "run_layout"),
+    ("_force_layout", "run_multilevel_layout"),
+    ("_component_layout", "layout_components"),
+    ("_graph_algorithms", "connected_components"),
+    ("_graph_algorithms", "is_cyclic"),
+    ("_graph_algorithms", "is_bipartite"),
+    ("_graph_algorithms", "bfs_shortest_paths"),
+    ("_graph_algorithms", "zero_one_bfs_shortest_paths"),
+    ("_graph_algorithms", "dijkstra_shortest_paths"),
+    ("_graph_algorithms", "bidirectional_dijkstra"),
+    ("_graph_algorithms", "topological_sort"),
+    ("_graph_algorithms", "strongly_connected_components"),
+    ("_graph_export", "write_code"),
+    ("_graph_export", "write_leetcode_edges"),
+    ("_graph_export", "write_leetcode_adjacency"),
+    ("_edge_list_io", "load_csr_graph"),
+    ("_layout_animation", "save_animation"),
+)
+STAT_NAMES = ("calls", "time", "self_time", "nodes", "bytes")
+
+Stats = Dict[str, Dict[str, float]]
+
+_stats: Stats = {}
+# Every recorded call in progress, as `[key, time spent in recorded calls inside it]`
+_stack: List[list] = []
+# The key of the outermost call in progress of every wrapped function
+_active: Dict[str, str] = {}
+# The innermost public method in progress
+_public_keys: List[str] = []
+# Everything that was replaced, as `(owner, attribute name, original value)`
+_patches: List[Tuple[Any, str, Any]] = []
+_enable_count = 0
+
+
+class _CountingWriter:
+    """Forwards everything to a file-like object, counting the bytes written."""
+
+    def __init__(self, fp: Any, stats: Dict[str, float]):
+        self._fp = fp
+        self._stats = stats
+
+    def write(self, s):
+        self._stats["bytes"] += _size(s)
+        return self._fp.write(s)
+
+    def __getattr__(self, name: str):
+        return getattr(self._fp, name)
+
+
+def _size(s: Any) -> int:
+    return len(s.encode()) if isinstance(s, str) else len(s)
+
+
+def _entry(key: str) -> Dict[str, float]:
+    stats = _stats.get(key)
+    if stats is None:
+        stats = _stats[key] = dict.fromkeys(STAT_NAMES, 0)
+    return stats
+
+
+def _finish(key: str, start: float, inner_time: float):
+    elapsed = time.perf_counter() - start
+    stats = _stats[key]
+    stats["time"] += elapsed
+    stats["self_time"] += elapsed - inner_time
+    if _stack:
+        _stack[-1][1] += elapsed
+
+
+def _iterate(name: str, key: str, iterator: Iterator) -> Iterator:
+    """Record the time spent producing every item, and count the items."""
+    stats = _entry(key)
+    while True:
+        outermost = name not in _active
+        if outermost:
+            _active[name] = key
+        _stack.append([key, 0.0])
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _finish(key, start, _stack.pop()[1])
+            if outermost:
+                del _active[name]
+        stats["nodes"] += 1
+        yield item
+
+
+def _wrap(func: Callable, name: str, public: bool) -> Callable:
+    parameters = list(inspect.signature(func).parameters)
+    fp_index = parameters.index("fp") if "fp" in parameters else None
+    svg_index = (
+        parameters.index("svg_filename") if "svg_filename" in parameters else None
+    )
+    captures_stdout = public and name.split(".")[-1].startswith("print")
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _enable_count == 0:
+            # A module that imported the wrapper by name while profiling was enabled
+            # keeps it after `disable`
+            return func(*args, **kwargs)
+
+        outer_key = _active.get(name)
+        if outer_key is not None:
+            # A recursive call visits another node
+            _stats[outer_key]["nodes"] += 1
+            return func(*args, **kwargs)
+
+        if public or not _public_keys:
+            key = name
+        else:
+            key = f"{_public_keys[-1]} > {name}"
+        stats = _entry(key)
+        stats["calls"] += 1
+
+        if fp_index is not None:
+            if "fp" in kwargs:
+                if kwargs["fp"] is not None:
+                    kwargs["fp"] = _CountingWriter(kwargs["fp"], stats)
+            elif len(args) > fp_index and args[fp_index] is not None:
+                args = list(args)
+                args[fp_index] = _CountingWriter(args[fp_index], stats)
+        stdout = sys.stdout
+        if captures_stdout:
+            sys.stdout = _CountingWriter(stdout, stats)
+
+        _active[name] = key
+        if public:
+            _public_keys.append(key)
+        _stack.append([key, 0.0])
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            _finish(key, start, _stack.pop()[1])
+            if public:
+                _public_keys.pop()
+            del _active[name]
+            sys.stdout = stdout
+
+        if isinstance(result, str):
+            stats["bytes"] += _size(result)
+        elif isinstance(result, GeneratorType):
+            result = _iterate(name, key, result)
+        if svg_index is not None:
+            svg_filename = kwargs.get("svg_filename")
+            if svg_filename is None and len(args) > svg_index:
+                svg_filename = args[svg_index]
+            if svg_filename is not None and os.path.isfile(svg_filename):
+                stats["bytes"] += os.path.getsize(svg_filename)
+        return result
+
+    return wrapper
+
+
+def _patch(owner: Any, attribute: str, value: Any):
+    _patches.append((owner, attribute, owner.__dict__[attribute]))
+    setattr(owner, attribute, value)
+
+
+def enable():
+    """
+    Start recording statistics, by wrapping every public static method and internal
+    phase. Calls to `enable` can be nested, and each needs its own `disable`.
+    """
+    global _enable_count
+
+    _enable_count += 1
+    if _enable_count > 1:
+        return
+
+    for module_name, class_name in PUBLIC_CLASSES:
+        cls = getattr(
+            importlib.import_module(f".{module_name}", __package__), class_name
+        )
+        for attribute, value in list(vars(cls).items()):
+            if attribute.startswith("_") or not isinstance(value, staticmethod):
+                continue
+            name = f"{class_name}.{attribute}"
+            _patch(cls, attribute, staticmethod(_wrap(value.__func__, name, True)))
+
+    for module_name, function_name in PHASES:
+        module = importlib.import_module(f".{module_name}", __package__)
+        original = getattr(module, function_name)
+        wrapper = _wrap(original, function_name, False)
+        # Modules that imported the function by name hold their own reference to it
+        for other in list(sys.modules.values()):
+            other_name = getattr(other, "__name__", "")
+            if other_name.startswith(f"{__package__}."):
+                if other.__dict__.get(function_name) is original:
+                    _patch(other, function_name, wrapper)
+
+
+def disable():
+    """Stop recording statistics, and restore the original functions."""
+    global _enable_count
+
+    assert _enable_count > 0, "Profiling is not enabled"
+    _enable_count -= 1
+    if _enable_count > 0:
+        return
+
+    while _patches:
+        owner, attribute, original = _patches.pop()
+        setattr(owner, attribute, original)
+
+
+def is_enabled() -> bool:
+    return _enable_count > 0
+
+
+def reset():
+    """Discard all recorded statistics."""
+    _stats.clear()
+
+
+@contextmanager
+def profile(reset_stats: bool = True):
+    """
+    Context manager that records statistics for the code inside it.
+
+    Args:
+        reset_stats: Enabling this discards previously recorded statistics first.
+    """
+    if reset_stats:
+        reset()
+    enable()
+    try:
+        yield _stats
+    finally:
+        disable()
+
+
+def get_stats() -> Stats:
+    """
+    Return a copy of the recorded statistics, as `{name: {stat: value}}`, where the
+    stats are `calls`, `time`, `self_time`, `nodes` and `bytes`.
+    """
+    return {key: dict(stats) for key, stats in _stats.items()}
+
+
+def report(sort_by: str = "time", limit: Optional[int] = None) -> str:
+    """
+    Format the recorded statistics as a table, slowest first.
+
+    Args:
+        sort_by: The stat to sort by (in descending order).
+        limit: Enabling this only shows this many rows.
+    """
+    assert sort_by in STAT_NAMES, f"sort_by must be one of {STAT_NAMES}"
+
+    rows = sorted(_stats.items(), key=lambda item: -item[1][sort_by])[:limit]
+    width = max([len("name")] + [len(key) for key, _ in rows])
+    lines = [
+        f"{'name':<{width}} {'calls':>8} {'time (s)':>10} {'self (s)':>10} "
+        f"{'nodes':>10} {'bytes':>12}"
+    ]
+    for key, stats in rows:
+        lines.append(
+            f"{key:<{width}} {stats['calls']:>8} {stats['time']:>10.4f} "
+            f"{stats['self_time']:>10.4f} {stats['nodes']:>10} {stats['bytes']:>12}"
+        )
+    return "\n".join(lines)
+
+
+def _enable_from_environment():
+    """Enable profiling for the whole program if `LEETPY_PROFILE` is set."""
+    if os.environ.get(ENVIRONMENT_VARIABLE, "0") in ("", "0"):
+        return
+    enable()
+    atexit.register(lambda: print(report(), file=sys.stderr))
@@ -0,0 +1,128 @@
+"""
+Reproducible random number streams for the `create` functions and the graph layouts.
+
+Every function that generates something random takes a `seed` argument, which can be:
+
+- `None`: the global `random` module, so `random.seed(...)` makes the results
+  reproducible (but they depend on everything else that used the global stream).
+- An int, str or bytes seed: a fresh `random.Random(seed)`.
+- A `SeedSequence`: a fresh `random.Random` seeded from its state.
+- A `random.Random` instance: used as is, so one stream can be shared by several calls.
+  So is the `random` module itself (which is what `None` stands for), and anything else
+  with `random` and `getrandbits` methods.
+
+A `SeedSequence` works like NumPy's: `spawn` hands out child sequences whose streams
+are statistically independent of each other (their states are hashes of the root
+entropy and the child's position in the tree). Any child can also be rebuilt in
+isolation with `child(index)`, without replaying the streams before it:
+
+    root = SeedSequence(1234)
+    workers = root.spawn(8)                 # independent streams for 8 workers
+    case = root.child(41).child(7)          # the 7th case of the 41st batch
+    values = Array1D.create(100, seed=case)
+"""
+
+import random
+from typing import Any, List, Optional, Tuple, Union
+
+# The number of bits in the state of every spawned `random.Random`
+STATE_BITS = 256
+
+
+class SeedSequence:
+    """
+    A node in a tree of seeds: the root entropy, and the path of child indices from the
+    root (`spawn_key`).
+    """
+
+    def __init__(
+        self,
+        entropy: Union[None, int, str, bytes] = None,
+        spawn_key: Tuple[int, ...] = (),
+    ):
+        """
+        Args:
+            entropy: The root seed. (default = None, i.e. fresh entropy from the OS,
+                which is kept in `entropy` so the sequence can be recreated)
+            spawn_key: The indices of the children on the path from the root.
+        """
+        if entropy is None:
+            entropy = random.SystemRandom().getrandbits(128)
+        assert isinstance(entropy, (int, str, bytes)), "Expected an int, str or bytes"
+        self.entropy = entropy
+        self.spawn_key = tuple(spawn_key)
+        self.n_children_spawned = 0
+
+    def __repr__(self) -> str:
+        return f"SeedSequence({self.entropy!r}, spawn_key={self.spawn_key!r})"
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, SeedSequence)
+            and self.entropy == other.entropy
+            and self.spawn_key == other.spawn_key
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.entropy, self.spawn_key))
+
+    def child(self, index: int) -> "SeedSequence":
+        """The child at the given index, whether or not it was spawned yet."""
+        assert index >= 0, "Expected a non-negative child index"
+        return SeedSequence(self.entropy, self.spawn_key + (index,))
+
+    def spawn(self, n: int) -> List["SeedSequence"]:
+        """The next `n` children, which were never handed out by this sequence before."""
+        start = self.n_children_spawned
+        self.n_children_spawned += n
+        return [self.child(index) for index in range(start, start + n)]
+
+    def generate_state(self) -> int:
+        """A `STATE_BITS` bit integer derived from the entropy and the spawn key."""
+        from hashlib import blake2b
+
+        # repr tells apart 1, "1" and b"1" (and the spawn keys of different depths)
+        key = repr((self.entropy, self.spawn_key)).encode()
+        digest = blake2b(key, digest_size=STATE_BITS // 8, person=b"leetpy.rng")
+        return int.from_bytes(digest.digest(), "little")
+
+    def random(self) -> random.Random:
+        """A fresh random number generator seeded from this sequence."""
+        return random.Random(self.generate_state())
+
+
+SeedLike = Union[None, int, str, bytes, SeedSequence, random.Random]
+
+
+def _is_generator(seed: Any) -> bool:
+    return hasattr(seed, "random") and hasattr(seed, "getrandbits")
+
+
+def as_random(seed: Optional[SeedLike] = None) -> random.Random:
+    """
+    The random number generator for a `seed` argument (see the module documentation).
+    Generators are returned as is, so the result can be passed on as a seed again.
+
+    NOTE: For `None`, this returns the `random` module itself, which has the same
+    methods as a `random.Random` instance.
+    """
+    if seed is None:
+        return random
+    if isinstance(seed, SeedSequence):
+        return seed.random()
+    if _is_generator(seed):
+        return seed
+    return random.Random(seed)
+
+
+def spawn(seed: Optional[SeedLike], n: int) -> List[SeedSequence]:
+    """
+    `n` statistically independent seeds derived from a `seed` argument, such as one per
+    worker process. Seeds that aren't already a `SeedSequence` are turned into one
+    (`None` and generators by drawing the entropy from their stream).
+    """
+    if isinstance(seed, SeedSequence):
+        return seed.spawn(n)
+    if seed is None or _is_generator(seed):
+        return SeedSequence(as_random(seed).getrandbits(128)).spawn(n)
+    return SeedSequence(seed).spawn(n)
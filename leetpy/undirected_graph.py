@@ -4,28 +4,499 @@ formats to support: adjacency list, edge list, adjacency matrix
 
 # TODO: Add documentation for functions
 # TODO: Allow graphing points on a plane
-# TODO: Allow custom random functions for create()
 
+from array import array
+import io
 import math
-from random import randint, random
-import re as regex
-from typing import TypeVar, TypedDict, Optional, Dict, List, Tuple, Sequence
+from random import Random
+from typing import (
+    Iterable,
+    Iterator,
+    TypeVar,
+    TypedDict,
+    Optional,
+    Dict,
+    List,
+    Tuple,
+    Sequence,
+    TextIO,
+    Union,
+)
+
+from . import _graph_algorithms
+from .csr_graph import CSRGraph
+from .rng import SeedLike, as_random
 
 Vertex = TypeVar("Vertex")
 Edge = Tuple[Vertex, Vertex]
 Graph = Dict[Vertex, List[Vertex]]
+Weight = Union[int, float]
+WeightedGraph = Dict[Vertex, List[Tuple[Vertex, Weight]]]
+
+
+def _split_csr_graph(
+    vertices: Union[Sequence[Vertex], CSRGraph],
+    edge_list: Optional[Iterable[Edge]],
+) -> Tuple[Sequence[Vertex], Iterable[Edge]]:
+    """
+    Functions that take `vertices` and `edge_list` also accept a `CSRGraph` in place of
+    `vertices`, in which case `edge_list` may be `None`.
+    """
+    if isinstance(vertices, CSRGraph):
+        if edge_list is None:
+            edge_list = vertices.edges()
+        vertices = vertices.vertices
+    return vertices, edge_list
+
+
+def _closest_distance_and_bounds(
+    points: Sequence[Tuple[float, float]]
+) -> Tuple[float, List[float], List[float]]:
+    """
+    Find the smallest distance between two points (`inf` for fewer than two points),
+    along with the x and y bounds of all points and the origin.
+
+    Uses the randomized incremental grid algorithm, in expected O(n) time: the points
+    are inserted in a random order into a grid whose cells are as wide as the closest
+    distance so far, so only the 9 cells around a new point need to be checked. The
+    grid is rebuilt whenever the closest distance shrinks, which becomes increasingly
+    unlikely as more points are inserted.
+    """
+    # A fixed seed keeps the result deterministic and leaves the global state alone
+    order = list(points)
+    Random(0).shuffle(order)
+
+    closest = math.inf
+    grid: Dict[Tuple[int, int], List[Tuple[float, float]]] = {}
+
+    def cell_of(point: Tuple[float, float]) -> Tuple[int, int]:
+        return (math.floor(point[0] / closest), math.floor(point[1] / closest))
+
+    def rebuild_grid(count: int):
+        grid.clear()
+        for point in order[:count]:
+            grid.setdefault(cell_of(point), []).append(point)
+
+    x_bounds = [0, 0]
+    y_bounds = [0, 0]
+    for i, point in enumerate(order):
+        x, y = point
+        x_bounds[0] = min(x_bounds[0], x)
+        x_bounds[1] = max(x_bounds[1], x)
+        y_bounds[0] = min(y_bounds[0], y)
+        y_bounds[1] = max(y_bounds[1], y)
+
+        if i == 0 or closest == 0:
+            continue
+        if i == 1:
+            closest = math.dist(order[0], point)
+            if closest > 0:
+                rebuild_grid(2)
+            continue
+
+        cx, cy = cell_of(point)
+        nearest = closest
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for other in grid.get((cx + dx, cy + dy), ()):
+                    nearest = min(nearest, math.dist(point, other))
+
+        if nearest < closest:
+            closest = nearest
+            if closest > 0:
+                rebuild_grid(i + 1)
+        else:
+            grid.setdefault((cx, cy), []).append(point)
+
+    return closest, x_bounds, y_bounds
+
+
+def _graph_from_edge_array(n: int, edges: Sequence[int]) -> Graph[int]:
+    """Adjacency lists of the vertices `0 ... n - 1` from a flat array of endpoints."""
+    graph: Graph = {v: [] for v in range(n)}
+    for i in range(0, len(edges), 2):
+        u, v = edges[i], edges[i + 1]
+        graph[u].append(v)
+        graph[v].append(u)
+    return graph
+
+
+def _write_svg(
+    vertices: Union[Sequence[Vertex], CSRGraph],
+    edge_list: Optional[Iterable[Tuple[Vertex, Vertex]]],
+    coords: Dict[Vertex, Tuple[float, float]],
+    svg_filename: str,
+    directed: bool = False,
+):
+    """
+    Save a drawing of the graph with the given node coordinates as an SVG file. Edges of
+    directed graphs end in an arrowhead at their second vertex.
+    """
+    import re as regex
+
+    vertices, edge_list = _split_csr_graph(vertices, edge_list)
+
+    text_g = []
+    node_g = []
+    edge_g = []
+
+    closest, x_bounds, y_bounds = _closest_distance_and_bounds(
+        [coords[v] for v in vertices]
+    )
+    NODE_RADIUS = min(999, closest / 4)
+    FONT_HEIGHT = NODE_RADIUS
+    CHAR_WIDTH = FONT_HEIGHT / 2
+
+    def get_centered_text_svg(text: str, cx: float, cy: float) -> str:
+        baseline_x = cx - (CHAR_WIDTH * (len(text) / 2))
+        baseline_y = cy + (FONT_HEIGHT / 2) * 0.8
+        return f"""
+        <text x="{baseline_x}" y="{baseline_y}" style="font-family: monospace; font-size: {FONT_HEIGHT};"
+        >{text}</text>
+        """
+
+    def add_edge(v1: Vertex, v2: Vertex):
+        x1, y1 = coords[v1]
+        x2, y2 = coords[v2]
+        marker = ""
+        if directed:
+            # End the line at the border of the target node, where the arrow goes
+            length = math.hypot(x2 - x1, y2 - y1)
+            if length > NODE_RADIUS:
+                x2 -= (x2 - x1) * NODE_RADIUS / length
+                y2 -= (y2 - y1) * NODE_RADIUS / length
+            marker = ' marker-end="url(#arrow)"'
+        edge_g.append(
+            f"""<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" stroke="black" stroke-width="{NODE_RADIUS / 10}"{marker}></line>"""
+        )
+
+    def add_node(vertex: Vertex):
+        x, y = coords[vertex]
+        node_g.append(
+            f"""<ellipse cx="{x}" cy="{y}" rx="{NODE_RADIUS}" ry="{NODE_RADIUS}" fill="white" stroke="black" stroke-width="{NODE_RADIUS / 10}"></ellipse>"""
+        )
+        text_g.append(get_centered_text_svg(str(vertex), x, y))
+
+    for v in vertices:
+        add_node(v)
+    for edge in edge_list:
+        # Weighted edges are drawn without their weights
+        add_edge(edge[0], edge[1])
+
+    # Arrowheads, scaled with the stroke width of the edges
+    ARROW_DEFS = """
+      <defs>
+        <marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5"
+          markerWidth="6" markerHeight="6" orient="auto-start-reverse">
+          <path d="M 0 0 L 10 5 L 0 10 z"></path>
+        </marker>
+      </defs>
+    """
+
+    SVG_WIDTH = x_bounds[1] - x_bounds[0] + (4 * NODE_RADIUS)
+    SVG_HEIGHT = y_bounds[1] - y_bounds[0] + (4 * NODE_RADIUS)
+
+    code = f"""
+    <svg
+    version="1.1"
+    viewBox="{x_bounds[0] - 2*NODE_RADIUS} {y_bounds[0] - 2*NODE_RADIUS} {SVG_WIDTH} {SVG_HEIGHT}"
+    xmlns="http://www.w3.org/2000/svg">
+      {ARROW_DEFS if directed else ''}
+      <g>{''.join(edge_g)}</g>
+      <g>{''.join(node_g)}</g>
+      <g>{''.join(text_g)}</g>
+    </svg>
+    """
+
+    # Remove newlines and leading spaces in lines (for compression)
+    code = regex.sub(r"\s*(\n\s*)+", " ", code)
+
+    with open(svg_filename, "w") as f:
+        f.write(code)
+
+
+def _load_position_cache(
+    filename: str, vertices: Sequence[Vertex]
+) -> Dict[Vertex, Tuple[float, float]]:
+    """
+    The cached positions of the given vertices. The cache is a JSON object that maps
+    `repr(vertex)` to `[x, y]`; a missing or unreadable cache is treated as empty.
+    """
+    import json
+
+    try:
+        with open(filename) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    positions = {}
+    for v in vertices:
+        key = repr(v)
+        if key in cache:
+            positions[v] = tuple(cache[key])
+    return positions
+
+
+def _warm_start_positions(
+    vertices: Sequence[Vertex],
+    multilevel: bool,
+    initial_positions: Optional[Dict[Vertex, Tuple[float, float]]],
+    position_cache: Optional[str],
+) -> Optional[Dict[Vertex, Tuple[float, float]]]:
+    """
+    The starting positions given to `draw`: `initial_positions`, plus the cached
+    positions of the other vertices.
+    """
+    if initial_positions is None and position_cache is None:
+        return None
+    if not multilevel:
+        raise ValueError(
+            "initial_positions and position_cache need multilevel=True (the plain "
+            "layout moves every vertex far from where it starts)"
+        )
+    if position_cache is None:
+        return initial_positions
+    cached = _load_position_cache(position_cache, vertices)
+    return {**cached, **(initial_positions or {})}
+
+
+def _save_position_cache(filename: str, coords: Dict[Vertex, Tuple[float, float]]):
+    import json
+
+    with open(filename, "w") as f:
+        json.dump({repr(v): list(pos) for v, pos in coords.items()}, f)
+
+
+def _layout_coords(
+    vertices: Sequence[Vertex],
+    graph: Union[Graph, CSRGraph],
+    theta: Optional[float] = None,
+    multilevel: bool = False,
+    area: Optional[float] = None,
+    initial_positions: Optional[Dict[Vertex, Tuple[float, float]]] = None,
+    split_components: bool = False,
+    workers: Optional[int] = None,
+    verbose: bool = True,
+    seed: SeedLike = None,
+) -> Dict[Vertex, Tuple[float, float]]:
+    """Lay out an undirected graph with a force-directed algorithm (see `draw`)."""
+    if split_components:
+        from ._component_layout import layout_components
+
+        return layout_components(
+            vertices,
+            graph,
+            theta,
+            multilevel,
+            area,
+            initial_positions,
+            workers,
+            seed,
+            verbose,
+        )
+
+    from ._force_layout import (
+        WARM_START_STEP,
+        L,
+        create_embedding,
+        refine_layout,
+        run_layout,
+        run_multilevel_layout,
+    )
+
+    rng = as_random(seed)
+    embeds = create_embedding(vertices, initial_positions, graph, rng)
+
+    ITERATION_LIMIT = 500
+    EPSILON = 0.01
+    TOLERANCE = 0.05
+
+    if multilevel and initial_positions and vertices:
+        # A warm start is already close: only refine the graph itself
+        K = L if area is None else math.sqrt(area / len(vertices))
+        iterations = refine_layout(
+            vertices,
+            graph,
+            embeds,
+            K,
+            ITERATION_LIMIT,
+            TOLERANCE,
+            theta,
+            initial_step=WARM_START_STEP * K,
+        )
+        if verbose:
+            print(f"Force evaluations = {iterations}")
+    elif multilevel:
+        iterations = run_multilevel_layout(
+            vertices, graph, embeds, ITERATION_LIMIT, TOLERANCE, theta, area, seed=rng
+        )
+        if verbose:
+            print(f"Force evaluations = {iterations}")
+    else:
+        iteration, F = run_layout(
+            vertices, graph, embeds, ITERATION_LIMIT, EPSILON, theta
+        )
+        if verbose:
+            print(f"Iterations = {iteration}")
+            print(f"Min F = {min(abs(f) for f in F.values())}")
+            print(f"Max F = {max(abs(f) for f in F.values())}")
+
+    return {v: (embeds[v].pos.real, embeds[v].pos.imag) for v in vertices}
 
 
 class UndirectedGraph:
+    @staticmethod
+    def create(
+        n: int,
+        p: Optional[float] = None,
+        m: Optional[int] = None,
+        seed: SeedLike = None,
+        as_edge_array: bool = False,
+    ) -> Union[Graph[int], array]:
+        """
+        Create a random graph on the vertices `0 ... n - 1`, where either every edge is
+        present with probability `p` (G(n, p)), or exactly `m` distinct edges are chosen
+        uniformly (G(n, m)). Runs in O(n + m) time.
+
+        Args:
+            p: The probability of any edge being present.
+            m: The exact number of edges. Overrides `p`.
+            seed: The seed for the random number generator: an int, a str, a
+                `SeedSequence` or a `random.Random` instance (see `leetpy.rng`).
+                (default = None, i.e. the global `random` module)
+            as_edge_array: Enabling this returns a flat array of edge endpoints
+                `[u0, v0, u1, v1, ...]` instead of adjacency lists. (See
+                `CSRGraph.from_edge_array`.)
+        """
+        from ._graph_generators import random_graph
+
+        assert p is not None or m is not None, "Either p or m is required"
+        edges = random_graph(n, as_random(seed), p, m)
+        return edges if as_edge_array else _graph_from_edge_array(n, edges)
+
+    @staticmethod
+    def create_bipartite(
+        n1: int,
+        n2: int,
+        p: Optional[float] = None,
+        m: Optional[int] = None,
+        seed: SeedLike = None,
+        as_edge_array: bool = False,
+    ) -> Union[Graph[int], array]:
+        """
+        Create a random bipartite graph between the vertices `0 ... n1 - 1` and
+        `n1 ... n1 + n2 - 1`. Runs in O(n1 + n2 + m) time.
+
+        Args:
+            p: The probability of any edge between the two sides being present. `p = 1`
+                gives the complete bipartite graph.
+            m: The exact number of edges. Overrides `p`.
+            seed: The seed for the random number generator: an int, a str, a
+                `SeedSequence` or a `random.Random` instance (see `leetpy.rng`).
+                (default = None, i.e. the global `random` module)
+            as_edge_array: Enabling this returns a flat array of edge endpoints instead
+                of adjacency lists.
+        """
+        from ._graph_generators import random_bipartite_graph
+
+        assert p is not None or m is not None, "Either p or m is required"
+        edges = random_bipartite_graph(n1, n2, as_random(seed), p, m)
+        return edges if as_edge_array else _graph_from_edge_array(n1 + n2, edges)
+
+    @staticmethod
+    def create_connected(
+        n: int,
+        m: int,
+        seed: SeedLike = None,
+        as_edge_array: bool = False,
+    ) -> Union[Graph[int], array]:
+        """
+        Create a random connected graph on the vertices `0 ... n - 1` with exactly `m`
+        edges (a random spanning tree, plus random edges). Runs in O(n + m log m) time.
+
+        Args:
+            m: The number of edges, at least `n - 1`.
+            seed: The seed for the random number generator: an int, a str, a
+                `SeedSequence` or a `random.Random` instance (see `leetpy.rng`).
+                (default = None, i.e. the global `random` module)
+            as_edge_array: Enabling this returns a flat array of edge endpoints instead
+                of adjacency lists.
+        """
+        from ._graph_generators import random_connected_graph
+
+        edges = random_connected_graph(n, m, as_random(seed))
+        return edges if as_edge_array else _graph_from_edge_array(n, edges)
+
+    @staticmethod
+    def create_grid(
+        rows: int, cols: int, as_edge_array: bool = False
+    ) -> Union[Graph[int], array]:
+        """
+        Create a `rows` x `cols` grid graph, where the vertex in row `r` and column `c`
+        is `r * cols + c`.
+
+        Args:
+            as_edge_array: Enabling this returns a flat array of edge endpoints instead
+                of adjacency lists.
+        """
+        from ._graph_generators import grid_graph
+
+        edges = grid_graph(rows, cols)
+        return edges if as_edge_array else _graph_from_edge_array(rows * cols, edges)
+
+    @staticmethod
+    def create_tree(
+        n: int, seed: SeedLike = None, as_edge_array: bool = False
+    ) -> Union[Graph[int], array]:
+        """
+        Create a uniformly random tree on the vertices `0 ... n - 1`, from a random
+        Prüfer sequence. Runs in O(n) time.
+
+        Args:
+            seed: The seed for the random number generator: an int, a str, a
+                `SeedSequence` or a `random.Random` instance (see `leetpy.rng`).
+                (default = None, i.e. the global `random` module)
+            as_edge_array: Enabling this returns a flat array of edge endpoints instead
+                of adjacency lists.
+        """
+        from ._graph_generators import random_tree
+
+        edges = random_tree(n, as_random(seed))
+        return edges if as_edge_array else _graph_from_edge_array(n, edges)
+
     @staticmethod
     def create_from_edge_list(
-        vertices: Sequence[Vertex], edge_list: Sequence[Tuple[Vertex, Vertex]]
-    ) -> Graph[Vertex]:
+        vertices: Sequence[Vertex],
+        edge_list: Sequence[Tuple[Vertex, Vertex]],
+        compact: bool = False,
+        weighted: bool = False,
+    ) -> Union[Graph[Vertex], WeightedGraph[Vertex], CSRGraph]:
+        """
+        Create the adjacency lists of a graph from its vertices and edges.
+
+        Args:
+            compact: Enabling this returns a `CSRGraph`, which stores the adjacency lists
+                in two flat integer arrays and takes far less memory for large graphs.
+            weighted: Enabling this reads every edge as `(u, v, weight)`, and stores
+                `(neighbour, weight)` pairs in the adjacency lists.
+        """
+        assert not (compact and weighted), "Weighted graphs can't be compact"
+
+        if compact:
+            return CSRGraph.from_edge_list(vertices, edge_list)
+
         graph: Graph = {}
 
         for vertex in vertices:
             graph[vertex] = []
 
+        if weighted:
+            for v1, v2, weight in edge_list:
+                graph[v1].append((v2, weight))
+                graph[v2].append((v1, weight))
+            return graph
+
         for edge in edge_list:
             v1, v2 = edge
             graph[v1].append(v2)
@@ -33,136 +504,464 @@ class UndirectedGraph:
 
         return graph
 
+    @staticmethod
+    def get_connected_components(graph: Graph) -> List[List[Vertex]]:
+        """
+        Return the vertices of every connected component, using a union-find structure
+        (in near-linear time).
+
+        Components are ordered by their first vertex in the graph, and vertices keep
+        their order within a component.
+        """
+        return _graph_algorithms.connected_components(graph)
+
+    @staticmethod
+    def is_bipartite(graph: Graph) -> bool:
+        """
+        Check whether the vertices of the graph can be split into two sets, such that
+        every edge connects a vertex from one set with a vertex from the other.
+        """
+        return _graph_algorithms.is_bipartite(graph)
+
+    @staticmethod
+    def is_connected(graph: Graph) -> bool:
+        """Check whether every vertex can be reached from every other vertex."""
+        return _graph_algorithms.union_edges(graph).count <= 1
+
+    @staticmethod
+    def is_cyclic(graph: Graph) -> bool:
+        """
+        Check whether the graph contains a cycle. Self-loops and parallel edges count as
+        cycles.
+        """
+        return _graph_algorithms.is_cyclic(graph)
+
+    @staticmethod
+    def get_shortest_distances(
+        graph: Union[Graph, WeightedGraph],
+        source: Vertex,
+        weighted: Optional[bool] = None,
+    ) -> Dict[Vertex, Weight]:
+        """
+        Return the shortest distance from `source` to every vertex it can reach.
+
+        The algorithm depends on the edge weights: a plain BFS for unweighted graphs (or
+        graphs whose edges all have the same weight), a 0-1 BFS for graphs with two
+        distinct weights where one of them is 0, and Dijkstra's algorithm otherwise.
+
+        Args:
+            weighted: Whether the adjacency lists hold `(neighbour, weight)` pairs, as
+                made by `create_from_edge_list(weighted=True)`. (default = None, i.e.
+                detected from the first pair of a vertex and a number)
+
+        Raises `ValueError` if the graph has a negative edge weight.
+        """
+        if weighted is None:
+            weighted = _graph_algorithms.is_weighted(graph)
+        method, weight = _graph_algorithms.classify_weights(graph, weighted)
+        if method == "bfs":
+            return _graph_algorithms.bfs_shortest_paths(
+                graph, source, weight, weighted=weighted
+            )[0]
+        elif method == "0-1 bfs":
+            return _graph_algorithms.zero_one_bfs_shortest_paths(graph, source)[0]
+        else:
+            return _graph_algorithms.dijkstra_shortest_paths(graph, source)[0]
+
+    @staticmethod
+    def get_shortest_path(
+        graph: Union[Graph, WeightedGraph],
+        source: Vertex,
+        target: Vertex,
+        weighted: Optional[bool] = None,
+    ) -> Tuple[Weight, List[Vertex]]:
+        """
+        Return the shortest distance from `source` to `target`, along with the vertices
+        of a shortest path between them (both included). If `target` can't be reached,
+        returns `(math.inf, [])`.
+
+        Searches stop as soon as `target` is reached. General weighted graphs are
+        searched from both ends at once (bidirectional Dijkstra), which usually
+        explores far fewer vertices than a single search.
+
+        Args:
+            weighted: Whether the adjacency lists hold `(neighbour, weight)` pairs (see
+                `get_shortest_distances`).
+
+        Raises `ValueError` if the graph has a negative edge weight.
+        """
+        if weighted is None:
+            weighted = _graph_algorithms.is_weighted(graph)
+        method, weight = _graph_algorithms.classify_weights(graph, weighted)
+        if method == "dijkstra":
+            return _graph_algorithms.bidirectional_dijkstra(graph, source, target)
+
+        if method == "bfs":
+            dist, parent = _graph_algorithms.bfs_shortest_paths(
+                graph, source, weight, target, weighted
+            )
+        else:
+            dist, parent = _graph_algorithms.zero_one_bfs_shortest_paths(
+                graph, source, target
+            )
+        if target not in dist:
+            return math.inf, []
+        return dist[target], _graph_algorithms.reconstruct_path(parent, target)
+
+    @staticmethod
+    def load_edge_list(
+        filename: str,
+        fmt: str = "auto",
+        n: Optional[int] = None,
+        chunk_bytes: int = 1 << 22,
+        header: bool = False,
+    ) -> CSRGraph:
+        """
+        Load a graph on the vertices `0 ... n - 1` from a text file of edges.
+
+        The file is streamed twice in chunks of `chunk_bytes`, building the graph
+        directly in its compact form, so peak memory stays close to the size of the
+        resulting `CSRGraph`.
+
+        Args:
+            fmt: "text" for one edge per line, as "u v" or "u,v" (extra columns, and
+                lines that don't start with an integer, like "#" comments, are ignored).
+                "leetcode" for a `[[u,v],...]` list, optionally preceded by the number
+                of vertices. "auto" picks one of the two. (default = "auto")
+            n: The minimum number of vertices. (default = None, i.e. one more than the
+                largest vertex in the file)
+            header: Enabling this skips the first line of a "text" file that isn't a
+                comment, such as an "n m" header, and uses its first number as the
+                number of vertices (if `n` isn't given). Without it, a numeric header is
+                read as an edge.
+        """
+        from ._edge_list_io import (
+            LEETCODE_EDGE_REGEX,
+            TEXT_EDGE_REGEX,
+            detect_text_format,
+            iter_text_chunks,
+            load_csr_graph,
+            read_leetcode_header,
+            read_text_header,
+        )
+
+        if fmt == "auto":
+            with open(filename, "rb") as fp:
+                fmt = detect_text_format(fp)
+
+        if fmt == "leetcode":
+            return load_csr_graph(
+                filename,
+                lambda fp: iter_text_chunks(fp, LEETCODE_EDGE_REGEX, b"]", chunk_bytes),
+                n,
+                read_leetcode_header,
+            )
+        elif fmt == "text":
+            return load_csr_graph(
+                filename,
+                lambda fp: iter_text_chunks(fp, TEXT_EDGE_REGEX, b"\n", chunk_bytes),
+                n,
+                read_text_header if header else None,
+            )
+        else:
+            raise ValueError(f"Unknown edge list format: {fmt!r}")
+
+    @staticmethod
+    def load_binary_edge_list(
+        filename: str,
+        typecode: str = "i",
+        n: Optional[int] = None,
+        chunk_edges: int = 1 << 20,
+    ) -> CSRGraph:
+        """
+        Load a graph on the vertices `0 ... n - 1` from a file of packed integers
+        `u0 v0 u1 v1 ...`, in native byte order (as written by `array.tofile`).
+
+        Args:
+            typecode: The `array` typecode of the integers, such as "i" for 32-bit or "q"
+                for 64-bit. (default = "i")
+            n: The minimum number of vertices. (default = None, i.e. one more than the
+                largest vertex in the file)
+            chunk_edges: The number of edges read at a time.
+        """
+        from ._edge_list_io import iter_binary_chunks, load_csr_graph
+
+        return load_csr_graph(
+            filename, lambda fp: iter_binary_chunks(fp, typecode, chunk_edges), n
+        )
+
     @staticmethod
     def print(graph: Graph):
         for vertex in graph:
             edge_repr = "[" + ", ".join(map(str, graph[vertex])) + "]"
             print(f"{vertex}: {edge_repr}")
 
+    @staticmethod
+    def export_as_code(
+        vertices: Union[Sequence[Vertex], CSRGraph],
+        edge_list: Optional[Sequence[Tuple[Vertex, Vertex]]],
+        fp: Optional[TextIO] = None,
+        indent: int = 4,
+        function_name: str = "get_graph",
+        type_hints: bool = True,
+        table_threshold: int = 1000,
+        weighted: bool = False,
+    ) -> Optional[str]:
+        """
+        Generate code for a Python3 function that returns the adjacency lists of the
+        given graph (as `create_from_edge_list` would).
+
+        Args:
+            vertices: The vertices of the graph, or a `CSRGraph` (in which case
+                `edge_list` can be `None`).
+            fp: A file-like object that the code is streamed to. (default = None, i.e.
+                return the code as a string)
+            indent: The number of spaces to be used while indenting the function body.
+            function_name: The name of the function in the generated code. (default =
+                "get_graph")
+            type_hints: When enabled, the function code will have a Python3 return type
+                declaration.
+            table_threshold: Graphs with more edges than this store them in a compact
+                string constant (a "table") next to the function, instead of a list
+                literal, so that huge fixtures compile quickly.
+            weighted: Enabling this reads every edge as `(u, v, weight)`, and the code
+                returns `(neighbour, weight)` pairs in the adjacency lists (like
+                `create_from_edge_list`). Weights must be numbers if the graph has more
+                than `table_threshold` edges.
+        """
+        from ._graph_export import write_code
+
+        assert not (
+            weighted and isinstance(vertices, CSRGraph)
+        ), "Weighted graphs can't be compact"
+
+        if isinstance(vertices, CSRGraph):
+            edge_count = vertices.edge_count()
+        else:
+            if not hasattr(edge_list, "__len__"):
+                edge_list = list(edge_list)
+            edge_count = len(edge_list)
+        vertices, edge_list = _split_csr_graph(vertices, edge_list)
+
+        out = io.StringIO() if fp is None else fp
+        write_code(
+            out,
+            vertices,
+            edge_list,
+            edge_count,
+            indent,
+            function_name,
+            type_hints,
+            table_threshold,
+            weighted,
+        )
+        return out.getvalue() if fp is None else None
+
+    @staticmethod
+    def export_as_leetcode(
+        vertices: Union[Sequence[Vertex], CSRGraph],
+        edge_list: Optional[Sequence[Tuple[Vertex, Vertex]]],
+        fp: Optional[TextIO] = None,
+        adjacency: bool = False,
+    ) -> Optional[str]:
+        """
+        Export the graph as LeetCode-style test input, with every vertex replaced by
+        its index in `vertices`. By default, this is the number of vertices on one line
+        and the edges `[[u,v],...]` on the next (weighted edges become `[u,v,w]`), which
+        `load_edge_list` can read back.
+
+        Args:
+            vertices: The vertices of the graph, or a `CSRGraph` (in which case
+                `edge_list` can be `None`).
+            fp: A file-like object that the output is streamed to. (default = None,
+                i.e. return the output as a string)
+            adjacency: Enabling this writes adjacency lists instead: a single
+                `[[...],...]` list whose i'th element holds the neighbours of vertex i
+                (as `[neighbour,weight]` pairs if the edges are weighted).
+        """
+        from ._graph_export import write_leetcode_adjacency, write_leetcode_edges
+
+        weighted = False
+        if isinstance(vertices, CSRGraph):
+            graph = vertices
+        elif adjacency:
+            edge_list = list(edge_list)
+            weighted = bool(edge_list) and len(edge_list[0]) == 3
+            graph = UndirectedGraph.create_from_edge_list(
+                vertices,
+                [tuple(edge) for edge in edge_list],
+                weighted=weighted,
+            )
+        vertices, edge_list = _split_csr_graph(vertices, edge_list)
+
+        out = io.StringIO() if fp is None else fp
+        if adjacency:
+            write_leetcode_adjacency(out, vertices, graph, weighted)
+        else:
+            write_leetcode_edges(out, vertices, edge_list)
+        return out.getvalue() if fp is None else None
+
+    @staticmethod
+    def travel_bfs(graph: Graph, source: Vertex) -> Iterator[Vertex]:
+        """
+        Generator function that yields the vertices reachable from `source` in a
+        breadth-first order.
+        """
+        return _graph_algorithms.travel_bfs(graph, source)
+
+    @staticmethod
+    def travel_dfs(graph: Graph, source: Vertex) -> Iterator[Vertex]:
+        """
+        Generator function that yields the vertices reachable from `source` in a
+        depth-first (pre)order.
+
+        NOTE: The traversal is iterative, so long paths don't hit the recursion limit.
+        """
+        return _graph_algorithms.travel_dfs(graph, source)
+
     @staticmethod
     def save_as_svg(
-        vertices: Sequence[Vertex],
-        edge_list: Sequence[Tuple[Vertex, Vertex]],
+        vertices: Union[Sequence[Vertex], CSRGraph],
+        edge_list: Optional[Iterable[Tuple[Vertex, Vertex]]],
         coords: Dict[Vertex, Tuple[float, float]],
         svg_filename: str,
     ):
-        text_g = []
-        node_g = []
-        edge_g = []
-
-        NODE_RADIUS = 999
-        for u in vertices:
-            for v in vertices:
-                if u == v:
-                    continue
-                NODE_RADIUS = min(
-                    NODE_RADIUS,
-                    math.hypot(coords[u][0] - coords[v][0], coords[u][1] - coords[v][1])
-                    / 4,
-                )
-        FONT_HEIGHT = NODE_RADIUS
-        CHAR_WIDTH = FONT_HEIGHT / 2
-
-        def get_centered_text_svg(text: str, cx: float, cy: float) -> str:
-            baseline_x = cx - (CHAR_WIDTH * (len(text) / 2))
-            baseline_y = cy + (FONT_HEIGHT / 2) * 0.8
-            return f"""
-            <text x="{baseline_x}" y="{baseline_y}" style="font-family: monospace; font-size: {FONT_HEIGHT};"
-            >{text}</text>
-            """
-
-        def add_edge(v1: Vertex, v2: Vertex):
-            x1, y1 = coords[v1]
-            x2, y2 = coords[v2]
-            edge_g.append(
-                f"""<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" stroke="black" stroke-width="{NODE_RADIUS / 10}"></line>"""
-            )
-
-        def add_node(vertex: Vertex):
-            x, y = coords[vertex]
-            node_g.append(
-                f"""<ellipse cx="{x}" cy="{y}" rx="{NODE_RADIUS}" ry="{NODE_RADIUS}" fill="white" stroke="black" stroke-width="{NODE_RADIUS / 10}"></ellipse>"""
-            )
-            text_g.append(get_centered_text_svg(str(vertex), x, y))
-
-        for v in vertices:
-            add_node(v)
-        for s, t in edge_list:
-            add_edge(s, t)
-
-        x_bounds = [0, 0]
-        y_bounds = [0, 0]
-        for v in vertices:
-            x, y = coords[v]
-            x_bounds[0] = min(x_bounds[0], x)
-            x_bounds[1] = max(x_bounds[1], x)
-            y_bounds[0] = min(y_bounds[0], y)
-            y_bounds[1] = max(y_bounds[1], y)
-        SVG_WIDTH = x_bounds[1] - x_bounds[0] + (4 * NODE_RADIUS)
-        SVG_HEIGHT = y_bounds[1] - y_bounds[0] + (4 * NODE_RADIUS)
-
-        code = f"""
-        <svg
-        version="1.1"
-        viewBox="{x_bounds[0] - 2*NODE_RADIUS} {y_bounds[0] - 2*NODE_RADIUS} {SVG_WIDTH} {SVG_HEIGHT}"
-        xmlns="http://www.w3.org/2000/svg">
-          <g>{''.join(edge_g)}</g>
-          <g>{''.join(node_g)}</g>
-          <g>{''.join(text_g)}</g>
-        </svg>
-        """
-
-        # Remove newlines and leading spaces in lines (for compression)
-        code = regex.sub(r"\s*(\n\s*)+", " ", code)
-
-        with open(svg_filename, "w") as f:
-            f.write(code)
+        _write_svg(vertices, edge_list, coords, svg_filename)
 
     @staticmethod
     def draw(
-        vertices: Sequence[Vertex],
-        edge_list: Sequence[Tuple[Vertex, Vertex]],
+        vertices: Union[Sequence[Vertex], CSRGraph],
+        edge_list: Optional[Sequence[Tuple[Vertex, Vertex]]],
         svg_filename: str,
-    ):
-        from ._force_layout import apply_forces, calculate_forces, create_embedding
-
-        G = UndirectedGraph.create_from_edge_list(vertices, edge_list)
-
-        embeds = create_embedding(vertices)
-
-        ITERATION_LIMIT = 500
-        EPSILON = 0.01
+        theta: Optional[float] = None,
+        multilevel: bool = False,
+        area: Optional[float] = None,
+        initial_positions: Optional[Dict[Vertex, Tuple[float, float]]] = None,
+        position_cache: Optional[str] = None,
+        split_components: bool = False,
+        workers: Optional[int] = None,
+        seed: SeedLike = None,
+    ) -> Dict[Vertex, Tuple[float, float]]:
+        """
+        Lay out the graph with a force-directed algorithm and save it as an SVG file.
+        Returns the coordinates of the vertices.
+
+        Args:
+            vertices: The vertices of the graph, or a `CSRGraph` (in which case
+                `edge_list` can be `None`).
+            theta: Enabling this approximates repulsive forces with a Barnes-Hut quadtree,
+                which is much faster for large graphs. Smaller values are more accurate;
+                0.5 to 1.0 is a sensible range. (default = None, i.e. exact forces)
+            multilevel: Enabling this lays out a series of coarsened versions of the
+                graph first, refining the positions level by level with an adaptive
+                step length. Large graphs converge in far fewer iterations.
+            area: The area of the drawing in multilevel mode, which sets the ideal edge
+                length of every level. (default = None, i.e. chosen from the graph size)
+            initial_positions: Starting coordinates for some (or all) of the vertices,
+                such as the result of a previous call. Vertices without one start near
+                their neighbours, so a slightly changed graph converges quickly and
+                keeps its shape. This needs `multilevel` (a `ValueError` is raised
+                otherwise): the plain layout doesn't settle, so it would move every
+                vertex far from where it started.
+            position_cache: The path of a JSON file that stores the coordinates of the
+                vertices between calls (keyed by `repr(vertex)`), used as the initial
+                positions of vertices missing from `initial_positions`. This also
+                needs `multilevel`.
+            split_components: Enabling this lays out every connected component on its
+                own and packs the drawings next to each other, which is much faster for
+                graphs with many components (like forests).
+            workers: The number of worker processes that lay out components in
+                parallel when `split_components` is enabled. (default = None, i.e. lay
+                them out in this process)
+            seed: The seed for the random starting positions (see `leetpy.rng`). With
+                `split_components`, every component gets its own spawned stream, so the
+                drawing doesn't depend on `workers`.
+
+        NOTE: Exact forces are computed with NumPy when it is installed.
+        """
+        if isinstance(vertices, CSRGraph):
+            G = vertices
+            vertices, edge_list = _split_csr_graph(G, edge_list)
+        else:
+            G = UndirectedGraph.create_from_edge_list(
+                vertices, [(edge[0], edge[1]) for edge in edge_list]
+            )
 
-        iteration = 0
-        F = calculate_forces(vertices, G, embeds)
-        for iteration in range(ITERATION_LIMIT):
-            apply_forces(vertices, G, embeds, F)
-            F = calculate_forces(vertices, G, embeds)
+        initial_positions = _warm_start_positions(
+            vertices, multilevel, initial_positions, position_cache
+        )
+
+        coords = _layout_coords(
+            vertices,
+            G,
+            theta,
+            multilevel,
+            area,
+            initial_positions,
+            split_components,
+            workers,
+            seed=seed,
+        )
+        UndirectedGraph.save_as_svg(vertices, edge_list, coords, svg_filename)
 
-            if max(abs(f) for f in F.values()) < EPSILON:
-                break
+        if position_cache is not None:
+            _save_position_cache(position_cache, coords)
 
-        coords = {v: (embeds[v].pos.real, embeds[v].pos.imag) for v in vertices}
-        print(f"Iterations = {iteration}")
-        print(f"Min F = {min(abs(f) for f in F.values())}")
-        print(f"Max F = {max(abs(f) for f in F.values())}")
-        UndirectedGraph.save_as_svg(vertices, edge_list, coords, svg_filename)
+        return coords
 
     @staticmethod
     def draw_steps(
         vertices: Sequence[Vertex],
         edge_list: Sequence[Tuple[Vertex, Vertex]],
         svg_filename: str,
+        every: Optional[int] = None,
+        iteration_limit: int = 500,
+        frame_duration: float = 0.1,
+        seed: SeedLike = None,
     ):
+        """
+        Lay out the graph step by step. By default, this asks how many iterations to
+        run next, and rewrites the SVG file after each batch.
+
+        Args:
+            every: Enabling this runs the layout without asking, records the positions
+                of the vertices every `every` iterations, and saves all of them as a
+                single animation: an SVG file animated with SMIL, or an HTML player with
+                a frame slider if `svg_filename` ends with ".html". Both store the
+                changes between frames rather than a full drawing per frame.
+            iteration_limit: The maximum number of iterations to record.
+            frame_duration: The number of seconds every recorded frame is shown for.
+            seed: The seed for the random starting positions (see `leetpy.rng`).
+        """
         from ._force_layout import apply_forces, calculate_forces, create_embedding
 
         G = UndirectedGraph.create_from_edge_list(vertices, edge_list)
 
-        embeds = create_embedding(vertices)
+        embeds = create_embedding(vertices, seed=seed)
+
+        if every is not None:
+            from ._force_layout import run_layout
+            from ._layout_animation import save_animation
+
+            assert every >= 1, "Expected a positive number of iterations per frame"
+            EPSILON = 0.01
+
+            frames = []
+            run_layout(
+                vertices,
+                G,
+                embeds,
+                iteration_limit,
+                EPSILON,
+                frames=frames,
+                frame_every=every,
+            )
+            save_animation(vertices, edge_list, frames, svg_filename, frame_duration)
+            return
 
         # Initial computation
         coords = {v: (embeds[v].pos.real, embeds[v].pos.imag) for v in vertices}
-        UndirectedGraph.save_as_svg(vertices, edge_list, coords)
+        UndirectedGraph.save_as_svg(vertices, edge_list, coords, svg_filename)
 
         F = calculate_forces(vertices, G, embeds)
 
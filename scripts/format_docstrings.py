@@ -1,8 +1,19 @@
-"""Formats the docstrings in a file."""
+"""
+Formats the docstrings in Python files (run with `--help` for the options).
 
+Paths can be files or directories (searched for `.py` files). Files are formatted in
+parallel, and files that haven't changed since they were last found to be formatted are
+skipped, using a cache of content hashes (`.format_docstrings_cache` in the current
+directory, by default). With `--check`, nothing is written and the exit status is 1 if any
+file would change, which suits a pre-commit hook.
+"""
+
+import argparse
 import ast
-from rich import prompt
-from typing import List, Tuple
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
 import sys
 import re
 
@@ -192,24 +203,8 @@ def is_inline_string(ast_node: ast.AST) -> bool:
     return True
 
 
-if __name__ == "__main__":
-    filepath = sys.argv[1]
-
-    with open(filepath, encoding="utf-8") as f:
-        code = f.read()
-
-    code_lines = code.split("\n")
-
-    root_node = ast.parse(code)
-
-    # with open("temp.txt", "w", encoding="utf-8") as f:
-    #     f.write(ast.dump(root_node, include_attributes=True, indent=2))
-
-    # with open("walk.txt", "w") as f:
-    #     for x in ast.walk(root_node):
-    #         f.write(str(x))
-    #         f.write("\n")
-
+def find_docstring_nodes(root_node: ast.AST, verbose: bool = False) -> List[ast.AST]:
+    """The string nodes of the module, class and function docstrings in the AST."""
     docstring_nodes = []
 
     # If the first node in the AST is a string, it is a docstring
@@ -221,27 +216,43 @@ if __name__ == "__main__":
 
         # Match a module docstring
         if first_statement and is_inline_string(ast_node):
-            print(
-                f">> Matched module docstring (line {ast_node.lineno} - {ast_node.end_lineno})"
-            )
+            if verbose:
+                print(
+                    f">> Matched module docstring "
+                    f"(line {ast_node.lineno} - {ast_node.end_lineno})"
+                )
             docstring_nodes.append(ast_node.value)
         # Match a function docstring
         elif isinstance(ast_node, ast.FunctionDef) and is_inline_string(
             ast_node.body[0]
         ):
-            print(
-                f">> Matched function docstring (line {ast_node.lineno} - {ast_node.end_lineno})"
-            )
+            if verbose:
+                print(
+                    f">> Matched function docstring "
+                    f"(line {ast_node.lineno} - {ast_node.end_lineno})"
+                )
             docstring_nodes.append(ast_node.body[0].value)
         # Match a class docstring
         elif isinstance(ast_node, ast.ClassDef) and is_inline_string(ast_node.body[0]):
-            print(
-                f">> Matched class docstring (line {ast_node.lineno} - {ast_node.end_lineno})"
-            )
+            if verbose:
+                print(
+                    f">> Matched class docstring "
+                    f"(line {ast_node.lineno} - {ast_node.end_lineno})"
+                )
             docstring_nodes.append(ast_node.body[0].value)
 
         first_statement = False
 
+    return docstring_nodes
+
+
+def format_code(code: str, verbose: bool = False) -> str:
+    """Format every docstring in the source code of a module."""
+    code_lines = code.split("\n")
+
+    root_node = ast.parse(code)
+    docstring_nodes = find_docstring_nodes(root_node, verbose)
+
     # Format docstrings and queue them for insertion
     insertion_queue: List[Tuple[List[str], ast.AST]] = []  # (formatted, docstring_node)
     for docstring_node in docstring_nodes:
@@ -264,18 +275,18 @@ if __name__ == "__main__":
         end_lineno -= 1
 
         # Delete all lines of the original docstring (including quotations)
-        lineno = start_lineno
-        while lineno <= end_lineno:
-            del code_lines[start_lineno]
-            lineno += 1
+        del code_lines[start_lineno : end_lineno + 1]
 
         TRIPLE_QUOTES = '"""'
 
         # Check if it's possible to put the docstring in a single line
-        if (len(formatted) == 1) and ('\"' not in formatted[0]) and (
-            col_offset + 3 + len(formatted[0].strip()) + 3 <= MAX_LINE_LENGTH
+        if (
+            (len(formatted) == 1)
+            and ('"' not in formatted[0])
+            and (col_offset + 3 + len(formatted[0].strip()) + 3 <= MAX_LINE_LENGTH)
         ):
-            print("SINGLE LINE!")
+            if verbose:
+                print("SINGLE LINE!")
             code_lines.insert(
                 start_lineno,
                 (
@@ -286,18 +297,230 @@ if __name__ == "__main__":
                 ),
             )
         else:
-            # Opening quotes
-            code_lines.insert(start_lineno, (" " * col_offset) + TRIPLE_QUOTES)
-            for lineno in range(len(formatted)):
-                code_lines.insert(start_lineno + 1 + lineno, formatted[lineno])
-            # Closing quotes
-            code_lines.insert(
-                start_lineno + 1 + len(formatted), (" " * col_offset) + TRIPLE_QUOTES
+            # Opening quotes, the docstring, and closing quotes
+            code_lines[start_lineno:start_lineno] = [
+                (" " * col_offset) + TRIPLE_QUOTES,
+                *formatted,
+                (" " * col_offset) + TRIPLE_QUOTES,
+            ]
+
+    return "\n".join(code_lines)
+
+
+# The cache maps absolute paths to `[mtime_ns, size, sha256]` of their formatted content
+DEFAULT_CACHE = ".format_docstrings_cache"
+CacheEntry = List
+Cache = Dict[str, CacheEntry]
+
+
+def formatter_version() -> str:
+    """A hash of this script, so that changes to the formatter invalidate the cache."""
+    with open(__file__, "rb") as f:
+        source = f.read()
+    return hashlib.sha256(source + str(MAX_LINE_LENGTH).encode()).hexdigest()
+
+
+def load_cache(cache_path: Optional[str]) -> Cache:
+    if cache_path is None:
+        return {}
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("formatter") != formatter_version():
+        return {}
+    return data.get("files", {})
+
+
+def save_cache(cache_path: Optional[str], cache: Cache):
+    if cache_path is None:
+        return
+    # Write to a temporary file first, so an interrupted run can't corrupt the cache
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"formatter": formatter_version(), "files": cache}, f)
+    os.replace(temp_path, cache_path)
+
+
+def find_python_files(paths: Sequence[str]) -> List[str]:
+    """The `.py` files among the paths and in the directories (skipping hidden ones)."""
+    files = []
+    for path in paths:
+        if not os.path.isdir(path):
+            files.append(os.path.abspath(path))
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(
+                d for d in dirnames if not d.startswith(".") and d != "__pycache__"
             )
+            files.extend(
+                os.path.abspath(os.path.join(dirpath, name))
+                for name in sorted(filenames)
+                if name.endswith(".py")
+            )
+    # Remove duplicates, keeping the order
+    return list(dict.fromkeys(files))
+
+
+def cache_entry(stat: os.stat_result, data: bytes) -> CacheEntry:
+    return [stat.st_mtime_ns, stat.st_size, hashlib.sha256(data).hexdigest()]
+
+
+def is_fresh(stat: os.stat_result, cached: Optional[CacheEntry]) -> bool:
+    """An unchanged size and modification time skip reading the file entirely."""
+    return cached is not None and cached[:2] == [stat.st_mtime_ns, stat.st_size]
+
+
+def process_file(
+    filepath: str, cached: Optional[CacheEntry], verbose: bool = False
+) -> Tuple[str, Optional[CacheEntry], Optional[str], Optional[str]]:
+    """
+    Check whether a file is formatted (this runs in the worker processes).
+
+    Returns:
+        `(filepath, cache entry, formatted code, error)`. The cache entry is set if the
+        file is already formatted. Otherwise, the formatted code (or the error that
+        stopped formatting) is set.
+    """
+    try:
+        stat = os.stat(filepath)
+        if is_fresh(stat, cached):
+            return filepath, cached, None, None
+
+        with open(filepath, "rb") as f:
+            data = f.read()
+        entry = cache_entry(stat, data)
+        if cached is not None and cached[2] == entry[2]:
+            return filepath, entry, None, None
+
+        # The same newline translation as reading in text mode
+        code = data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+        formatted = format_code(code, verbose)
+    except (OSError, UnicodeDecodeError, SyntaxError) as error:
+        return filepath, None, None, f"{type(error).__name__}: {error}"
+
+    try:
+        ast.parse(formatted)
+    except SyntaxError as error:
+        return filepath, None, None, f"Formatting would break the code ({error})"
+
+    if formatted == code:
+        return filepath, entry, None, None
+    return filepath, None, formatted, None
+
+
+def _process_files(
+    jobs: List[Tuple[str, Optional[CacheEntry]]], workers: int, verbose: bool
+) -> List[Tuple[str, Optional[CacheEntry], Optional[str], Optional[str]]]:
+    if workers <= 1 or len(jobs) <= 1:
+        return [process_file(filepath, cached, verbose) for filepath, cached in jobs]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    filepaths, cached_entries = zip(*jobs)
+    # Bigger chunks keep the inter-process overhead down when most files are cached
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(workers) as pool:
+        return list(
+            pool.map(
+                process_file,
+                filepaths,
+                cached_entries,
+                [verbose] * len(jobs),
+                chunksize=chunksize,
+            )
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Format the docstrings in Python files."
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="Python files, or directories to search for them"
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Don't write anything, and exit with status 1 if any file would change",
+    )
+    parser.add_argument(
+        "-y", "--yes", action="store_true", help="Overwrite files without asking"
+    )
+    parser.add_argument(
+        "--cache",
+        default=DEFAULT_CACHE,
+        help=f"The cache of formatted files (default = {DEFAULT_CACHE})",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Check every file")
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="The number of worker processes (default = the number of CPUs)",
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Print every docstring found"
+    )
+    args = parser.parse_args(argv)
+
+    cache_path = None if args.no_cache else args.cache
+    cache = load_cache(cache_path)
+
+    # Files that are certainly unchanged never reach the worker processes
+    jobs = []
+    for filepath in find_python_files(args.paths):
+        try:
+            fresh = is_fresh(os.stat(filepath), cache.get(filepath))
+        except OSError:
+            fresh = False
+        if not fresh:
+            jobs.append((filepath, cache.get(filepath)))
+    results = _process_files(jobs, args.workers, args.verbose)
+
+    changed: Dict[str, str] = {}
+    errors = 0
+    for filepath, entry, formatted, error in results:
+        if entry is not None:
+            cache[filepath] = entry
+            continue
+        cache.pop(filepath, None)
+        if error is not None:
+            print(f"error: {os.path.relpath(filepath)}: {error}", file=sys.stderr)
+            errors += 1
+        else:
+            changed[filepath] = formatted
+
+    if args.check:
+        for filepath in changed:
+            print(f"would reformat {os.path.relpath(filepath)}")
+    elif changed:
+        if not args.yes:
+            from rich import prompt
+
+            if len(changed) == 1:
+                question = f"Overwrite {os.path.relpath(next(iter(changed)))}?"
+            else:
+                question = f"Overwrite {len(changed)} files?"
+            if not prompt.Confirm.ask(question):
+                changed = {}
+
+        for filepath, formatted in changed.items():
+            with open(filepath, "w", encoding="utf-8", newline="\n") as f:
+                f.write(formatted)
+            # Cache what was written, so the next run skips the file
+            with open(filepath, "rb") as f:
+                cache[filepath] = cache_entry(os.stat(filepath), f.read())
+            print(f"reformatted {os.path.relpath(filepath)}")
+
+    save_cache(cache_path, cache)
 
-    # with open("formatted.py", "w", encoding="utf-8") as f:
-    #     f.write("\n".join(code_lines))
+    if errors or (args.check and changed):
+        return 1
+    return 0
 
-    if prompt.Confirm.ask(f"Overwrite {filepath}?"):
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write("\n".join(code_lines))
+
+if __name__ == "__main__":
+    sys.exit(main())